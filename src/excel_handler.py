@@ -4,8 +4,191 @@ Módulo para manipulação de arquivos Excel
 
 import pandas as pd
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Sequence, Union, BinaryIO
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+
+class ExcelStreamReader:
+    """Leitor de planilhas .xlsx em modo streaming (openpyxl read_only)"""
+
+    def __init__(self, source: Union[Path, str, BinaryIO], sheet_name: Optional[str] = None):
+        """
+        Abre a planilha sem carregar todas as células na memória
+
+        Args:
+            source: Caminho ou arquivo binário aberto (.xlsx)
+            sheet_name: Nome da planilha (opcional, usa a primeira por padrão)
+        """
+        self.workbook = load_workbook(source, read_only=True, data_only=True)
+        self.sheet_names = self.workbook.sheetnames
+
+        if sheet_name and sheet_name not in self.sheet_names:
+            self.close()
+            raise KeyError(f"Planilha '{sheet_name}' não encontrada")
+        self.worksheet = self.workbook[sheet_name] if sheet_name else self.workbook.worksheets[0]
+        self.columns: List[str] = []
+
+    def __enter__(self) -> "ExcelStreamReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Fecha o arquivo da planilha"""
+        self.workbook.close()
+
+    def count_rows(self) -> Optional[int]:
+        """
+        Estima o número de linhas de dados (sem o cabeçalho)
+
+        Returns:
+            Número de linhas segundo a dimensão gravada no arquivo, ou None se indisponível
+        """
+        max_row = self.worksheet.max_row
+        return max(0, max_row - 1) if max_row else None
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre as linhas de dados uma a uma
+
+        A primeira linha é usada como cabeçalho; linhas totalmente vazias são ignoradas.
+
+        Returns:
+            Gerador de dicionários coluna -> valor
+        """
+        rows = self.worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        self.columns = [
+            str(value).strip() if value is not None else f"Unnamed: {i}" for i, value in enumerate(header)
+        ]
+
+        for values in rows:
+            if all(value is None or value == "" for value in values):
+                continue
+            yield dict(zip(self.columns, values))
+
+    def iter_chunks(self, chunk_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Percorre as linhas de dados em blocos de tamanho fixo
+
+        Args:
+            chunk_size: Número de linhas por bloco
+
+        Returns:
+            Gerador de listas de dicionários coluna -> valor
+        """
+        chunk = []
+        for row in self.iter_rows():
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class ExcelStreamWriter:
+    """Gravador de planilhas .xlsx em modo streaming (openpyxl write_only)"""
+
+    NATIVE_TYPES = (str, bool, int, float, Decimal, datetime, date, time, timedelta)
+
+    def __init__(self):
+        """
+        Cria a pasta de trabalho em modo somente escrita
+
+        Cada linha é serializada assim que é adicionada, então a memória não cresce
+        com o número de células (ao contrário do pd.ExcelWriter em modo normal).
+        """
+        self.workbook = Workbook(write_only=True)
+        self.rows_written: Dict[str, int] = {}
+
+    def __enter__(self) -> "ExcelStreamWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Descarta os arquivos temporários das planilhas ainda não salvas"""
+        self.workbook.close()
+
+    @classmethod
+    def _cell_value(cls, value: Any) -> Any:
+        """Converte um valor para um tipo aceito pelo openpyxl (Excel não aceita fuso horário)"""
+        if value is None or value is pd.NaT:
+            return None
+        if isinstance(value, float) and value != value:
+            return None
+        if isinstance(value, (datetime, time)) and value.tzinfo is not None:
+            return value.replace(tzinfo=None)
+        if isinstance(value, cls.NATIVE_TYPES):
+            return value
+        if hasattr(value, "item"):
+            # Escalares numpy
+            return cls._cell_value(value.item())
+        return str(value)
+
+    def write_sheet(self, title: str, header: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Adiciona uma planilha consumindo as linhas de um iterador
+
+        Args:
+            title: Nome da planilha
+            header: Títulos das colunas (gravados em negrito)
+            rows: Iterável de sequências de valores (ex: QuerySet.values_list().iterator())
+
+        Returns:
+            Número de linhas de dados gravadas
+        """
+        worksheet = self.workbook.create_sheet(title=title)
+        header_cells = []
+        for value in header:
+            cell = WriteOnlyCell(worksheet, value=self._cell_value(value))
+            cell.font = Font(bold=True)
+            header_cells.append(cell)
+        worksheet.append(header_cells)
+
+        count = 0
+        for row in rows:
+            worksheet.append([self._cell_value(value) for value in row])
+            count += 1
+        self.rows_written[title] = count
+        return count
+
+    def write_dataframe(self, title: str, df: pd.DataFrame, index: bool = False) -> int:
+        """
+        Adiciona uma planilha com o conteúdo de um DataFrame
+
+        Args:
+            title: Nome da planilha
+            df: DataFrame a gravar
+            index: Se True, grava o índice como primeira coluna
+
+        Returns:
+            Número de linhas de dados gravadas
+        """
+        header = [str(column) for column in df.columns]
+        if index:
+            header.insert(0, df.index.name or "")
+        return self.write_sheet(title, header, df.itertuples(index=index, name=None))
+
+    def save(self, destination: Union[Path, str, BinaryIO]) -> None:
+        """
+        Grava a pasta de trabalho (só pode ser chamado uma vez)
+
+        Args:
+            destination: Caminho ou arquivo binário aberto para escrita
+        """
+        if isinstance(destination, Path):
+            destination.parent.mkdir(parents=True, exist_ok=True)
+        self.workbook.save(destination)
 
 
 class ExcelHandler:
@@ -37,18 +220,18 @@ class ExcelHandler:
                 print(f"✗ Arquivo não encontrado: {self.file_path}")
                 return False
 
-            # Lê nomes das planilhas
-            excel_file = pd.ExcelFile(self.file_path)
-            self.sheet_names = excel_file.sheet_names
+            # Um único handle para descobrir as planilhas e fazer o parse
+            with pd.ExcelFile(self.file_path) as excel_file:
+                self.sheet_names = excel_file.sheet_names
 
-            # Carrega a planilha especificada ou a primeira
-            if sheet_name:
-                if sheet_name not in self.sheet_names:
-                    print(f"✗ Planilha '{sheet_name}' não encontrada")
-                    return False
-                self.df = pd.read_excel(self.file_path, sheet_name=sheet_name)
-            else:
-                self.df = pd.read_excel(self.file_path, sheet_name=0)
+                # Carrega a planilha especificada ou a primeira
+                if sheet_name:
+                    if sheet_name not in self.sheet_names:
+                        print(f"✗ Planilha '{sheet_name}' não encontrada")
+                        return False
+                    self.df = excel_file.parse(sheet_name=sheet_name)
+                else:
+                    self.df = excel_file.parse(sheet_name=0)
 
             print(f"✓ Excel carregado: {len(self.df)} linhas, {len(self.df.columns)} colunas")
             print(f"  Planilhas disponíveis: {', '.join(self.sheet_names)}")
@@ -58,6 +241,20 @@ class ExcelHandler:
             print(f"✗ Erro ao carregar Excel: {e}")
             return False
 
+    def iter_chunks(self, chunk_size: int = 1000, sheet_name: Optional[str] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lê o arquivo em blocos sem carregar a planilha inteira na memória
+
+        Args:
+            chunk_size: Número de linhas por bloco
+            sheet_name: Nome da planilha (opcional, usa a primeira por padrão)
+
+        Returns:
+            Gerador de listas de dicionários coluna -> valor
+        """
+        with ExcelStreamReader(self.file_path, sheet_name=sheet_name) as reader:
+            yield from reader.iter_chunks(chunk_size)
+
     def get_dataframe(self) -> Optional[pd.DataFrame]:
         """
         Retorna o DataFrame atual
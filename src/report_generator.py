@@ -8,6 +8,8 @@ from typing import Optional, Dict, List, Any
 from datetime import datetime
 import csv
 
+from src.excel_handler import ExcelStreamWriter
+
 
 class ReportGenerator:
     """Classe para gerar relatórios em diversos formatos"""
@@ -89,42 +91,51 @@ class ReportGenerator:
 
         return report_text
 
-    def generate_excel_report(self, output_path: Path, include_stats: bool = True) -> bool:
+    def generate_excel_report(
+        self, output_path: Path, include_stats: bool = True, stats: Optional[pd.DataFrame] = None
+    ) -> bool:
         """
         Gera relatório completo em Excel com múltiplas abas
 
+        As abas são gravadas em modo streaming (ExcelStreamWriter), sem manter
+        um objeto por célula na memória.
+
         Args:
             output_path: Caminho do arquivo Excel
             include_stats: Se True, inclui aba com estatísticas
+            stats: Estatísticas já calculadas (ex: agregação SQL); se None, usa describe()
 
         Returns:
             True se sucesso
         """
         try:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
+            with ExcelStreamWriter() as writer:
                 # Aba 1: Dados completos
-                self.df.to_excel(writer, sheet_name="Dados", index=False)
+                writer.write_dataframe("Dados", self.df)
 
                 # Aba 2: Estatísticas
                 if include_stats:
-                    stats_df = self.df.describe(include="all").T
-                    stats_df.to_excel(writer, sheet_name="Estatísticas")
+                    if stats is not None:
+                        writer.write_dataframe("Estatísticas", stats)
+                    else:
+                        writer.write_dataframe("Estatísticas", self.df.describe(include="all").T, index=True)
 
                 # Aba 3: Valores nulos
+                null_counts = self.df.isnull().sum()
                 null_df = pd.DataFrame(
                     {
                         "Coluna": self.df.columns,
-                        "Valores Nulos": self.df.isnull().sum().values,
-                        "Percentual": (self.df.isnull().sum() / len(self.df) * 100).values,
+                        "Valores Nulos": null_counts.values,
+                        "Percentual": (null_counts / len(self.df) * 100).values,
                     }
                 )
-                null_df.to_excel(writer, sheet_name="Valores Nulos", index=False)
+                writer.write_dataframe("Valores Nulos", null_df)
 
                 # Aba 4: Tipos de dados
-                types_df = pd.DataFrame({"Coluna": self.df.columns, "Tipo": self.df.dtypes.values})
-                types_df.to_excel(writer, sheet_name="Tipos de Dados", index=False)
+                types_df = pd.DataFrame({"Coluna": self.df.columns, "Tipo": self.df.dtypes.astype(str).values})
+                writer.write_dataframe("Tipos de Dados", types_df)
+
+                writer.save(output_path)
 
             print(f"✓ Relatório Excel salvo em: {output_path}")
             return True
@@ -5,9 +5,15 @@ Django settings for core project.
 from pathlib import Path
 import os
 
+from dotenv import load_dotenv
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Variáveis de ambiente do arquivo .env na raiz do projeto (ver .env.exemplo);
+# variáveis já definidas no ambiente têm prioridade
+load_dotenv(BASE_DIR.parent / ".env")
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = "django-insecure-dev-key-change-in-production"
 
@@ -67,13 +73,53 @@ WSGI_APPLICATION = "core.wsgi.application"
 
 
 # Database
-DATABASES = {
+# SQLite por padrão; PostgreSQL com DB_ENGINE=postgresql (requer psycopg 3)
+if os.environ.get("DB_ENGINE", "sqlite") == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DB_NAME", "eventos"),
+            "USER": os.environ.get("DB_USER", "postgres"),
+            "PASSWORD": os.environ.get("DB_PASSWORD", ""),
+            "HOST": os.environ.get("DB_HOST", "localhost"),
+            "PORT": os.environ.get("DB_PORT", "5432"),
+            "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("DB_NAME") or BASE_DIR.parent / "data" / "django_eventos.db",
+        }
+    }
+
+# Cache (agregados do dashboard/estatísticas). Em arquivos para ser compartilhado entre o
+# servidor e o worker de importações, que invalida os agregados ao gravar.
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR.parent / "data" / "django_eventos.db",
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR.parent / "data" / "cache",
+        "OPTIONS": {"MAX_ENTRIES": 1000},
     }
 }
 
+# Segundos que um agregado fica em cache (a invalidação por versão cobre as escritas;
+# o limite cobre dados que dependem da hora, como os próximos eventos)
+AGREGADOS_CACHE_TIMEOUT = 10 * 60
+
+# PRAGMAs aplicados a cada nova conexão SQLite (eventos.banco.aplicar_pragmas_sqlite).
+# WAL permite leituras durante a gravação de uma importação; synchronous=NORMAL é
+# seguro com WAL (só a última transação pode se perder em queda de energia).
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,  # em KiB (negativo): ~64 MB de cache de páginas por conexão
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,  # ms esperando o lock de escrita antes de "database is locked"
+}
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -123,6 +169,41 @@ CRISPY_TEMPLATE_PACK = "bootstrap5"
 # Import Export
 IMPORT_EXPORT_USE_TRANSACTIONS = True
 
+# Importação de participantes: linhas gravadas por bloco (bulk_create/bulk_update)
+IMPORTACAO_CHUNK_SIZE = 500
+
+# Uploads entram na fila e são processados pelo worker (python manage.py processar_importacoes).
+# Com False, a importação é processada durante a própria requisição.
+IMPORTACAO_EM_SEGUNDO_PLANO = True
+
+# Importações "processando" há mais que isso (segundos desde iniciado_em) são dadas como
+# interrompidas (worker encerrado no meio) e marcadas como erro pelo próximo worker
+IMPORTACAO_TEMPO_LIMITE = 3600
+
+# No PostgreSQL, grava cada bloco com COPY para uma tabela de staging + INSERT ... ON CONFLICT
+# (eventos/gravacao_postgres.py). Com False, usa o mesmo caminho ORM em lote do SQLite.
+IMPORTACAO_COPY_POSTGRES = True
+
+# Exportações CSV/JSON em streaming: linhas buscadas por ida ao banco (QuerySet.iterator)
+EXPORTACAO_CHUNK_SIZE = 2000
+
+# Cache de exportações (media/exportacoes/cache): arquivos sem uso há mais de
+# EXPORTACAO_CACHE_IDADE_MAXIMA segundos ou além do tamanho total são removidos
+EXPORTACAO_CACHE_IDADE_MAXIMA = 24 * 60 * 60
+EXPORTACAO_CACHE_TAMANHO_MAXIMO = 500 * 1024 * 1024
+
+# Check-in (eventos/checkin.py): status de ingresso que podem ser marcados como presentes
+# e máximo de códigos por envio no endpoint em lote
+CHECKIN_STATUS_PERMITIDOS = ["confirmado", "pendente"]
+CHECKIN_LOTE_MAXIMO = 1000
+
+# Números de sequência reservados por ida ao banco pelo gerador de códigos de ingresso
+# (eventos/codigos.py); os que sobram quando o processo termina são apenas pulados
+CODIGOS_INGRESSO_BLOCO = 1000
+
+# Registros por UPDATE/DELETE (cada bloco em uma transação) na limpeza de dados (eventos/limpeza.py)
+LIMPEZA_TAMANHO_BLOCO = 5000
+
 # Authentication
 LOGIN_URL = "/accounts/login/"
 LOGIN_REDIRECT_URL = "/"
@@ -3,12 +3,24 @@ Configuração do Django Admin para o app eventos
 """
 
 from django.contrib import admin
-from django.utils.html import format_html
+from django.db.models import Count, ExpressionWrapper, F, FloatField, OuterRef, Subquery
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
+from django.utils.html import format_html, format_html_join
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
-from .models import Categoria, Evento, Participante, ImportacaoExcel, RelatorioGerado, Cliente
+from .models import (
+    Categoria,
+    Cliente,
+    Evento,
+    ImportacaoExcel,
+    Participante,
+    RegistroImportacao,
+    RelatorioGerado,
+    VendaDiaria,
+)
 
 
 # Resources para import/export
@@ -80,10 +92,24 @@ class ClienteAdmin(admin.ModelAdmin):
         ("Controle", {"fields": ("criado_em", "atualizado_em"), "classes": ("collapse",)}),
     )
 
+    def get_queryset(self, request):
+        # Subconsulta correlacionada (e não Count com JOIN): não agrupa a consulta
+        # externa, então o COUNT do paginador, o date_hierarchy e os filtros não pagam
+        # o GROUP BY; o SELECT da página só calcula as linhas exibidas
+        participacoes = (
+            Participante.objects.filter(cliente=OuterRef("pk"))
+            .order_by()
+            .values("cliente")
+            .annotate(total=Count("*"))
+            .values("total")
+        )
+        return super().get_queryset(request).annotate(total_participacoes=Coalesce(Subquery(participacoes), 0))
+
     def total_eventos_display(self, obj):
-        total = obj.total_eventos
+        total = obj.total_participacoes
         return format_html('<strong>{}</strong> evento(s)', total)
     total_eventos_display.short_description = "Total de Eventos"
+    total_eventos_display.admin_order_field = "total_participacoes"
 
 
 class ParticipanteInline(admin.TabularInline):
@@ -125,6 +151,24 @@ class EventoAdmin(ImportExportModelAdmin):
 
     inlines = [ParticipanteInline]
 
+    def get_queryset(self, request):
+        # Contagens lidas dos contadores materializados de Evento (sem COUNT por linha)
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                confirmados=F("total_confirmados"),
+                inscritos=F("total_inscritos"),
+                percentual_ocupacao=Coalesce(
+                    ExpressionWrapper(
+                        F("total_confirmados") * 100.0 / NullIf(F("capacidade_maxima"), 0),
+                        output_field=FloatField(),
+                    ),
+                    0.0,
+                ),
+            )
+        )
+
     def local_completo(self, obj):
         return f"{obj.local}, {obj.cidade}/{obj.estado}" if obj.cidade else obj.local
 
@@ -148,12 +192,8 @@ class EventoAdmin(ImportExportModelAdmin):
     status_badge.short_description = "Status"
 
     def ocupacao(self, obj):
-        # Calcular percentual diretamente para evitar SafeString
-        if obj.capacidade_maxima == 0:
-            percentual = 0.0
-        else:
-            total_inscricoes = obj.participantes.filter(status="confirmado").count()
-            percentual = (total_inscricoes / obj.capacidade_maxima) * 100.0
+        # Percentual anotado em get_queryset (float puro para evitar SafeString)
+        percentual = float(obj.percentual_ocupacao)
 
         if percentual >= 90:
             color = "#dc3545"  # vermelho
@@ -176,24 +216,24 @@ class EventoAdmin(ImportExportModelAdmin):
         )
 
     ocupacao.short_description = "Ocupação"
+    ocupacao.admin_order_field = "percentual_ocupacao"
 
     def total_participantes(self, obj):
-        confirmados = obj.participantes.filter(status="confirmado").count()
-        total = obj.participantes.count()
-        return f"{confirmados}/{total}"
+        return f"{obj.confirmados}/{obj.inscritos}"
 
     total_participantes.short_description = "Participantes"
+    total_participantes.admin_order_field = "confirmados"
 
     actions = ["marcar_como_confirmado", "marcar_como_concluido", "exportar_participantes"]
 
     def marcar_como_confirmado(self, request, queryset):
-        updated = queryset.update(status="confirmado")
+        updated = queryset.update(status="confirmado", atualizado_em=timezone.now())
         self.message_user(request, f"{updated} evento(s) marcado(s) como confirmado(s).")
 
     marcar_como_confirmado.short_description = "Marcar como Confirmado"
 
     def marcar_como_concluido(self, request, queryset):
-        updated = queryset.update(status="concluido")
+        updated = queryset.update(status="concluido", atualizado_em=timezone.now())
         self.message_user(request, f"{updated} evento(s) marcado(s) como concluído(s).")
 
     marcar_como_concluido.short_description = "Marcar como Concluído"
@@ -226,6 +266,9 @@ class ParticipanteAdmin(ImportExportModelAdmin):
         ("Controle", {"fields": ("data_inscricao", "atualizado_em"), "classes": ("collapse",)}),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_related()
+
     def cliente_nome(self, obj):
         return obj.cliente.nome_completo
     cliente_nome.short_description = "Nome"
@@ -278,19 +321,19 @@ class ParticipanteAdmin(ImportExportModelAdmin):
     actions = ["confirmar_inscricao", "marcar_como_presente", "cancelar_inscricao"]
 
     def confirmar_inscricao(self, request, queryset):
-        updated = queryset.update(status="confirmado")
+        updated = queryset.update(status="confirmado", atualizado_em=timezone.now())
         self.message_user(request, f"{updated} inscrição(ões) confirmada(s).")
 
     confirmar_inscricao.short_description = "Confirmar Inscrição"
 
     def marcar_como_presente(self, request, queryset):
-        updated = queryset.update(status="presente")
+        updated = queryset.update(status="presente", atualizado_em=timezone.now())
         self.message_user(request, f"{updated} participante(s) marcado(s) como presente(s).")
 
     marcar_como_presente.short_description = "Marcar como Presente"
 
     def cancelar_inscricao(self, request, queryset):
-        updated = queryset.update(status="cancelado")
+        updated = queryset.update(status="cancelado", atualizado_em=timezone.now())
         self.message_user(request, f"{updated} inscrição(ões) cancelada(s).")
 
     cancelar_inscricao.short_description = "Cancelar Inscrição"
@@ -303,6 +346,7 @@ class ImportacaoExcelAdmin(admin.ModelAdmin):
         "status_badge",
         "total_linhas",
         "linhas_importadas",
+        "linhas_ignoradas",
         "linhas_com_erro",
         "criado_em",
         "usuario",
@@ -311,27 +355,34 @@ class ImportacaoExcelAdmin(admin.ModelAdmin):
     search_fields = ("nome_arquivo",)
     readonly_fields = (
         "nome_arquivo",
+        "hash_conteudo",
         "status",
         "total_linhas",
         "linhas_importadas",
+        "linhas_ignoradas",
         "linhas_com_erro",
+        "linhas_processadas",
+        "linhas_por_segundo",
         "mensagem_erro",
-        "log_processamento",
+        "resumo_registros",
         "criado_em",
+        "iniciado_em",
         "processado_em",
         "usuario",
     )
 
     fieldsets = (
-        ("Arquivo", {"fields": ("arquivo", "nome_arquivo")}),
+        ("Arquivo", {"fields": ("arquivo", "nome_arquivo", "hash_conteudo", "evento")}),
         ("Status", {"fields": ("status", "mensagem_erro")}),
-        ("Estatísticas", {"fields": ("total_linhas", "linhas_importadas", "linhas_com_erro")}),
-        ("Log", {"fields": ("log_processamento",), "classes": ("collapse",)}),
+        ("Estatísticas", {"fields": ("total_linhas", "linhas_importadas", "linhas_ignoradas", "linhas_com_erro")}),
+        ("Progresso", {"fields": ("linhas_processadas", "linhas_por_segundo", "iniciado_em")}),
+        ("Log", {"fields": ("resumo_registros",)}),
         ("Controle", {"fields": ("usuario", "criado_em", "processado_em")}),
     )
 
     def status_badge(self, obj):
         colors = {
+            "na_fila": "#6c757d",
             "processando": "#ffc107",
             "sucesso": "#28a745",
             "erro": "#dc3545",
@@ -345,6 +396,54 @@ class ImportacaoExcelAdmin(admin.ModelAdmin):
 
     status_badge.short_description = "Status"
 
+    def resumo_registros(self, obj):
+        """Total de linhas por resultado (uma agregação), com link para o log filtrado"""
+        if obj.pk is None:
+            return "-"
+        url = reverse("log_importacao", args=[obj.pk])
+        contagens = obj.registros.order_by().values_list("resultado").annotate(total=Count("id"))
+        rotulos = dict(RegistroImportacao.RESULTADO_CHOICES)
+        itens = format_html_join(
+            mark_safe("<br>"),
+            '<a href="{}?resultado={}">{}</a>: {}',
+            ((url, resultado, rotulos[resultado], total) for resultado, total in sorted(contagens)),
+        )
+        return format_html('{}<br><a href="{}">Ver log completo</a>', itens or "Nenhum registro", url)
+
+    resumo_registros.short_description = "Linhas por Resultado"
+
+
+@admin.register(RegistroImportacao)
+class RegistroImportacaoAdmin(admin.ModelAdmin):
+    list_display = ("linha", "importacao", "resultado", "cliente", "mensagem")
+    list_filter = ("resultado", "importacao")
+    list_select_related = ("importacao", "cliente", "mensagem")
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(VendaDiaria)
+class VendaDiariaAdmin(admin.ModelAdmin):
+    list_display = ("dia", "evento", "status", "tipo_participante", "quantidade", "receita")
+    list_filter = ("status", "tipo_participante", "evento")
+    list_select_related = ("evento",)
+    date_hierarchy = "dia"
+
+    # Mantido pelos sinais e por "manage.py recalcular_vendas"
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
 
 @admin.register(RelatorioGerado)
 class RelatorioGeradoAdmin(admin.ModelAdmin):
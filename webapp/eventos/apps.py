@@ -5,3 +5,15 @@ class EventosConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "eventos"
     verbose_name = "Gestão de Eventos"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+
+        from . import signals  # noqa: F401
+        from .banco import aplicar_pragmas_sqlite, registrar_funcoes_sqlite
+        from .busca import instalar_indices_busca
+
+        connection_created.connect(aplicar_pragmas_sqlite, dispatch_uid="eventos_pragmas_sqlite")
+        connection_created.connect(registrar_funcoes_sqlite, dispatch_uid="eventos_funcoes_sqlite")
+        post_migrate.connect(instalar_indices_busca, sender=self, dispatch_uid="eventos_indices_busca")
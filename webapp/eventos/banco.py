@@ -0,0 +1,77 @@
+"""
+Ajustes de conexão com o banco de dados
+
+Aplica os PRAGMAs de ``settings.SQLITE_PRAGMAS`` a cada nova conexão SQLite
+(sinal ``connection_created``). O SQLite guarda esses ajustes por conexão,
+exceto ``journal_mode=WAL``, que fica gravado no arquivo do banco.
+
+Também registra nas conexões SQLite as funções SQL do PostgreSQL usadas pelo
+app que o SQLite não tem (``INITCAP``).
+"""
+
+import re
+
+from django.conf import settings
+
+# Nome e valor entram direto no SQL (PRAGMA não aceita parâmetros)
+_NOME_PRAGMA = re.compile(r"^[a-z_]+$")
+_VALOR_PRAGMA = re.compile(r"^-?\w+$")
+
+# Palavra do INITCAP: sequência de letras/dígitos
+_PALAVRA = re.compile(r"[^\W_]+")
+
+
+def comandos_pragma(pragmas):
+    """
+    Monta os comandos PRAGMA, validando nomes e valores
+
+    Args:
+        pragmas: Dicionário {pragma: valor}
+
+    Returns:
+        Lista de comandos SQL
+    """
+    comandos = []
+    for nome, valor in pragmas.items():
+        if not _NOME_PRAGMA.match(nome) or not _VALOR_PRAGMA.match(str(valor)):
+            raise ValueError(f"PRAGMA inválido: {nome}={valor}")
+        comandos.append(f"PRAGMA {nome} = {valor}")
+    return comandos
+
+
+def executar_pragmas(cursor, pragmas):
+    """Executa os PRAGMAs em um cursor (Django ou sqlite3)"""
+    for comando in comandos_pragma(pragmas):
+        cursor.execute(comando)
+
+
+def aplicar_pragmas_sqlite(sender, connection, **kwargs):
+    """Receptor de connection_created: aplica settings.SQLITE_PRAGMAS às conexões SQLite"""
+    if connection.vendor != "sqlite":
+        return
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", None)
+    if pragmas:
+        with connection.cursor() as cursor:
+            executar_pragmas(cursor, pragmas)
+
+
+def initcap(texto):
+    """
+    Primeira letra de cada palavra em maiúscula e as demais em minúscula, como o INITCAP do PostgreSQL
+
+    Args:
+        texto: Texto original (None continua None)
+
+    Returns:
+        Texto capitalizado (ex: "JOÃO da silva" -> "João Da Silva")
+    """
+    if texto is None:
+        return None
+    return _PALAVRA.sub(lambda palavra: palavra[0][:1].upper() + palavra[0][1:].lower(), texto)
+
+
+def registrar_funcoes_sqlite(sender, connection, **kwargs):
+    """Receptor de connection_created: registra INITCAP nas conexões SQLite"""
+    if connection.vendor != "sqlite":
+        return
+    connection.connection.create_function("INITCAP", 1, initcap, deterministic=True)
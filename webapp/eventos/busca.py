@@ -0,0 +1,199 @@
+"""
+Busca textual em Cliente e Evento com índice de texto completo
+
+SQLite: tabelas FTS5 de conteúdo externo (``busca_cliente`` e ``busca_evento``)
+mantidas por triggers de INSERT/UPDATE/DELETE nas tabelas de origem, então
+qualquer escrita (ORM, escritas em lote, SQL direto) atualiza o índice. O
+tokenizer ``unicode61 remove_diacritics 2`` ignora maiúsculas e acentos.
+
+PostgreSQL: índices GIN sobre ``to_tsvector('simple', ...)`` dos mesmos campos,
+que o próprio banco mantém.
+
+Os termos digitados viram prefixos de palavras combinados com AND ("joão sil"
+encontra "João da Silva"). Índices e triggers são criados (ou recriados, se
+uma migração reconstruir a tabela) a cada ``manage.py migrate``.
+
+Para clientes, a busca também compara o início do texto com as colunas
+normalizadas de Cliente (nome/e-mail sem acentos, CPF/telefone só com
+dígitos), que usam índices B-tree comuns.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Cliente, Evento
+from .normalizacao import apenas_digitos, normalizar_texto
+
+# Campos indexados de cada modelo
+CAMPOS_BUSCA = {
+    Cliente: ["nome_completo", "email", "telefone", "cpf"],
+    Evento: ["nome", "descricao", "local"],
+}
+
+# Palavras: sequências de letras/dígitos (mesma divisão do unicode61 e do índice no PostgreSQL)
+_PALAVRA = re.compile(r"[^\W_]+")
+
+# Texto que parece CPF ou telefone (dígitos e pontuação) e mínimo de dígitos para buscar por prefixo
+_NUMERO = re.compile(r"^[\d\s().+/-]+$")
+MINIMO_DIGITOS = 3
+
+
+def termos(texto):
+    """Palavras do texto buscado, em minúsculas"""
+    return _PALAVRA.findall((texto or "").lower())
+
+
+def _tabela_fts(modelo):
+    return f"busca_{modelo._meta.model_name}"
+
+
+def _documento_postgres(modelo):
+    """Expressão do tsvector indexado (precisa ser idêntica no índice e na consulta)"""
+    colunas = " || ' ' || ".join(f"COALESCE({campo}, '')" for campo in CAMPOS_BUSCA[modelo])
+    return f"to_tsvector('simple'::regconfig, regexp_replace({colunas}, '[^[:alnum:]]+', ' ', 'g'))"
+
+
+def _instalar_sqlite(cursor, modelo):
+    """Cria a tabela FTS5 e os triggers que não existirem; retorna True se algo foi criado"""
+    tabela, fts = modelo._meta.db_table, _tabela_fts(modelo)
+    campos = CAMPOS_BUSCA[modelo]
+    colunas = ", ".join(campos)
+    novos = ", ".join(f"new.{campo}" for campo in campos)
+    antigos = ", ".join(f"old.{campo}" for campo in campos)
+    remover = f"INSERT INTO {fts} ({fts}, rowid, {colunas}) VALUES ('delete', old.id, {antigos});"
+    inserir = f"INSERT INTO {fts} (rowid, {colunas}) VALUES (new.id, {novos});"
+    objetos = {
+        fts: (
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({colunas}, content='{tabela}', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        ),
+        f"{fts}_ai": f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {tabela} BEGIN {inserir} END",
+        f"{fts}_ad": f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {tabela} BEGIN {remover} END",
+        f"{fts}_au": f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {colunas} ON {tabela} BEGIN {remover} {inserir} END",
+    }
+    cursor.execute(f"SELECT name FROM sqlite_master WHERE name IN ({', '.join(['%s'] * len(objetos))})", list(objetos))
+    existentes = {nome for (nome,) in cursor.fetchall()}
+    faltando = [sql for nome, sql in objetos.items() if nome not in existentes]
+    for sql in faltando:
+        cursor.execute(sql)
+    if faltando:
+        # Triggers ausentes (tabela nova ou reconstruída): reindexa o conteúdo atual
+        cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+    return bool(faltando)
+
+
+def instalar(using="default"):
+    """
+    Cria os índices de busca que ainda não existem no banco
+
+    Args:
+        using: Alias do banco
+
+    Returns:
+        Lista com os modelos cujos índices foram criados ou recriados
+    """
+    conexao = connections[using]
+    criados = []
+    with conexao.cursor() as cursor:
+        for modelo in CAMPOS_BUSCA:
+            if conexao.vendor == "sqlite":
+                if _instalar_sqlite(cursor, modelo):
+                    criados.append(modelo)
+            elif conexao.vendor == "postgresql":
+                cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = %s", [_tabela_fts(modelo)])
+                if cursor.fetchone() is None:
+                    cursor.execute(
+                        f"CREATE INDEX {_tabela_fts(modelo)} ON {modelo._meta.db_table} "
+                        f"USING gin ({_documento_postgres(modelo)})"
+                    )
+                    criados.append(modelo)
+    return criados
+
+
+def instalar_indices_busca(sender, using="default", **kwargs):
+    """Receptor de post_migrate: garante os índices de busca após as migrações"""
+    instalar(using)
+
+
+def _consulta(modelo, texto, using):
+    """
+    SQL que seleciona o id dos registros que casam com o texto
+
+    Returns:
+        Tupla (sql, parâmetros), ou None se o texto não tem palavras
+    """
+    palavras = termos(texto)
+    if not palavras:
+        return None
+    if connections[using].vendor == "postgresql":
+        documento = _documento_postgres(modelo)
+        expressao = " & ".join(f"{palavra}:*" for palavra in palavras)
+        return f"SELECT id FROM {modelo._meta.db_table} WHERE {documento} @@ to_tsquery('simple', %s)", [expressao]
+    fts = _tabela_fts(modelo)
+    expressao = " ".join(f'"{palavra}"*' for palavra in palavras)
+    return f"SELECT rowid AS id FROM {fts} WHERE {fts} MATCH %s", [expressao]
+
+
+def _subconsulta(modelo, texto, using):
+    """Subconsulta com os ids que casam com o texto, para usar em ``__in`` (None se não há palavras)"""
+    consulta = _consulta(modelo, texto, using)
+    if consulta is None:
+        return None
+    return RawSQL(*consulta)
+
+
+def _prefixo(campo, valor, using):
+    """
+    Q de "campo começa com valor" que aproveita o índice B-tree da coluna
+
+    No PostgreSQL vira ``LIKE 'valor%'`` (o Django cria um índice ``*_like``
+    com varchar_pattern_ops para colunas indexadas); no SQLite, cujo LIKE
+    ignora maiúsculas e não usa o índice, vira um intervalo.
+    """
+    if connections[using].vendor == "postgresql":
+        return Q(**{f"{campo}__startswith": valor})
+    return Q(**{f"{campo}__gte": valor, f"{campo}__lt": valor + "\U0010ffff"})
+
+
+def filtro_clientes(texto, using="default"):
+    """
+    Q para filtrar um QuerySet de Cliente pelo texto buscado
+
+    Combina o índice de texto completo (palavras em qualquer ordem) com as
+    colunas normalizadas: nome ou e-mail começando com o texto, sem acentos e
+    maiúsculas, e CPF ou telefone começando com os dígitos digitados. Texto
+    vazio não casa nada.
+    """
+    filtro = Q(pk__in=[])
+    subconsulta = _subconsulta(Cliente, texto, using)
+    if subconsulta is not None:
+        filtro |= Q(pk__in=subconsulta)
+    normalizado = normalizar_texto(texto)
+    if normalizado:
+        filtro |= _prefixo("nome_normalizado", normalizado, using) | _prefixo("email_normalizado", normalizado, using)
+    digitos = apenas_digitos(texto)
+    if len(digitos) >= MINIMO_DIGITOS and _NUMERO.match(texto):
+        filtro |= _prefixo("cpf_digitos", digitos, using) | _prefixo("telefone_digitos", digitos, using)
+    return filtro
+
+
+def filtro_eventos(texto, using="default"):
+    """Q para filtrar um QuerySet de Evento pelo texto buscado (texto sem palavras não casa nada)"""
+    subconsulta = _subconsulta(Evento, texto, using)
+    return Q(pk__in=[]) if subconsulta is None else Q(pk__in=subconsulta)
+
+
+def filtro_participantes(texto, using="default"):
+    """
+    Q para filtrar um QuerySet de Participante pelo texto buscado
+
+    Casa participantes cujo cliente casa com o texto (ver filtro_clientes) ou
+    cujo código de ingresso começa com o texto.
+    """
+    codigo = (texto or "").strip().upper()
+    filtro = _prefixo("codigo_ingresso", codigo, using) if codigo else Q(pk__in=[])
+    clientes = Cliente.objects.using(using).filter(filtro_clientes(texto, using)).values("pk")
+    return filtro | Q(cliente_id__in=clientes)
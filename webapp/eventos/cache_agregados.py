@@ -0,0 +1,71 @@
+"""
+Cache dos agregados do dashboard, das estatísticas e do histórico de vendas
+
+Os agregados ficam no cache do Django (settings.CACHES, por padrão em
+arquivos, compartilhado entre o servidor e o worker de importações) sob uma
+chave que inclui um número de versão. Escritas em Participante, Evento e
+Categoria (save/delete, escritas em lote, importações e ações do admin)
+incrementam a versão quando a transação é confirmada; as chaves antigas
+deixam de ser lidas e expiram sozinhas.
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CHAVE_VERSAO = "eventos:agregados:versao"
+
+
+def versao():
+    """Versão atual dos agregados (criada na primeira leitura)"""
+    atual = cache.get(CHAVE_VERSAO)
+    if atual is None:
+        # Começa de um valor novo: se a chave foi descartada pelo cache, versões
+        # antigas ainda guardadas não voltam a valer
+        cache.add(CHAVE_VERSAO, time.time_ns(), timeout=None)
+        atual = cache.get(CHAVE_VERSAO)
+    return atual
+
+
+def _incrementar_versao():
+    try:
+        cache.incr(CHAVE_VERSAO)
+    except ValueError:
+        cache.set(CHAVE_VERSAO, time.time_ns(), timeout=None)
+
+
+def invalidar(using=None):
+    """
+    Invalida os agregados em cache quando a transação atual for confirmada
+
+    Várias chamadas na mesma transação incrementam a versão mais de uma vez, o
+    que não tem efeito além de descartar as mesmas chaves.
+    """
+    transaction.on_commit(_incrementar_versao, using=using, robust=True)
+
+
+def obter(nome, calcular, parametros=None):
+    """
+    Retorna um agregado do cache, calculando-o se não existir na versão atual
+
+    Args:
+        nome: Identificador do agregado (ex: "dashboard")
+        calcular: Função sem argumentos que calcula o valor (precisa ser serializável)
+        parametros: Dicionário com os filtros que mudam o resultado
+
+    Returns:
+        Valor do agregado
+    """
+    chave = f"eventos:agregados:{nome}:{versao()}"
+    if parametros:
+        texto = json.dumps(parametros, sort_keys=True, default=str)
+        chave += ":" + hashlib.md5(texto.encode()).hexdigest()
+    valor = cache.get(chave)
+    if valor is None:
+        valor = calcular()
+        cache.set(chave, valor, timeout=getattr(settings, "AGREGADOS_CACHE_TIMEOUT", 600))
+    return valor
@@ -0,0 +1,144 @@
+"""
+Cache de exportações endereçado pelo conteúdo
+
+Cada exportação recebe uma impressão digital calculada a partir dos
+parâmetros da requisição e do estado dos dados (último ``atualizado_em`` e
+total de registros de Participante, Cliente e Evento, mais os nomes das
+categorias, que também aparecem nas exportações). O arquivo gerado é
+guardado em ``media/exportacoes/cache/<impressão>.<formato>``: enquanto os
+dados não mudam, novos pedidos reutilizam o mesmo arquivo, e a impressão é
+enviada como ETag para que o navegador possa revalidar sem baixar de novo.
+
+Arquivos antigos são removidos por idade e pelo tamanho total do diretório
+(os menos usados primeiro).
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from .models import Categoria, Cliente, Evento, Participante
+
+# Parâmetros que não mudam o conteúdo do arquivo
+PARAMETROS_IGNORADOS = {"arquivar", "cursor"}
+
+
+def diretorio_cache():
+    return Path(settings.MEDIA_ROOT) / "exportacoes" / "cache"
+
+
+def estado_dados():
+    """
+    Resumo barato do estado das tabelas exportadas
+
+    Returns:
+        Dicionário {modelo: [max(atualizado_em), total]}, com os pares [id, nome]
+        das categorias em "categoria"
+    """
+    estado = {}
+    for modelo in (Participante, Cliente, Evento):
+        resultado = modelo.objects.order_by().aggregate(ultima=Max("atualizado_em"), total=Count("id"))
+        estado[modelo._meta.model_name] = [resultado["ultima"], resultado["total"]]
+    # Categoria não tem atualizado_em; a tabela é pequena e só o nome é exportado
+    estado["categoria"] = list(Categoria.objects.order_by("pk").values_list("pk", "nome"))
+    return estado
+
+
+def impressao_digital(nome_base, formato, parametros):
+    """
+    Calcula a impressão digital de uma exportação
+
+    Args:
+        nome_base: Identificador da exportação (ex: "dados_completos")
+        formato: Formato do arquivo
+        parametros: QueryDict/dicionário com os filtros da requisição
+
+    Returns:
+        Hash SHA-256 (hex)
+    """
+    filtros = sorted(
+        (chave, valor)
+        for chave in parametros
+        if chave not in PARAMETROS_IGNORADOS
+        for valor in (parametros.getlist(chave) if hasattr(parametros, "getlist") else [parametros[chave]])
+    )
+    dados = {"exportacao": nome_base, "formato": formato, "filtros": filtros, "estado": estado_dados()}
+    texto = json.dumps(dados, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(texto.encode()).hexdigest()
+
+
+def etag(impressao):
+    return f'"{impressao}"'
+
+
+def etag_confere(request, impressao):
+    """Verifica se o cliente já tem a versão atual (cabeçalho If-None-Match)"""
+    cabecalho = request.headers.get("If-None-Match", "")
+    valores = {valor.strip().removeprefix("W/") for valor in cabecalho.split(",")}
+    return "*" in valores or etag(impressao) in valores
+
+
+def caminho_cache(impressao, formato):
+    return diretorio_cache() / f"{impressao}.{formato}"
+
+
+def buscar(impressao, formato):
+    """
+    Retorna o arquivo em cache, marcando-o como usado agora
+
+    Returns:
+        Path do arquivo ou None se não estiver em cache
+    """
+    caminho = caminho_cache(impressao, formato)
+    try:
+        os.utime(caminho)
+    except FileNotFoundError:
+        return None
+    return caminho
+
+
+def limpar(idade_maxima=None, tamanho_maximo=None):
+    """
+    Remove arquivos do cache por idade e por tamanho total
+
+    Arquivos parciais (gravação interrompida) também expiram pela idade.
+
+    Args:
+        idade_maxima: Segundos desde o último uso (padrão: settings.EXPORTACAO_CACHE_IDADE_MAXIMA)
+        tamanho_maximo: Bytes no diretório (padrão: settings.EXPORTACAO_CACHE_TAMANHO_MAXIMO)
+
+    Returns:
+        Tupla (arquivos removidos, bytes liberados)
+    """
+    idade_maxima = settings.EXPORTACAO_CACHE_IDADE_MAXIMA if idade_maxima is None else idade_maxima
+    tamanho_maximo = settings.EXPORTACAO_CACHE_TAMANHO_MAXIMO if tamanho_maximo is None else tamanho_maximo
+    diretorio = diretorio_cache()
+    if not diretorio.exists():
+        return 0, 0
+
+    arquivos = []
+    for entrada in os.scandir(diretorio):
+        if entrada.is_file():
+            info = entrada.stat()
+            arquivos.append((info.st_mtime, info.st_size, entrada.path))
+    arquivos.sort()  # menos usados primeiro
+
+    limite = time.time() - idade_maxima
+    total = sum(tamanho for _, tamanho, _ in arquivos)
+    removidos = liberados = 0
+    for usado_em, tamanho, caminho in arquivos:
+        if usado_em >= limite and total <= tamanho_maximo:
+            break
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            continue
+        total -= tamanho
+        removidos += 1
+        liberados += tamanho
+    return removidos, liberados
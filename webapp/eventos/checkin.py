@@ -0,0 +1,161 @@
+"""
+Check-in de participantes pelo código do ingresso
+
+Cada envio marca os ingressos como presentes com UPDATEs condicionais pelo
+índice único de codigo_ingresso (``WHERE codigo_ingresso IN (...) AND
+status = ...``), um por status permitido, na mesma transação. Como o status
+anterior de cada linha atualizada é conhecido pelo UPDATE que a alterou, os
+contadores do evento e o resumo diário de vendas são ajustados por deltas,
+sem recalcular o evento inteiro. Dois leitores enviando o mesmo código ao
+mesmo tempo não registram o check-in duas vezes: o segundo UPDATE não casa
+mais nenhuma linha.
+"""
+
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import cache_agregados
+from .models import Evento, Participante, VendaDiaria, _acumular_venda
+
+# Resultados de um código enviado
+REGISTRADO = "registrado"
+JA_PRESENTE = "ja_presente"
+STATUS_NAO_PERMITIDO = "status_nao_permitido"
+OUTRO_EVENTO = "outro_evento"
+NAO_ENCONTRADO = "nao_encontrado"
+
+# Campos lidos após o UPDATE: os do resumo de vendas e os devolvidos ao leitor
+CAMPOS_LEITURA = [
+    "codigo_ingresso",
+    "status",
+    "tipo_participante",
+    "valor_pago",
+    "data_inscricao",
+    "evento__nome",
+    "cliente__nome_completo",
+    "cliente__email",
+]
+
+# Códigos por UPDATE/SELECT (limite de parâmetros do SQLite)
+TAMANHO_BLOCO = 500
+
+
+def status_permitidos():
+    """Status de ingresso que podem receber check-in (settings.CHECKIN_STATUS_PERMITIDOS)"""
+    return list(getattr(settings, "CHECKIN_STATUS_PERMITIDOS", ["confirmado", "pendente"]))
+
+
+def _marcar_presentes(cursor, codigos, evento_id, agora, using):
+    """
+    Executa os UPDATEs condicionais de um bloco de códigos
+
+    Returns:
+        Dicionário {id do participante: status anterior} das linhas atualizadas
+    """
+    conexao = connections[using]
+    tabela = conexao.ops.quote_name(Participante._meta.db_table)
+    marcadores = ", ".join(["%s"] * len(codigos))
+    filtro_evento = " AND evento_id = %s" if evento_id is not None else ""
+    anteriores = {}
+    for status in status_permitidos():
+        parametros = ["presente", conexao.ops.adapt_datetimefield_value(agora), *codigos, status]
+        if evento_id is not None:
+            parametros.append(evento_id)
+        cursor.execute(
+            f"UPDATE {tabela} SET status = %s, atualizado_em = %s "
+            f"WHERE codigo_ingresso IN ({marcadores}) AND status = %s{filtro_evento} RETURNING id",
+            parametros,
+        )
+        anteriores.update((pk, status) for (pk,) in cursor.fetchall())
+    return anteriores
+
+
+def _ajustar_agregados(registrados, anteriores, using):
+    """Aplica aos contadores dos eventos e ao resumo de vendas a mudança de status dos registrados"""
+    deltas = {}
+    confirmados_por_evento = Counter()
+    for participante in registrados:
+        anterior = anteriores[participante.pk]
+        (dia, evento_id, _, tipo), valor = estado = participante.estado_venda()
+        _acumular_venda(deltas, ((dia, evento_id, anterior, tipo), valor), -1)
+        _acumular_venda(deltas, estado, +1)
+        if anterior == "confirmado":
+            confirmados_por_evento[evento_id] += 1
+    VendaDiaria.objects.using(using).somar(deltas)
+    for evento_id, quantidade in confirmados_por_evento.items():
+        Evento.objects.using(using).filter(pk=evento_id).update(total_confirmados=F("total_confirmados") - quantidade)
+    cache_agregados.invalidar(using)
+
+
+def _classificar(codigo, participante, anteriores, evento_id):
+    if participante is None:
+        return NAO_ENCONTRADO
+    if participante.pk in anteriores:
+        return REGISTRADO
+    if evento_id is not None and participante.evento_id != evento_id:
+        return OUTRO_EVENTO
+    if participante.status == "presente":
+        return JA_PRESENTE
+    return STATUS_NAO_PERMITIDO
+
+
+def registrar(codigos, evento_id=None, using="default"):
+    """
+    Registra o check-in de um ou mais ingressos
+
+    Args:
+        codigos: Códigos de ingresso (repetidos são tratados uma vez)
+        evento_id: Se informado, só aceita ingressos deste evento
+        using: Alias do banco
+
+    Returns:
+        Lista de (codigo, resultado, participante) na ordem dos códigos únicos;
+        participante é None quando o código não existe
+    """
+    codigos = list(dict.fromkeys(str(codigo).strip() for codigo in codigos if codigo and str(codigo).strip()))
+    agora = timezone.now()
+    anteriores = {}
+    participantes = {}
+    with transaction.atomic(using=using):
+        with connections[using].cursor() as cursor:
+            for inicio in range(0, len(codigos), TAMANHO_BLOCO):
+                anteriores.update(
+                    _marcar_presentes(cursor, codigos[inicio : inicio + TAMANHO_BLOCO], evento_id, agora, using)
+                )
+        for inicio in range(0, len(codigos), TAMANHO_BLOCO):
+            bloco = codigos[inicio : inicio + TAMANHO_BLOCO]
+            for participante in (
+                Participante.objects.using(using)
+                .select_related("cliente", "evento")
+                .only(*CAMPOS_LEITURA)
+                .filter(codigo_ingresso__in=bloco)
+            ):
+                participantes[participante.codigo_ingresso] = participante
+        registrados = [p for p in participantes.values() if p.pk in anteriores]
+        if registrados:
+            _ajustar_agregados(registrados, anteriores, using)
+
+    resultado = []
+    for codigo in codigos:
+        participante = participantes.get(codigo)
+        resultado.append((codigo, _classificar(codigo, participante, anteriores, evento_id), participante))
+    return resultado
+
+
+def dados_participante(participante):
+    """Dados do participante devolvidos ao leitor de ingressos"""
+    cliente = participante.cliente
+    return {
+        "codigo": participante.codigo_ingresso,
+        "nome": cliente.nome_completo if cliente else "",
+        "email": cliente.email if cliente else "",
+        "evento_id": participante.evento_id,
+        "evento": participante.evento.nome,
+        "tipo": participante.tipo_participante,
+        "tipo_display": participante.get_tipo_participante_display(),
+        "status": participante.status,
+    }
@@ -0,0 +1,194 @@
+"""
+Geração de códigos de ingresso sem colisão
+
+Cada código vem de um número de sequência único reservado no banco: no
+PostgreSQL, da SEQUENCE ``eventos_codigo_ingresso_seq``; nos demais bancos,
+do contador de SequenciaIngresso. O número (40 bits) é embaralhado por uma
+permutação (rede de Feistel com a chave sorteada na migração), codificado em
+8 caracteres de base32 de Crockford e recebe um dígito verificador (Luhn mod
+32): "ING-" + 9 caracteres. Como a permutação é uma bijeção, números
+diferentes sempre geram códigos diferentes, sem consultar a tabela nem
+repetir tentativas; os códigos antigos (ING- + 8 hexadecimais) têm outro
+tamanho e também não colidem.
+
+Os números são reservados em blocos (settings.CODIGOS_INGRESSO_BLOCO) e
+entregues da memória do processo. Dentro de uma transação, fora do
+PostgreSQL, a reserva desfeita por um rollback voltaria a ser entregue por
+outro processo, então só é reservado o que foi pedido e nada fica guardado.
+"""
+
+import hashlib
+import os
+import secrets
+import threading
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+
+from .models import SequenciaIngresso
+
+PREFIXO = "ING-"
+# Base32 de Crockford (sem I, L, O e U, que se confundem na leitura)
+ALFABETO = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+DIGITOS = 8
+BITS = 5 * DIGITOS
+SEQUENCIA_POSTGRES = "eventos_codigo_ingresso_seq"
+
+_VALORES = {caractere: valor for valor, caractere in enumerate(ALFABETO)}
+_METADE = BITS // 2
+_MASCARA = (1 << _METADE) - 1
+_RODADAS = 4
+
+
+def chaves_rodadas(chave):
+    """Chaves das rodadas da permutação derivadas da chave de SequenciaIngresso"""
+    resumo = hashlib.blake2b(str(chave).encode(), digest_size=4 * _RODADAS).digest()
+    return [int.from_bytes(resumo[i : i + 4], "big") for i in range(0, len(resumo), 4)]
+
+
+def embaralhar(numero, chaves):
+    """
+    Permuta um número de 40 bits (rede de Feistel balanceada)
+
+    É uma bijeção para quaisquer chaves: números distintos dão resultados
+    distintos. Evita que códigos consecutivos sejam parecidos; não é
+    criptografia.
+    """
+    esquerda, direita = numero >> _METADE, numero & _MASCARA
+    for chave in chaves:
+        mistura = ((direita ^ chave) * 0x9E3779B1) & 0xFFFFFFFF
+        mistura ^= mistura >> 15
+        mistura = (mistura * 0x85EBCA6B) & 0xFFFFFFFF
+        mistura ^= mistura >> 13
+        esquerda, direita = direita, esquerda ^ (mistura & _MASCARA)
+    return (esquerda << _METADE) | direita
+
+
+def _soma_luhn(texto, fator):
+    soma = 0
+    for caractere in reversed(texto):
+        parcela = fator * _VALORES[caractere]
+        soma += parcela // 32 + parcela % 32
+        fator = 3 - fator
+    return soma
+
+
+def digito_verificador(texto):
+    """Dígito verificador Luhn mod 32 (detecta um caractere trocado e a maioria das inversões vizinhas)"""
+    return ALFABETO[-_soma_luhn(texto, 2) % 32]
+
+
+# Pares de caracteres de cada valor de 10 bits e sua parcela na soma de Luhn (como os
+# pares têm tamanho par, a parcela não depende da posição do par no código)
+_PARES = [ALFABETO[valor >> 5] + ALFABETO[valor & 31] for valor in range(1024)]
+_SOMAS_PARES = [_soma_luhn(par, 2) for par in _PARES]
+
+
+def codificar(numero, chaves):
+    """Código de ingresso do número de sequência"""
+    valor = embaralhar(numero, chaves)
+    a, b, c, d = valor >> 30, (valor >> 20) & 1023, (valor >> 10) & 1023, valor & 1023
+    soma = _SOMAS_PARES[a] + _SOMAS_PARES[b] + _SOMAS_PARES[c] + _SOMAS_PARES[d]
+    return PREFIXO + _PARES[a] + _PARES[b] + _PARES[c] + _PARES[d] + ALFABETO[-soma % 32]
+
+
+def codigo_valido(codigo):
+    """Indica se o código tem o formato e o dígito verificador dos códigos gerados por este módulo"""
+    codigo = (codigo or "").strip().upper()
+    corpo = codigo[len(PREFIXO) :]
+    if not codigo.startswith(PREFIXO) or len(corpo) != DIGITOS + 1 or any(c not in _VALORES for c in corpo):
+        return False
+    return _soma_luhn(corpo, 1) % 32 == 0
+
+
+class GeradorCodigos:
+    """
+    Entrega códigos de ingresso a partir de blocos de números reservados no banco
+
+    Seguro entre threads; um processo criado por fork descarta os números
+    herdados do processo pai.
+    """
+
+    def __init__(self, tamanho_bloco=None):
+        """
+        Args:
+            tamanho_bloco: Números reservados por ida ao banco (padrão: settings.CODIGOS_INGRESSO_BLOCO)
+        """
+        self.tamanho_bloco = tamanho_bloco
+        self._trava = threading.Lock()
+        self._pid = os.getpid()
+        self._chaves = {}
+        self._livres = {}
+
+    def _chaves_banco(self, using):
+        if using not in self._chaves:
+            sequencia, _ = SequenciaIngresso.objects.using(using).get_or_create(
+                pk=1, defaults={"chave": secrets.randbits(63)}
+            )
+            self._chaves[using] = chaves_rodadas(sequencia.chave)
+        return self._chaves[using]
+
+    def _reservar(self, quantidade, using):
+        """Reserva números de sequência no banco"""
+        conexao = connections[using]
+        if conexao.vendor == "postgresql":
+            with conexao.cursor() as cursor:
+                cursor.execute("SELECT nextval(%s) FROM generate_series(1, %s)", [SEQUENCIA_POSTGRES, quantidade])
+                numeros = [numero for (numero,) in cursor.fetchall()]
+        else:
+            with transaction.atomic(using=using):
+                sequencia = SequenciaIngresso.objects.using(using).filter(pk=1)
+                sequencia.update(proximo=F("proximo") + quantidade)
+                fim = sequencia.values_list("proximo", flat=True).get()
+            numeros = range(fim - quantidade, fim)
+        if numeros and max(numeros) >= 1 << BITS:
+            raise RuntimeError("Sequência de códigos de ingresso esgotada")
+        return list(numeros)
+
+    def gerar(self, quantidade, using="default"):
+        """
+        Gera códigos de ingresso únicos
+
+        Args:
+            quantidade: Número de códigos
+            using: Alias do banco
+
+        Returns:
+            Lista de códigos
+        """
+        if quantidade <= 0:
+            return []
+        chaves = self._chaves_banco(using)
+        with self._trava:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._livres.clear()
+            livres = self._livres.setdefault(using, [])
+            numeros = livres[:quantidade]
+            del livres[:quantidade]
+        falta = quantidade - len(numeros)
+        if falta:
+            # A reserva roda fora da trava: outra thread pode estar esperando o lock de escrita do banco
+            conexao = connections[using]
+            duravel = conexao.vendor == "postgresql" or not conexao.in_atomic_block
+            tamanho_bloco = self.tamanho_bloco or getattr(settings, "CODIGOS_INGRESSO_BLOCO", 1000)
+            reservados = self._reservar(max(falta, tamanho_bloco) if duravel else falta, using)
+            numeros += reservados[:falta]
+            if len(reservados) > falta:
+                with self._trava:
+                    self._livres.setdefault(using, []).extend(reservados[falta:])
+        return [codificar(numero, chaves) for numero in numeros]
+
+
+gerador = GeradorCodigos()
+
+
+def gerar_codigos(quantidade, using="default"):
+    """Gera ``quantidade`` códigos de ingresso únicos (ver GeradorCodigos.gerar)"""
+    return gerador.gerar(quantidade, using)
+
+
+def gerar_codigo(using="default"):
+    """Gera um código de ingresso único"""
+    return gerador.gerar(1, using)[0]
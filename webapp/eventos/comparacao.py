@@ -0,0 +1,101 @@
+"""
+Comparação linha a linha entre importações
+
+Cada importação tem um manifesto (LinhaManifesto) com uma entrada por e-mail
+e o hash dos campos da linha. Os dois manifestos são lidos já ordenados pela
+chave e mesclados em uma única passada, como no merge do merge sort: O(n) e
+memória limitada ao tamanho de um bloco de leitura mais a página exibida.
+"""
+
+from .importacao import gerar_manifesto
+
+IGUAIS = "iguais"
+CATEGORIAS = ["adicionadas", "removidas", "alteradas"]
+LEITURA_CHUNK_SIZE = 5000
+
+
+def _manifesto_ordenado(importacao):
+    return (
+        importacao.manifesto.order_by("chave")
+        .values_list("chave", "email", "hash_linha")
+        .iterator(chunk_size=LEITURA_CHUNK_SIZE)
+    )
+
+
+def garantir_manifesto(importacao):
+    """Gera o manifesto de importações antigas (anteriores ao manifesto) a partir do arquivo"""
+    if importacao.manifesto.exists() or not importacao.arquivo:
+        return
+    gerar_manifesto(importacao)
+
+
+def mesclar_manifestos(base, comparada):
+    """
+    Mescla dois manifestos ordenados pela chave
+
+    Args:
+        base: Iterável de (chave, email, hash) da importação base, ordenado por chave
+        comparada: Iterável de (chave, email, hash) da importação comparada, ordenado por chave
+
+    Yields:
+        Tupla (categoria, email) com categoria em "adicionadas", "removidas",
+        "alteradas" ou "iguais"
+    """
+    base, comparada = iter(base), iter(comparada)
+    a, b = next(base, None), next(comparada, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and a[0] < b[0]):
+            yield "removidas", a[1]
+            a = next(base, None)
+        elif a is None or b[0] < a[0]:
+            yield "adicionadas", b[1]
+            b = next(comparada, None)
+        else:
+            yield ("alteradas" if a[2] != b[2] else IGUAIS), b[1]
+            a, b = next(base, None), next(comparada, None)
+
+
+def comparar(importacao_base, importacao_comparada, categoria="alteradas", pagina=1, por_pagina=50):
+    """
+    Compara duas importações e devolve os totais e uma página de uma categoria
+
+    Os totais e a página saem da mesma passada pelos manifestos.
+
+    Args:
+        importacao_base: ImportacaoExcel de referência
+        importacao_comparada: ImportacaoExcel comparada com a base
+        categoria: "adicionadas", "removidas" ou "alteradas"
+        pagina: Número da página (1-based)
+        por_pagina: E-mails por página
+
+    Returns:
+        Dicionário com "totais" (por categoria, incluindo "iguais") e "pagina"
+        (itens, numero, total_paginas, tem_anterior, tem_proxima)
+    """
+    for importacao in (importacao_base, importacao_comparada):
+        garantir_manifesto(importacao)
+
+    categoria = categoria if categoria in CATEGORIAS else "alteradas"
+    inicio = (pagina - 1) * por_pagina
+    totais = dict.fromkeys(CATEGORIAS + [IGUAIS], 0)
+    itens = []
+
+    for tipo, email in mesclar_manifestos(
+        _manifesto_ordenado(importacao_base), _manifesto_ordenado(importacao_comparada)
+    ):
+        if tipo == categoria and inicio <= totais[tipo] < inicio + por_pagina:
+            itens.append(email)
+        totais[tipo] += 1
+
+    total_paginas = max(1, -(-totais[categoria] // por_pagina))
+    return {
+        "totais": totais,
+        "categoria": categoria,
+        "pagina": {
+            "itens": sorted(itens, key=str.lower),
+            "numero": pagina,
+            "total_paginas": total_paginas,
+            "tem_anterior": pagina > 1,
+            "tem_proxima": pagina < total_paginas,
+        },
+    }
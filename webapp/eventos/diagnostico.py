@@ -0,0 +1,156 @@
+"""
+Diagnóstico de consultas por página
+
+Renderiza as listagens com duas quantidades de registros e compara o número
+de consultas SQL executadas. Se o número cresce junto com os dados, a página
+tem um problema N+1 (ex: acesso a participante.cliente sem select_related).
+
+Tudo roda dentro de uma transação desfeita ao final: os dados de amostra, o
+usuário administrador e a sessão nunca chegam ao banco. O cache fica
+desligado durante a medição, para que os agregados sejam sempre calculados.
+"""
+
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import Client as ClienteHttp
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from .models import Categoria, Cliente, Evento, Participante
+
+TAMANHOS_PADRAO = (5, 20)
+SEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+PAGINAS_PADRAO = [
+    "/participantes/?evento={evento}",
+    "/central-dados/?evento={evento}",
+    "/eventos/{evento}/",
+    "/eventos/?categoria={categoria}",
+    "/historico-vendas/?evento={evento}",
+    "/admin/eventos/participante/?evento__id__exact={evento}",
+    "/admin/eventos/evento/?categoria__id__exact={categoria}",
+    "/admin/eventos/cliente/?q={marcador}",
+]
+
+
+class ConsultasCrescentes(AssertionError):
+    """Uma ou mais páginas executam mais consultas conforme o volume de dados cresce"""
+
+
+class _Desfazer(Exception):
+    """Força o rollback da transação de diagnóstico"""
+
+
+def contar_consultas(funcao, *args, **kwargs):
+    """
+    Executa a função e conta as consultas SQL disparadas
+
+    Returns:
+        Tupla (resultado da função, número de consultas)
+    """
+    with CaptureQueriesContext(connection) as consultas:
+        resultado = funcao(*args, **kwargs)
+    return resultado, len(consultas.captured_queries)
+
+
+def _criar_amostra(evento, quantidade, marcador, inicio):
+    """
+    Cria clientes e participações de amostra para o evento
+
+    Também cria um evento vazio na mesma categoria a cada 5 participantes, para
+    que as listagens de eventos cresçam junto.
+    """
+    clientes = Cliente.objects.bulk_create(
+        Cliente(nome_completo=f"Diagnóstico {i}", email=f"{marcador}-{i}@exemplo.invalid")
+        for i in range(inicio, inicio + quantidade)
+    )
+    status = [codigo for codigo, _ in Participante.STATUS_CHOICES]
+    Participante.objects.bulk_create(
+        Participante(
+            cliente=cliente,
+            evento=evento,
+            status=status[i % len(status)],
+            codigo_ingresso=f"{marcador}-{inicio + i}".upper(),
+        )
+        for i, cliente in enumerate(clientes)
+    )
+    Evento.objects.bulk_create(
+        Evento(
+            nome=f"Evento de diagnóstico {i}",
+            categoria=evento.categoria,
+            data_evento=evento.data_evento,
+            local=evento.local,
+        )
+        for i in range(inicio // 5, (inicio + quantidade) // 5)
+    )
+
+
+def medir_paginas(tamanhos=TAMANHOS_PADRAO, paginas=None):
+    """
+    Mede as consultas de cada página para cada quantidade de registros
+
+    Args:
+        tamanhos: Quantidades de participantes de amostra (crescentes e menores que
+            o tamanho de página das listagens, para que todos apareçam)
+        paginas: URLs a medir, aceitando os marcadores {evento}, {categoria} e
+            {marcador} (padrão: PAGINAS_PADRAO)
+
+    Returns:
+        Dicionário {url: [consultas para cada tamanho]}
+    """
+    medicoes = {}
+    try:
+        with override_settings(CACHES=SEM_CACHE), transaction.atomic():
+            usuario = get_user_model().objects.create_superuser(
+                f"diagnostico-{uuid.uuid4().hex[:8]}", "diagnostico@exemplo.invalid", None
+            )
+            http = ClienteHttp(SERVER_NAME="localhost")
+            http.force_login(usuario)
+
+            marcador = f"diag-{uuid.uuid4().hex[:8]}"
+            categoria = Categoria.objects.create(nome=marcador)
+            evento = Evento.objects.create(
+                nome="Evento de diagnóstico",
+                categoria=categoria,
+                data_evento=timezone.now(),
+                local="Local de diagnóstico",
+                capacidade_maxima=max(tamanhos),
+            )
+            urls = [
+                url.format(evento=evento.pk, categoria=categoria.pk, marcador=marcador)
+                for url in (paginas or PAGINAS_PADRAO)
+            ]
+
+            criados = 0
+            for tamanho in tamanhos:
+                _criar_amostra(evento, tamanho - criados, marcador, criados)
+                criados = tamanho
+                for url in urls:
+                    resposta, total = contar_consultas(http.get, url)
+                    if resposta.status_code != 200:
+                        raise RuntimeError(f"{url} retornou HTTP {resposta.status_code}")
+                    medicoes.setdefault(url, []).append(total)
+            raise _Desfazer
+    except _Desfazer:
+        pass
+    return medicoes
+
+
+def verificar_paginas(tamanhos=TAMANHOS_PADRAO, paginas=None):
+    """
+    Garante que o número de consultas não depende do volume de dados
+
+    Returns:
+        Medições (ver medir_paginas)
+
+    Raises:
+        ConsultasCrescentes: Se alguma página executar mais consultas com mais dados
+    """
+    medicoes = medir_paginas(tamanhos, paginas)
+    crescentes = {url: totais for url, totais in medicoes.items() if len(set(totais)) > 1}
+    if crescentes:
+        detalhes = "; ".join(f"{url}: {' -> '.join(map(str, totais))}" for url, totais in crescentes.items())
+        raise ConsultasCrescentes(f"Consultas crescem com os dados: {detalhes}")
+    return medicoes
@@ -0,0 +1,344 @@
+"""
+Exportação de participantes em streaming
+
+As linhas são lidas do banco em blocos (``QuerySet.iterator``) e enviadas ao
+cliente conforme são geradas, então o tempo até o primeiro byte e o uso de
+memória não dependem do tamanho da tabela. Nada é gravado em disco, a não ser
+que o arquivamento seja pedido (cópia em ``media/exportacoes``).
+
+O Excel é gravado com ExcelStreamWriter (openpyxl write_only) num arquivo
+temporário, pois o .xlsx (zip) só fica completo no fim da gravação.
+
+Arquivos já gerados para os mesmos filtros e dados são reaproveitados (ver
+cache_exportacao).
+"""
+
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para importar módulos src
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pandas as pd
+from django.conf import settings
+from django.db.models import Avg, Count, Q, Sum
+from django.http import FileResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils import timezone
+
+from src.excel_handler import ExcelStreamWriter
+
+from . import cache_exportacao
+from .models import Participante
+
+# (campo do values_list, título da coluna)
+COLUNAS_DADOS_COMPLETOS = [
+    ("codigo_ingresso", "Código Ingresso"),
+    ("cliente__nome_completo", "Nome"),
+    ("cliente__email", "Email"),
+    ("cliente__telefone", "Telefone"),
+    ("cliente__cpf", "CPF"),
+    ("data_inscricao", "Data Inscrição"),
+    ("status", "Status Participante"),
+    ("evento__nome", "Evento"),
+    ("evento__data_evento", "Data Evento"),
+    ("evento__local", "Local"),
+    ("evento__categoria__nome", "Categoria"),
+    ("evento__status", "Status Evento"),
+    ("observacoes", "Observações"),
+]
+
+COLUNAS_PARTICIPANTES = [
+    ("codigo_ingresso", "Código Ingresso"),
+    ("cliente__nome_completo", "Nome"),
+    ("cliente__email", "Email"),
+    ("cliente__telefone", "Telefone"),
+    ("cliente__cpf", "CPF"),
+    ("data_inscricao", "Data Inscrição"),
+    ("status", "Status"),
+    ("evento__nome", "Evento"),
+    ("evento__data_evento", "Data Evento"),
+    ("evento__local", "Local"),
+    ("evento__categoria__nome", "Categoria"),
+]
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _converter_valor(valor):
+    """Converte valores do banco para tipos serializáveis em CSV/JSON (datas no fuso local, sem tz)"""
+    if isinstance(valor, datetime):
+        if timezone.is_aware(valor):
+            valor = timezone.localtime(valor)
+        return valor.replace(tzinfo=None).isoformat(sep=" ", timespec="seconds")
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    return valor
+
+
+def _valor_excel(valor):
+    """Mantém os tipos nativos para o Excel, com datas no fuso local"""
+    if isinstance(valor, datetime) and timezone.is_aware(valor):
+        return timezone.localtime(valor)
+    return valor
+
+
+def linhas_exportacao(queryset, colunas, chunk_size=None, converter=_converter_valor):
+    """
+    Itera as linhas do queryset como tuplas já convertidas, lendo o banco em blocos
+
+    Args:
+        queryset: QuerySet de Participante (filtros já aplicados)
+        colunas: Lista de (campo, título)
+        chunk_size: Linhas buscadas por ida ao banco (padrão: settings.EXPORTACAO_CHUNK_SIZE)
+        converter: Função aplicada a cada valor
+
+    Yields:
+        Tupla com os valores de cada coluna
+    """
+    chunk_size = chunk_size or settings.EXPORTACAO_CHUNK_SIZE
+    campos = [campo for campo, _ in colunas]
+    for linha in queryset.values_list(*campos).iterator(chunk_size=chunk_size):
+        yield tuple(converter(valor) for valor in linha)
+
+
+def estatisticas_exportacao(queryset):
+    """
+    Calcula a aba de estatísticas com uma única agregação SQL
+
+    Returns:
+        Lista de (métrica, valor)
+    """
+    totais = queryset.aggregate(
+        total=Count("id"),
+        eventos=Count("evento", distinct=True),
+        confirmados=Count("id", filter=Q(status="confirmado")),
+        pendentes=Count("id", filter=Q(status="pendente")),
+        cancelados=Count("id", filter=Q(status="cancelado")),
+    )
+    return [
+        ("Total de Participantes", totais["total"]),
+        ("Total de Eventos", totais["eventos"]),
+        ("Confirmados", totais["confirmados"]),
+        ("Pendentes", totais["pendentes"]),
+        ("Cancelados", totais["cancelados"]),
+    ]
+
+
+def estatisticas_relatorio(evento):
+    """
+    Calcula a aba de estatísticas do relatório Excel de um evento com agregação SQL
+
+    Returns:
+        DataFrame com as colunas Métrica e Valor
+    """
+    participantes = evento.participantes.all()
+    contagens = participantes.contagens()
+    valores = participantes.aggregate(arrecadado=Sum("valor_pago"), ticket_medio=Avg("valor_pago"))
+
+    linhas = [("Total de Participantes", contagens["total"])]
+    linhas += [(f"Status: {nome}", contagens["por_status"][codigo]) for codigo, nome in Participante.STATUS_CHOICES]
+    linhas += [(f"Tipo: {nome}", contagens["por_tipo"][codigo]) for codigo, nome in Participante.TIPO_CHOICES]
+    linhas += [
+        ("Valor Arrecadado", float(valores["arrecadado"] or 0)),
+        ("Ticket Médio", float(valores["ticket_medio"] or 0)),
+    ]
+    return pd.DataFrame(linhas, columns=["Métrica", "Valor"])
+
+
+class _Eco:
+    """Pseudo-arquivo para csv.writer: write() devolve o texto em vez de guardá-lo"""
+
+    def write(self, valor):
+        return valor
+
+
+def gerar_csv(linhas, titulos):
+    """Gera o CSV linha a linha (com BOM, como o to_csv(encoding="utf-8-sig") anterior)"""
+    escritor = csv.writer(_Eco())
+    yield "\ufeff" + escritor.writerow(titulos)
+    for linha in linhas:
+        yield escritor.writerow(linha)
+
+
+def gerar_ndjson(linhas, titulos):
+    """Gera um objeto JSON por linha (NDJSON)"""
+    for linha in linhas:
+        yield json.dumps(dict(zip(titulos, linha)), ensure_ascii=False) + "\n"
+
+
+def gerar_json(linhas, titulos):
+    """Gera um array JSON de registros, um registro por vez"""
+    yield "["
+    separador = "\n"
+    for linha in linhas:
+        yield separador + json.dumps(dict(zip(titulos, linha)), ensure_ascii=False)
+        separador = ",\n"
+    yield "\n]\n"
+
+
+GERADORES = {"csv": gerar_csv, "json": gerar_json, "ndjson": gerar_ndjson}
+
+
+def _parcial(destino):
+    """Nome temporário exclusivo ao lado do destino (renomeado quando a gravação termina)"""
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    return destino.with_name(f"{destino.name}.{uuid.uuid4().hex[:8]}.parcial")
+
+
+def _gravando(partes, destinos):
+    """
+    Repassa as partes ao cliente gravando uma cópia em cada destino
+
+    As cópias só recebem o nome final quando o envio termina; se o cliente
+    desconectar no meio, os arquivos incompletos são apagados.
+    """
+    parciais = [_parcial(destino) for destino in destinos]
+    arquivos = [open(parcial, "w", encoding="utf-8", newline="") for parcial in parciais]
+    try:
+        for parte in partes:
+            for arquivo in arquivos:
+                arquivo.write(parte)
+            yield parte
+    except BaseException:
+        for arquivo, parcial in zip(arquivos, parciais):
+            arquivo.close()
+            parcial.unlink(missing_ok=True)
+        raise
+    for arquivo, parcial, destino in zip(arquivos, parciais, destinos):
+        arquivo.close()
+        os.replace(parcial, destino)
+
+
+def resposta_streaming(queryset, colunas, formato, filename, destinos=()):
+    """
+    Monta a StreamingHttpResponse de uma exportação
+
+    Args:
+        queryset: QuerySet de Participante (filtros já aplicados)
+        colunas: Lista de (campo, título)
+        formato: "csv", "json" ou "ndjson"
+        filename: Nome do arquivo para download
+        destinos: Caminhos onde gravar cópias do conteúdo enviado (cache/arquivo)
+
+    Returns:
+        StreamingHttpResponse com o arquivo para download
+    """
+    titulos = [titulo for _, titulo in colunas]
+    partes = GERADORES[formato](linhas_exportacao(queryset, colunas), titulos)
+    if destinos:
+        partes = _gravando(partes, destinos)
+
+    response = StreamingHttpResponse(partes, content_type=CONTENT_TYPES[formato])
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def resposta_xlsx(queryset, colunas, filename, aba, estatisticas=False, destinos=()):
+    """
+    Monta a resposta de uma exportação Excel gravada em modo streaming
+
+    Args:
+        queryset: QuerySet de Participante (filtros já aplicados)
+        colunas: Lista de (campo, título)
+        filename: Nome do arquivo para download
+        aba: Nome da planilha com os dados
+        estatisticas: Se True, inclui a aba "Estatísticas" (agregação SQL)
+        destinos: Caminhos onde guardar o arquivo (cache/arquivo); sem destinos usa um temporário
+
+    Returns:
+        FileResponse com o arquivo para download
+    """
+    if destinos:
+        parcial = _parcial(destinos[0])
+        arquivo = open(parcial, "w+b")
+    else:
+        arquivo = tempfile.TemporaryFile(suffix=".xlsx")
+
+    try:
+        with ExcelStreamWriter() as writer:
+            titulos = [titulo for _, titulo in colunas]
+            writer.write_sheet(aba, titulos, linhas_exportacao(queryset, colunas, converter=_valor_excel))
+            if estatisticas:
+                writer.write_sheet("Estatísticas", ["Métrica", "Valor"], estatisticas_exportacao(queryset))
+            writer.save(arquivo)
+    except Exception:
+        arquivo.close()
+        if destinos:
+            parcial.unlink(missing_ok=True)
+        raise
+
+    if destinos:
+        arquivo.close()
+        os.replace(parcial, destinos[0])
+        for destino in destinos[1:]:
+            shutil.copyfile(destinos[0], destino)
+        arquivo = open(destinos[0], "rb")
+
+    arquivo.seek(0)
+    return FileResponse(arquivo, as_attachment=True, filename=filename)
+
+
+def exportar(request, queryset, colunas, formato, nome_base, aba=None, estatisticas=False):
+    """
+    Responde a uma exportação reaproveitando o arquivo em cache quando os dados não mudaram
+
+    A impressão digital (filtros + estado das tabelas) vira o nome do arquivo no
+    cache e o ETag da resposta; um If-None-Match igual recebe 304.
+
+    Args:
+        request: Requisição (filtros em request.GET; arquivar=1 grava uma cópia em media/exportacoes)
+        queryset: QuerySet de Participante (filtros já aplicados)
+        colunas: Lista de (campo, título)
+        formato: "csv", "json", "ndjson" ou outro valor para Excel
+        nome_base: Prefixo do nome do arquivo (ex: "participantes")
+        aba: Nome da planilha com os dados (Excel)
+        estatisticas: Se True, inclui a aba "Estatísticas" (Excel)
+
+    Returns:
+        HttpResponse com o arquivo (ou 304)
+    """
+    formato = formato if formato in GERADORES else "xlsx"
+    impressao = cache_exportacao.impressao_digital(nome_base, formato, request.GET)
+    etag = cache_exportacao.etag(impressao)
+
+    if cache_exportacao.etag_confere(request, impressao):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{nome_base}_{timestamp}.{formato}"
+    arquivo = Path(settings.MEDIA_ROOT) / "exportacoes" / filename if request.GET.get("arquivar") == "1" else None
+
+    em_cache = cache_exportacao.buscar(impressao, formato)
+    if em_cache:
+        if arquivo:
+            shutil.copyfile(em_cache, arquivo)
+        response = FileResponse(
+            open(em_cache, "rb"), as_attachment=True, filename=filename, content_type=CONTENT_TYPES.get(formato)
+        )
+    else:
+        cache_exportacao.limpar()
+        destinos = [cache_exportacao.caminho_cache(impressao, formato)] + ([arquivo] if arquivo else [])
+        if formato in GERADORES:
+            response = resposta_streaming(queryset, colunas, formato, filename, destinos)
+        else:
+            response = resposta_xlsx(queryset, colunas, filename, aba, estatisticas, destinos)
+
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
@@ -0,0 +1,240 @@
+"""
+Gravação de blocos da importação no PostgreSQL com COPY
+
+Cada bloco é copiado (COPY ... FROM STDIN) para uma tabela temporária de
+staging e mesclado nas tabelas reais com ``INSERT ... SELECT ... ON CONFLICT
+DO UPDATE``: uma ida ao banco por tabela, sem montar objetos do ORM. As
+regras são as mesmas do caminho ORM do ImportadorParticipantes (campos vazios
+não sobrescrevem dados do cliente, CPF só é gravado na criação, linhas sem
+mudança não são regravadas).
+
+Nos demais bancos (ou com psycopg2, sem ``cursor.copy``) o importador usa o
+caminho ORM em lote.
+"""
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import Cliente, Evento, Participante, VendaDiaria
+from .normalizacao import apenas_digitos, normalizar_texto
+
+TABELA_STAGING = "importacao_staging"
+COLUNAS_STAGING = [
+    "linha",
+    "email",
+    "nome",
+    "telefone",
+    "cpf",
+    "cidade",
+    "estado",
+    "status",
+    "codigo_ingresso",
+    "email_normalizado",
+    "nome_normalizado",
+    "telefone_digitos",
+    "cpf_digitos",
+]
+
+
+def disponivel():
+    """Indica se o banco atual suporta o caminho COPY (PostgreSQL com psycopg 3)"""
+    if connection.vendor != "postgresql" or not getattr(settings, "IMPORTACAO_COPY_POSTGRES", True):
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    return is_psycopg3
+
+
+def _informado(valor):
+    """Valor da planilha como texto, ou None se vazio ("" ou "nan")"""
+    texto = "" if valor is None else str(valor)
+    return texto if texto and texto != "nan" else None
+
+
+def _insert_select(modelo, expressoes, agora):
+    """
+    Monta colunas e expressões de um INSERT ... SELECT com todos os campos do modelo
+
+    Campos sem expressão recebem o valor padrão do modelo (o Django não cria
+    DEFAULT no banco), então colunas novas não quebram a gravação.
+
+    Args:
+        modelo: Model de destino
+        expressoes: Dicionário {campo: expressão SQL ou (expressão, parâmetros)}
+        agora: Data/hora usada em auto_now/auto_now_add
+
+    Returns:
+        Tupla (colunas, expressões, parâmetros)
+    """
+    colunas, valores, parametros = [], [], []
+    for campo in modelo._meta.concrete_fields:
+        if campo.primary_key:
+            continue
+        colunas.append(connection.ops.quote_name(campo.column))
+        if campo.name in expressoes:
+            expressao = expressoes[campo.name]
+            if isinstance(expressao, tuple):
+                expressao, extras = expressao
+                parametros.extend(extras)
+            valores.append(expressao)
+            continue
+        automatico = getattr(campo, "auto_now", False) or getattr(campo, "auto_now_add", False)
+        valor = agora if automatico else campo.get_default()
+        valores.append("%s")
+        parametros.append(campo.get_db_prep_save(valor, connection))
+    return ", ".join(colunas), ", ".join(valores), parametros
+
+
+def _copiar_staging(cursor, linhas, codigos):
+    cursor.execute(
+        f"CREATE TEMPORARY TABLE IF NOT EXISTS {TABELA_STAGING} ("
+        "linha integer, email text, nome text, telefone text, cpf text, "
+        "cidade text, estado text, status text, codigo_ingresso text, "
+        "email_normalizado text, nome_normalizado text, telefone_digitos text, cpf_digitos text)"
+    )
+    cursor.execute(f"TRUNCATE {TABELA_STAGING}")
+    with cursor.cursor.copy(f"COPY {TABELA_STAGING} ({', '.join(COLUNAS_STAGING)}) FROM STDIN") as copia:
+        for numero, dados in linhas:
+            email, nome = str(dados["email"]), _informado(dados["nome"])
+            telefone, cpf = _informado(dados["telefone"]), _informado(dados["cpf"])
+            copia.write_row(
+                (
+                    numero,
+                    email,
+                    nome,
+                    telefone,
+                    cpf,
+                    _informado(dados["cidade"]),
+                    _informado(dados["estado"]),
+                    dados["status"],
+                    codigos[numero],
+                    # Colunas de busca de Cliente, normalizadas como em Cliente.normalizar()
+                    normalizar_texto(email),
+                    normalizar_texto(nome),
+                    apenas_digitos(telefone),
+                    apenas_digitos(cpf),
+                )
+            )
+
+
+def _mesclar_clientes(cursor, agora):
+    """Upsert dos clientes do bloco; retorna os e-mails de clientes criados"""
+    tabela = Cliente._meta.db_table
+    colunas, valores, parametros = _insert_select(
+        Cliente,
+        {
+            "email": "s.email",
+            "nome_completo": "COALESCE(s.nome, '')",
+            "telefone": "COALESCE(s.telefone, '')",
+            "cpf": "s.cpf",
+            "cidade": "COALESCE(s.cidade, '')",
+            "estado": "COALESCE(s.estado, '')",
+            "email_normalizado": "s.email_normalizado",
+            "nome_normalizado": "s.nome_normalizado",
+            "telefone_digitos": "s.telefone_digitos",
+            "cpf_digitos": "s.cpf_digitos",
+        },
+        agora,
+    )
+    # DISTINCT ON: um e-mail repetido no bloco fica com a última linha
+    novos = "COALESCE(NULLIF(EXCLUDED.{0}, ''), c.{0})"
+    campos = ["nome_completo", "telefone", "cidade", "estado"]
+    # Colunas de busca acompanham o campo de origem quando ele é sobrescrito
+    normalizados = {"nome_normalizado": "nome_completo", "telefone_digitos": "telefone"}
+    cursor.execute(
+        f"INSERT INTO {tabela} AS c ({colunas}) "
+        f"SELECT DISTINCT ON (s.email) {valores} FROM {TABELA_STAGING} s ORDER BY s.email, s.linha DESC "
+        f"ON CONFLICT (email) DO UPDATE SET "
+        + ", ".join(f"{campo} = {novos.format(campo)}" for campo in campos)
+        + "".join(
+            f", {coluna} = CASE WHEN EXCLUDED.{origem} = '' THEN c.{coluna} ELSE EXCLUDED.{coluna} END"
+            for coluna, origem in normalizados.items()
+        )
+        + ", atualizado_em = EXCLUDED.atualizado_em "
+        f"WHERE ({', '.join(f'c.{campo}' for campo in campos)}) IS DISTINCT FROM "
+        f"({', '.join(novos.format(campo) for campo in campos)}) "
+        "RETURNING c.email, (c.xmax = 0)",
+        parametros,
+    )
+    return {email for email, criado in cursor.fetchall() if criado}
+
+
+def _mesclar_participantes(cursor, evento, agora):
+    """Upsert dos ingressos do bloco; retorna os ids de clientes com ingresso criado e os dias com escrita"""
+    tabela = Participante._meta.db_table
+    colunas, valores, parametros = _insert_select(
+        Participante,
+        {
+            "evento": ("%s", [evento.pk]),
+            "cliente": "c.id",
+            "tipo_participante": "'comum'",
+            "status": "s.status",
+            "codigo_ingresso": "s.codigo_ingresso",
+        },
+        agora,
+    )
+    cursor.execute(
+        f"INSERT INTO {tabela} AS p ({colunas}) "
+        f"SELECT DISTINCT ON (c.id) {valores} FROM {TABELA_STAGING} s "
+        f"JOIN {Cliente._meta.db_table} c ON c.email = s.email ORDER BY c.id, s.linha DESC "
+        "ON CONFLICT (evento_id, cliente_id) DO UPDATE SET "
+        "tipo_participante = EXCLUDED.tipo_participante, status = EXCLUDED.status, "
+        "atualizado_em = EXCLUDED.atualizado_em "
+        "WHERE (p.tipo_participante, p.status) IS DISTINCT FROM (EXCLUDED.tipo_participante, EXCLUDED.status) "
+        "RETURNING p.cliente_id, (p.xmax = 0), p.data_inscricao",
+        parametros,
+    )
+    retornados = cursor.fetchall()
+    criados = {cliente_id for cliente_id, criado, _ in retornados if criado}
+    return criados, {timezone.localdate(data_inscricao) for _, _, data_inscricao in retornados}
+
+
+def gravar_bloco(evento, linhas, gerar_codigos):
+    """
+    Grava um bloco de linhas com COPY + INSERT ... ON CONFLICT
+
+    Args:
+        evento: Evento dos ingressos
+        linhas: Lista de (numero, dados) já extraídos da planilha
+        gerar_codigos: Função que gera N códigos de ingresso (para os participantes novos)
+
+    Returns:
+        Lista de (numero, dados, cliente_id, cliente_created, created) na ordem das linhas,
+        no mesmo formato do caminho ORM
+    """
+    if not linhas:
+        return []
+    agora = timezone.now()
+    codigos = dict(zip((numero for numero, _ in linhas), gerar_codigos(len(linhas))))
+    with connection.cursor() as cursor:
+        _copiar_staging(cursor, linhas, codigos)
+        clientes_criados = _mesclar_clientes(cursor, agora)
+        ingressos_criados, dias_alterados = _mesclar_participantes(cursor, evento, agora)
+        cursor.execute(
+            f"SELECT c.email, c.id FROM {Cliente._meta.db_table} c "
+            f"WHERE c.email IN (SELECT email FROM {TABELA_STAGING})"
+        )
+        ids = dict(cursor.fetchall())
+
+    if dias_alterados:
+        Evento.objects.filter(pk=evento.pk).recalcular_contadores()
+        VendaDiaria.objects.recalcular(pares={(evento.pk, dia) for dia in dias_alterados})
+
+    # Só a primeira ocorrência de um e-mail conta como criação (como no caminho ORM)
+    resultado, vistos = [], set()
+    for numero, dados in linhas:
+        email = str(dados["email"])
+        cliente_id = ids[email]
+        primeira = email not in vistos
+        vistos.add(email)
+        resultado.append(
+            (
+                numero,
+                dados,
+                cliente_id,
+                primeira and email in clientes_criados,
+                primeira and cliente_id in ingressos_criados,
+            )
+        )
+    return resultado
@@ -0,0 +1,752 @@
+"""
+Motor de importação em lote de participantes
+
+Processa as linhas de uma planilha em blocos (chunks): os clientes existentes
+são carregados com uma única consulta ``IN`` por bloco e as gravações são
+feitas com ``bulk_create``/``bulk_update`` dentro de uma única transação.
+"""
+
+import codecs
+import hashlib
+import sys
+import time
+from datetime import timedelta
+from contextlib import nullcontext
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para importar módulos src
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pandas as pd
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from src.excel_handler import ExcelStreamReader
+
+from . import gravacao_postgres
+from .codigos import gerar_codigos
+from .models import (
+    Cliente,
+    ImportacaoExcel,
+    IndiceLinhaImportada,
+    LinhaManifesto,
+    MensagemImportacao,
+    Participante,
+    RegistroImportacao,
+)
+
+STATUS_MAP = {
+    "confirmado": "confirmado",
+    "pendente": "pendente",
+    "cancelado": "cancelado",
+    "presente": "presente",
+}
+
+CAMPOS_CLIENTE_ATUALIZAVEIS = ["nome_completo", "telefone", "cidade", "estado"]
+
+
+def _valor_informado(valor):
+    """Indica se o valor vindo da planilha deve ser considerado preenchido"""
+    return bool(valor) and valor != "nan"
+
+
+def extrair_dados_linha(row):
+    """
+    Extrai os campos de uma linha da planilha
+
+    Args:
+        row: Dicionário coluna -> valor (aceita colunas em maiúsculas ou minúsculas)
+
+    Returns:
+        Dicionário com os dados normalizados da linha
+    """
+    # Células vazias chegam como None (leitura em streaming)
+    row_dict = {str(k).lower(): ("" if v is None else v) for k, v in row.items()}
+
+    status = str(row_dict.get("status", "pendente")).lower()
+    return {
+        "nome": row_dict.get("nome", row_dict.get("nome_completo", "")),
+        "email": row_dict.get("email", ""),
+        "telefone": str(row_dict.get("telefone", "")),
+        "cpf": str(row_dict.get("cpf", "")),
+        "cidade": row_dict.get("cidade", ""),
+        "estado": row_dict.get("estado", ""),
+        "status": STATUS_MAP.get(status, "pendente"),
+    }
+
+
+# Campos de extrair_dados_linha que entram no hash da linha
+CAMPOS_HASH_LINHA = ["nome", "telefone", "cpf", "cidade", "estado", "status"]
+
+
+def _normalizar_texto(valor):
+    texto = " ".join(str(valor).split())
+    return "" if texto == "nan" else texto
+
+
+def chave_email(email):
+    """Chave do manifesto: hash curto (hex) do e-mail sem espaços e em minúsculas"""
+    return hashlib.blake2b(email.strip().lower().encode(), digest_size=8).hexdigest()
+
+
+def hash_linha(dados):
+    """
+    Hash curto dos campos normalizados de uma linha
+
+    Espaços extras e valores vazios ("", "nan") não alteram o hash, então só
+    mudanças reais de conteúdo produzem hashes diferentes.
+
+    Args:
+        dados: Dicionário retornado por extrair_dados_linha
+
+    Returns:
+        Hash BLAKE2b de 8 bytes em hexadecimal
+    """
+    texto = "\x1f".join(_normalizar_texto(dados[campo]) for campo in CAMPOS_HASH_LINHA)
+    return hashlib.blake2b(texto.encode(), digest_size=8).hexdigest()
+
+
+def gravar_manifesto(importacao, linhas):
+    """
+    Grava as entradas do manifesto de um bloco de linhas
+
+    E-mails repetidos ficam com a última ocorrência, como na importação.
+
+    Args:
+        importacao: ImportacaoExcel dona do manifesto
+        linhas: Lista de dicionários retornados por extrair_dados_linha
+    """
+    entradas = {}
+    for dados in linhas:
+        email = str(dados["email"]).strip()
+        if not _valor_informado(email):
+            continue
+        chave = chave_email(email)
+        entradas[chave] = LinhaManifesto(importacao=importacao, chave=chave, email=email, hash_linha=hash_linha(dados))
+    if entradas:
+        LinhaManifesto.objects.bulk_create(
+            entradas.values(),
+            update_conflicts=True,
+            unique_fields=["importacao", "chave"],
+            update_fields=["email", "hash_linha"],
+        )
+
+
+def gerar_manifesto(importacao, chunk_size=None):
+    """
+    Gera o manifesto de uma importação a partir do arquivo guardado, sem importar nada
+
+    Usado para importações feitas antes da existência do manifesto.
+
+    Returns:
+        Número de linhas lidas
+    """
+    chunk_size = chunk_size or getattr(settings, "IMPORTACAO_CHUNK_SIZE", 500)
+    lidas = 0
+    with transaction.atomic(), importacao.arquivo.open("rb") as arquivo:
+        importacao.manifesto.all().delete()
+        _, linhas = abrir_planilha(arquivo, importacao.nome_arquivo, chunk_size)
+        bloco = []
+        for row in linhas:
+            bloco.append(extrair_dados_linha(row))
+            if len(bloco) >= chunk_size:
+                gravar_manifesto(importacao, bloco)
+                lidas += len(bloco)
+                bloco = []
+        if bloco:
+            gravar_manifesto(importacao, bloco)
+            lidas += len(bloco)
+    return lidas
+
+
+def _detectar_encoding_csv(arquivo):
+    """
+    Descobre o encoding de um CSV e conta suas linhas em uma única passada
+
+    Returns:
+        Tupla (encoding, número de linhas de dados)
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    encoding = "utf-8"
+    linhas = 0
+    for bloco in iter(lambda: arquivo.read(1024 * 1024), b""):
+        linhas += bloco.count(b"\n")
+        if encoding == "utf-8":
+            try:
+                decoder.decode(bloco)
+            except UnicodeDecodeError:
+                encoding = "latin-1"
+    arquivo.seek(0)
+    return encoding, max(0, linhas - 1)
+
+
+def _linhas_xlsx(reader):
+    try:
+        yield from reader.iter_rows()
+    finally:
+        reader.close()
+
+
+def _linhas_csv(arquivo, encoding, chunk_size):
+    for bloco in pd.read_csv(arquivo, encoding=encoding, chunksize=chunk_size):
+        bloco = bloco.astype(object).where(bloco.notna(), None)
+        yield from bloco.to_dict("records")
+
+
+def abrir_planilha(arquivo, nome_arquivo, chunk_size=None):
+    """
+    Abre um arquivo Excel ou CSV para leitura em streaming
+
+    Planilhas .xlsx são lidas com openpyxl em modo read_only e CSVs em blocos
+    com pandas, então o consumo de memória não depende do tamanho do arquivo.
+
+    Args:
+        arquivo: Arquivo binário aberto
+        nome_arquivo: Nome original, usado para detectar o formato
+        chunk_size: Linhas por bloco na leitura de CSV
+
+    Returns:
+        Tupla (total estimado de linhas ou None, gerador de dicionários coluna -> valor)
+    """
+    chunk_size = chunk_size or getattr(settings, "IMPORTACAO_CHUNK_SIZE", 500)
+    nome = nome_arquivo.lower()
+
+    if nome.endswith(".csv"):
+        encoding, total = _detectar_encoding_csv(arquivo)
+        return total, _linhas_csv(arquivo, encoding, chunk_size)
+
+    if nome.endswith(".xls"):
+        # Formato binário antigo não é suportado pelo openpyxl
+        df = pd.read_excel(arquivo)
+        return len(df), (row.to_dict() for _, row in df.iterrows())
+
+    reader = ExcelStreamReader(arquivo)
+    return reader.count_rows(), _linhas_xlsx(reader)
+
+
+def caminho_conteudo(hash_conteudo, nome_arquivo):
+    """Nome do arquivo no armazenamento endereçado pelo conteúdo (mantém a extensão original)"""
+    extensao = Path(nome_arquivo).suffix.lower()
+    return f"importacoes/{hash_conteudo[:2]}/{hash_conteudo}{extensao}"
+
+
+def armazenar_arquivo(arquivo):
+    """
+    Guarda um upload uma única vez, pelo hash do conteúdo
+
+    O hash é calculado percorrendo o upload em blocos; se o mesmo conteúdo já
+    foi enviado antes, o arquivo existente é reaproveitado e nada é gravado.
+
+    Args:
+        arquivo: UploadedFile (request.FILES)
+
+    Returns:
+        Tupla (nome no storage, hash SHA-256 em hexadecimal)
+    """
+    digest = hashlib.sha256()
+    for bloco in arquivo.chunks():
+        digest.update(bloco)
+    hash_conteudo = digest.hexdigest()
+
+    storage = ImportacaoExcel._meta.get_field("arquivo").storage
+    nome = caminho_conteudo(hash_conteudo, arquivo.name)
+    if not storage.exists(nome):
+        arquivo.seek(0)
+        salvo = storage.save(nome, arquivo)
+        if salvo != nome:
+            # Outro upload do mesmo conteúdo gravou o arquivo ao mesmo tempo
+            storage.delete(salvo)
+    return nome, hash_conteudo
+
+
+def importacao_anterior(hash_conteudo, evento):
+    """
+    Procura uma importação bem-sucedida do mesmo conteúdo para o mesmo evento
+
+    Returns:
+        ImportacaoExcel mais recente ou None
+    """
+    return (
+        ImportacaoExcel.objects.filter(hash_conteudo=hash_conteudo, evento=evento, status="sucesso")
+        .order_by("-processado_em")
+        .first()
+    )
+
+
+class ImportadorParticipantes:
+    """Importa linhas de planilha como Clientes e Participantes de um evento"""
+
+    def __init__(self, evento, chunk_size=None, atomico=True, progresso=None, importacao=None, incremental=True):
+        """
+        Inicializa o importador
+
+        Args:
+            evento: Evento que receberá os ingressos
+            chunk_size: Linhas por bloco (padrão: settings.IMPORTACAO_CHUNK_SIZE)
+            atomico: Se True, a importação inteira roda em uma única transação;
+                se False, cada bloco é confirmado separadamente
+            progresso: Função chamada com o importador ao fim de cada bloco
+            importacao: ImportacaoExcel que receberá o manifesto (hash por linha) e
+                os registros do log (RegistroImportacao)
+            incremental: Se True, linhas idênticas às da última importação no
+                evento (IndiceLinhaImportada) não são regravadas
+        """
+        self.evento = evento
+        self.importacao = importacao
+        self.incremental = incremental
+        self.chunk_size = chunk_size or getattr(settings, "IMPORTACAO_CHUNK_SIZE", 500)
+        self.atomico = atomico
+        self.progresso = progresso
+
+        self.linhas_importadas = 0
+        self.linhas_novas = 0
+        self.linhas_atualizadas = 0
+        self.linhas_com_erro = 0
+        self.linhas_ignoradas = 0
+        self.linhas_processadas = 0
+        self.registros = []
+        self._mensagens = {}
+        # PostgreSQL: COPY para staging + INSERT ... ON CONFLICT; demais bancos: ORM em lote
+        self.usar_copy = gravacao_postgres.disponivel()
+
+    def processar(self, linhas):
+        """
+        Processa todas as linhas em blocos
+
+        Args:
+            linhas: Iterável de dicionários coluna -> valor, na ordem da planilha
+
+        Returns:
+            Dicionário com os contadores da importação
+        """
+        with transaction.atomic() if self.atomico else nullcontext():
+            bloco = []
+            for numero, row in enumerate(linhas, start=1):
+                bloco.append((numero, row))
+                if len(bloco) >= self.chunk_size:
+                    self._processar_bloco(bloco)
+                    bloco = []
+            if bloco:
+                self._processar_bloco(bloco)
+
+        return self.resultado()
+
+    def resultado(self):
+        """Retorna os contadores acumulados até o momento"""
+        return {
+            "linhas_importadas": self.linhas_importadas,
+            "linhas_novas": self.linhas_novas,
+            "linhas_atualizadas": self.linhas_atualizadas,
+            "linhas_com_erro": self.linhas_com_erro,
+            "linhas_ignoradas": self.linhas_ignoradas,
+        }
+
+    def _processar_bloco(self, bloco):
+        """Grava um bloco em lote; se falhar, reprocessa linha a linha para isolar os erros"""
+        linhas = []
+        for numero, row in bloco:
+            try:
+                linhas.append((numero, extrair_dados_linha(row)))
+            except Exception as e:
+                self._registrar_erro(numero, e)
+
+        if self.importacao is not None:
+            gravar_manifesto(self.importacao, [dados for _, dados in linhas])
+        if self.incremental:
+            linhas = self._descartar_inalteradas(linhas)
+
+        gravadas = []
+        try:
+            with transaction.atomic():
+                resultado_bloco = self._gravar_em_lote(linhas)
+        except DatabaseError:
+            for numero, dados in linhas:
+                try:
+                    with transaction.atomic():
+                        cliente_id, cliente_created, created = self._gravar_linha(dados)
+                except Exception as e:
+                    self._registrar_erro(numero, e)
+                else:
+                    self._registrar_sucesso(numero, cliente_id, cliente_created, created)
+                    gravadas.append(dados)
+        else:
+            for numero, dados, cliente_id, cliente_created, created in resultado_bloco:
+                self._registrar_sucesso(numero, cliente_id, cliente_created, created)
+                gravadas.append(dados)
+        self._atualizar_indice(gravadas)
+        self._gravar_registros()
+
+        self.linhas_processadas += len(bloco)
+        if self.progresso:
+            self.progresso(self)
+
+    def _descartar_inalteradas(self, linhas):
+        """
+        Remove do bloco as linhas idênticas às já gravadas para o evento
+
+        Uma linha é ignorada quando o hash bate com o do índice e nem o ingresso
+        nem o cliente foram alterados depois da gravação (ex: edição no admin).
+
+        Returns:
+            Lista de (numero, dados) que ainda precisam ser gravadas
+        """
+        hashes = {numero: (chave_email(str(dados["email"])), hash_linha(dados)) for numero, dados in linhas}
+        indice = {
+            chave: (hash_gravado, gravado_em)
+            for chave, hash_gravado, gravado_em in IndiceLinhaImportada.objects.filter(
+                evento=self.evento, chave__in={chave for chave, _ in hashes.values()}
+            ).values_list("chave", "hash_linha", "gravado_em")
+        }
+        candidatas = set()
+        for numero, dados in linhas:
+            chave, hash_atual = hashes[numero]
+            if chave in indice and indice[chave][0] == hash_atual:
+                candidatas.add(dados["email"])
+        if not candidatas:
+            return linhas
+
+        intactas = {}
+        for email, cliente_id, participante_em, cliente_em in Participante.objects.filter(
+            evento=self.evento, cliente__email__in=candidatas
+        ).values_list("cliente__email", "cliente_id", "atualizado_em", "cliente__atualizado_em"):
+            chave = chave_email(email)
+            if max(participante_em, cliente_em) <= indice[chave][1]:
+                intactas[chave] = cliente_id
+
+        restantes = []
+        for numero, dados in linhas:
+            chave, hash_atual = hashes[numero]
+            if chave in intactas and indice[chave][0] == hash_atual:
+                self.linhas_ignoradas += 1
+                self.registros.append((numero, RegistroImportacao.IGNORADO, intactas[chave], None))
+            else:
+                restantes.append((numero, dados))
+        return restantes
+
+    def _atualizar_indice(self, gravadas):
+        """Registra o hash das linhas gravadas no índice do evento"""
+        if not self.incremental or not gravadas:
+            return
+        agora = timezone.now()
+        entradas = {}
+        for dados in gravadas:
+            chave = chave_email(str(dados["email"]))
+            entradas[chave] = IndiceLinhaImportada(
+                evento=self.evento, chave=chave, hash_linha=hash_linha(dados), gravado_em=agora
+            )
+        IndiceLinhaImportada.objects.bulk_create(
+            entradas.values(),
+            update_conflicts=True,
+            unique_fields=["evento", "chave"],
+            update_fields=["hash_linha", "gravado_em"],
+        )
+
+    def _gravar_em_lote(self, linhas):
+        """
+        Grava um bloco de linhas com uma consulta por tabela e escritas em lote
+
+        No PostgreSQL o bloco é gravado com COPY + INSERT ... ON CONFLICT
+        (gravacao_postgres); nos demais bancos, com bulk_create/bulk_update.
+
+        Returns:
+            Lista de (numero, dados, cliente_id, cliente_created, created) na ordem das linhas
+        """
+        if self.usar_copy:
+            return gravacao_postgres.gravar_bloco(self.evento, linhas, gerar_codigos)
+
+        agora = timezone.now()
+        emails = {dados["email"] for _, dados in linhas}
+        clientes = {c.email: c for c in Cliente.objects.filter(email__in=emails)}
+
+        # Clientes: novos são criados em lote, existentes só são atualizados se algo mudou
+        novos_clientes = {}
+        clientes_alterados = {}
+        criado_por_linha = []
+        for numero, dados in linhas:
+            email = dados["email"]
+            cliente = clientes.get(email)
+            if cliente is None:
+                telefone, cpf = dados["telefone"], dados["cpf"]
+                cliente = Cliente(
+                    email=email,
+                    nome_completo=dados["nome"],
+                    telefone=telefone if telefone != "nan" else "",
+                    cpf=cpf if _valor_informado(cpf) else None,
+                    cidade=dados["cidade"] if _valor_informado(dados["cidade"]) else "",
+                    estado=dados["estado"] if _valor_informado(dados["estado"]) else "",
+                )
+                clientes[email] = novos_clientes[email] = cliente
+                criado_por_linha.append(True)
+                continue
+
+            criado_por_linha.append(False)
+            novos = {
+                "nome_completo": dados["nome"],
+                "telefone": dados["telefone"],
+                "cidade": dados["cidade"],
+                "estado": dados["estado"],
+            }
+            for campo, valor in novos.items():
+                if _valor_informado(valor) and getattr(cliente, campo) != valor:
+                    setattr(cliente, campo, valor)
+                    if email not in novos_clientes:
+                        clientes_alterados[email] = cliente
+
+        if novos_clientes:
+            Cliente.objects.bulk_create(novos_clientes.values(), batch_size=self.chunk_size)
+            if not connection.features.can_return_rows_from_bulk_insert:
+                # Bancos sem RETURNING não preenchem o pk após o bulk_create
+                for cliente in Cliente.objects.filter(email__in=list(novos_clientes)).only("id", "email"):
+                    novos_clientes[cliente.email].pk = cliente.pk
+        if clientes_alterados:
+            for cliente in clientes_alterados.values():
+                cliente.atualizado_em = agora
+            Cliente.objects.bulk_update(
+                clientes_alterados.values(), CAMPOS_CLIENTE_ATUALIZAVEIS + ["atualizado_em"], batch_size=self.chunk_size
+            )
+
+        # Participantes: um ingresso por cliente no evento (unique_together)
+        cliente_ids = {c.pk for c in clientes.values()}
+        ingressos = {
+            p.cliente_id: p
+            for p in Participante.objects.filter(evento=self.evento, cliente_id__in=cliente_ids)
+        }
+        novos_ingressos = {}
+        ingressos_alterados = {}
+        resultado = []
+        for (numero, dados), cliente_created in zip(linhas, criado_por_linha):
+            cliente = clientes[dados["email"]]
+            participante = ingressos.get(cliente.pk)
+            created = participante is None
+            if created:
+                participante = Participante(
+                    evento=self.evento,
+                    cliente=cliente,
+                    tipo_participante="comum",
+                    status=dados["status"],
+                )
+                ingressos[cliente.pk] = novos_ingressos[cliente.pk] = participante
+            elif (participante.tipo_participante, participante.status) != ("comum", dados["status"]):
+                participante.tipo_participante = "comum"
+                participante.status = dados["status"]
+                if cliente.pk not in novos_ingressos:
+                    ingressos_alterados[cliente.pk] = participante
+            resultado.append((numero, dados, cliente.pk, cliente_created, created))
+
+        if novos_ingressos:
+            # O bulk_create preenche os códigos de ingresso com um bloco do gerador (eventos/codigos.py)
+            Participante.objects.bulk_create(novos_ingressos.values(), batch_size=self.chunk_size)
+        if ingressos_alterados:
+            for participante in ingressos_alterados.values():
+                participante.atualizado_em = agora
+            Participante.objects.bulk_update(
+                ingressos_alterados.values(),
+                ["tipo_participante", "status", "atualizado_em"],
+                batch_size=self.chunk_size,
+            )
+
+        return resultado
+
+    def _gravar_linha(self, dados):
+        """
+        Grava uma única linha (caminho de contingência quando o lote falha)
+
+        Returns:
+            Tupla (cliente_id, cliente_created, created)
+        """
+        nome, telefone, cpf = dados["nome"], dados["telefone"], dados["cpf"]
+        cidade, estado = dados["cidade"], dados["estado"]
+
+        cliente, cliente_created = Cliente.objects.get_or_create(
+            email=dados["email"],
+            defaults={
+                "nome_completo": nome,
+                "telefone": telefone if telefone != "nan" else "",
+                "cpf": cpf if _valor_informado(cpf) else None,
+                "cidade": cidade if _valor_informado(cidade) else "",
+                "estado": estado if _valor_informado(estado) else "",
+            },
+        )
+
+        if not cliente_created:
+            atualizado = False
+            campos = (("nome_completo", nome), ("telefone", telefone), ("cidade", cidade), ("estado", estado))
+            for campo, valor in campos:
+                if _valor_informado(valor) and getattr(cliente, campo) != valor:
+                    setattr(cliente, campo, valor)
+                    atualizado = True
+            if atualizado:
+                cliente.save()
+
+        _, created = Participante.objects.update_or_create(
+            evento=self.evento,
+            cliente=cliente,
+            defaults={
+                "tipo_participante": "comum",
+                "status": dados["status"],
+            },
+        )
+        return cliente.pk, cliente_created, created
+
+    def _registrar_sucesso(self, numero, cliente_id, cliente_created, created):
+        self.linhas_importadas += 1
+        if created:
+            self.linhas_novas += 1
+            resultado = RegistroImportacao.CLIENTE_CRIADO if cliente_created else RegistroImportacao.INGRESSO_CRIADO
+        else:
+            self.linhas_atualizadas += 1
+            resultado = RegistroImportacao.ATUALIZADO
+        self.registros.append((numero, resultado, cliente_id, None))
+
+    def _registrar_erro(self, numero, erro):
+        self.linhas_com_erro += 1
+        self.registros.append((numero, RegistroImportacao.ERRO, None, str(erro)))
+
+    def _gravar_registros(self):
+        """
+        Grava em lote os registros do log acumulados no bloco
+
+        Os textos das mensagens de erro são gravados uma única vez
+        (MensagemImportacao) e os registros guardam só o id.
+        """
+        registros, self.registros = self.registros, []
+        if self.importacao is None or not registros:
+            return
+
+        tamanho = MensagemImportacao.TAMANHO_MAXIMO
+        textos = {mensagem[:tamanho] for _, _, _, mensagem in registros if mensagem} - self._mensagens.keys()
+        if textos:
+            MensagemImportacao.objects.bulk_create(
+                [MensagemImportacao(texto=texto) for texto in textos], ignore_conflicts=True
+            )
+            self._mensagens.update(MensagemImportacao.objects.filter(texto__in=textos).values_list("texto", "id"))
+
+        RegistroImportacao.objects.bulk_create(
+            [
+                RegistroImportacao(
+                    importacao=self.importacao,
+                    linha=numero,
+                    resultado=resultado,
+                    cliente_id=cliente_id,
+                    mensagem_id=self._mensagens[mensagem[:tamanho]] if mensagem else None,
+                )
+                for numero, resultado, cliente_id, mensagem in registros
+            ],
+            batch_size=self.chunk_size,
+        )
+
+
+def encerrar_importacoes_interrompidas(tempo_limite=None):
+    """
+    Marca como erro as importações "processando" há mais de ``tempo_limite`` segundos
+
+    Um worker encerrado no meio de uma importação (kill, falta de memória,
+    deploy) deixa o registro em "processando" para sempre. Sem conclusão no
+    prazo, a importação é dada como interrompida; as linhas já gravadas ficam e
+    o arquivo pode ser enviado de novo.
+
+    Args:
+        tempo_limite: Segundos desde iniciado_em (padrão: settings.IMPORTACAO_TEMPO_LIMITE)
+
+    Returns:
+        Número de importações encerradas
+    """
+    tempo_limite = tempo_limite or getattr(settings, "IMPORTACAO_TEMPO_LIMITE", 3600)
+    agora = timezone.now()
+    return ImportacaoExcel.objects.filter(
+        status="processando", iniciado_em__lt=agora - timedelta(seconds=tempo_limite)
+    ).update(
+        status="erro",
+        mensagem_erro=(
+            f"Processamento interrompido (sem conclusão em {tempo_limite // 60} min). Envie o arquivo novamente."
+        ),
+        processado_em=agora,
+    )
+
+
+def proxima_importacao():
+    """
+    Reserva a importação mais antiga da fila
+
+    A reserva é um UPDATE condicional (status na_fila -> processando), então
+    vários workers podem disputar a mesma fila sem processar o mesmo arquivo.
+    Antes, as importações interrompidas são encerradas
+    (``encerrar_importacoes_interrompidas``).
+
+    Returns:
+        ImportacaoExcel reservada ou None se a fila estiver vazia
+    """
+    encerrar_importacoes_interrompidas()
+    while True:
+        pk = (
+            ImportacaoExcel.objects.filter(status="na_fila")
+            .order_by("criado_em", "pk")
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if pk is None:
+            return None
+        reservada = ImportacaoExcel.objects.filter(pk=pk, status="na_fila").update(
+            status="processando", iniciado_em=timezone.now()
+        )
+        if reservada:
+            return ImportacaoExcel.objects.select_related("evento").get(pk=pk)
+
+
+def processar_importacao(importacao, atomico=False):
+    """
+    Executa uma importação registrada em ImportacaoExcel
+
+    O progresso (linhas processadas e linhas por segundo) é gravado ao fim de
+    cada bloco, para ser consultado pelo endpoint de progresso.
+
+    Args:
+        importacao: ImportacaoExcel com arquivo e evento definidos
+        atomico: Se True, grava tudo em uma única transação (sem progresso visível)
+
+    Returns:
+        Dicionário com os contadores da importação
+    """
+    inicio = time.monotonic()
+    if importacao.iniciado_em is None:
+        importacao.iniciado_em = timezone.now()
+    importacao.status = "processando"
+
+    def registrar_progresso(importador):
+        decorrido = time.monotonic() - inicio
+        ImportacaoExcel.objects.filter(pk=importacao.pk).update(
+            linhas_processadas=importador.linhas_processadas,
+            linhas_importadas=importador.linhas_importadas,
+            linhas_com_erro=importador.linhas_com_erro,
+            linhas_ignoradas=importador.linhas_ignoradas,
+            linhas_por_segundo=importador.linhas_processadas / decorrido if decorrido > 0 else 0,
+        )
+
+    importador = ImportadorParticipantes(
+        importacao.evento, atomico=atomico, progresso=registrar_progresso, importacao=importacao
+    )
+    importacao.registros.all().delete()
+    try:
+        with importacao.arquivo.open("rb") as arquivo:
+            total_linhas, linhas = abrir_planilha(arquivo, importacao.nome_arquivo, importador.chunk_size)
+            importacao.total_linhas = total_linhas or 0
+            importacao.save()
+            resultado = importador.processar(linhas)
+    except Exception as e:
+        importacao.status = "erro"
+        importacao.mensagem_erro = str(e)
+        importacao.processado_em = timezone.now()
+        importacao.save()
+        raise
+
+    decorrido = time.monotonic() - inicio
+    importacao.total_linhas = importacao.linhas_processadas = importador.linhas_processadas
+    importacao.linhas_por_segundo = importador.linhas_processadas / decorrido if decorrido > 0 else 0
+    importacao.linhas_importadas = resultado["linhas_importadas"]
+    importacao.linhas_com_erro = resultado["linhas_com_erro"]
+    importacao.linhas_ignoradas = resultado["linhas_ignoradas"]
+    importacao.status = "sucesso" if resultado["linhas_com_erro"] == 0 else "erro"
+    importacao.processado_em = timezone.now()
+    importacao.save()
+    return resultado
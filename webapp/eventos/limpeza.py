@@ -0,0 +1,276 @@
+"""
+Limpeza dos dados dos participantes de um evento, executada no banco
+
+Cada operação é um conjunto de registros definido em SQL e aplicado com
+UPDATE/DELETE em blocos de até ``settings.LIMPEZA_TAMANHO_BLOCO`` registros,
+cada bloco na sua transação: nada é carregado em DataFrame nem instanciado
+como objeto do ORM. As mesmas consultas dão a prévia (quantos registros cada
+operação alteraria), sem gravar nada, contada na ordem de execução: o que uma
+exclusão remove não conta nas operações seguintes.
+
+- remover_duplicados: participantes cujo cliente tem o mesmo e-mail (sem
+  maiúsculas/acentos) de outro participante do evento; ROW_NUMBER() sobre o
+  e-mail mantém o ingresso de melhor status (presente, confirmado, pendente,
+  cancelado) e, no empate, o mais antigo;
+- validar_emails: participantes cujo cliente tem e-mail fora do padrão;
+- normalizar_nomes: nome dos clientes com espaços nas pontas removidos e a
+  primeira letra de cada palavra maiúscula (INITCAP);
+- limpar_telefones: telefones com 10 ou 11 dígitos (com ou sem o 55 do país)
+  no formato "(XX) XXXXX-XXXX".
+
+Nomes e telefones ficam no cadastro do Cliente, compartilhado entre os
+eventos: a correção vale para todos os eventos em que o cliente está inscrito
+(``clientes_compartilhados`` conta esses casos para a prévia).
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Exists, F, Func, IntegerField, OuterRef, Q, Value, When, Window
+from django.db.models.functions import Concat, Length, RowNumber, Substr, Trim
+from django.db.models.lookups import Exact
+from django.utils import timezone
+
+from .models import Cliente, Participante
+
+# Mesmo padrão de DataCleaner.validate_email
+PADRAO_EMAIL = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+
+# Operações na ordem em que são aplicadas, com o rótulo das mensagens
+OPERACOES = {
+    "validar_emails": "Participantes com e-mail inválido removidos",
+    "remover_duplicados": "Participantes duplicados removidos",
+    "normalizar_nomes": "Nomes padronizados",
+    "limpar_telefones": "Telefones formatados",
+}
+
+# Operações que alteram o cadastro do Cliente (e não o ingresso no evento)
+OPERACOES_CLIENTE = {"normalizar_nomes", "limpar_telefones"}
+
+# Preferência do ingresso mantido entre duplicados (menor primeiro)
+PRIORIDADE_STATUS = ["presente", "confirmado", "pendente", "cancelado"]
+
+
+class Initcap(Func):
+    """INITCAP do PostgreSQL (no SQLite, registrada por banco.registrar_funcoes_sqlite)"""
+
+    function = "INITCAP"
+
+
+def duplicados(evento, removidos=()):
+    """Participantes do evento a remover por repetirem o e-mail de outro participante"""
+    prioridade = Case(
+        *(When(status=status, then=Value(posicao)) for posicao, status in enumerate(PRIORIDADE_STATUS)),
+        default=Value(len(PRIORIDADE_STATUS)),
+        output_field=IntegerField(),
+    )
+    repetidos = (
+        _participantes(evento, removidos)
+        .filter(cliente__isnull=False)
+        .exclude(cliente__email_normalizado="")
+        .annotate(
+            posicao=Window(
+                RowNumber(),
+                partition_by=F("cliente__email_normalizado"),
+                order_by=[prioridade.asc(), F("data_inscricao").asc(), F("pk").asc()],
+            )
+        )
+        .filter(posicao__gt=1)
+        .values("pk")
+    )
+    return Participante.objects.filter(pk__in=repetidos)
+
+
+def emails_invalidos(evento, removidos=()):
+    """Participantes do evento cujo cliente tem e-mail fora de PADRAO_EMAIL"""
+    return _participantes(evento, removidos).filter(cliente__isnull=False).exclude(cliente__email__regex=PADRAO_EMAIL)
+
+
+def _participantes(evento, removidos=()):
+    """Participantes do evento, sem os ``removidos`` por operações anteriores (na prévia)"""
+    participantes = Participante.objects.filter(evento=evento)
+    for excluidos in removidos:
+        participantes = participantes.exclude(pk__in=excluidos.values("pk"))
+    return participantes
+
+
+def _clientes(evento, removidos=()):
+    """Clientes inscritos no evento, sem os de participantes ``removidos`` (na prévia)"""
+    # JOIN (e não pk__in de subconsulta): com a faixa de pk, o SQLite percorre só
+    # a faixa em vez de sondar a lista de clientes do evento inteiro a cada bloco
+    if not removidos:
+        return Cliente.objects.filter(participacoes__evento=evento)
+    # Mesmo filter(): a condição vale para a própria inscrição no evento (um JOIN),
+    # e não uma subconsulta correlacionada por cliente como em exclude()
+    return Cliente.objects.filter(participacoes__evento=evento, participacoes__in=_participantes(evento, removidos))
+
+
+def _nome_padronizado():
+    return Trim(Initcap("nome_completo"))
+
+
+def nomes_fora_do_padrao(evento, removidos=()):
+    """Clientes do evento cujo nome muda com a padronização"""
+    return _clientes(evento, removidos).exclude(nome_completo=_nome_padronizado())
+
+
+def _digitos_nacionais():
+    """Dígitos do telefone sem o código do país (55) quando há 12 ou 13 dígitos"""
+    digitos = F("telefone_digitos")
+    return Case(
+        When(
+            Q(telefone_digitos__startswith="55") & (Exact(Length(digitos), 12) | Exact(Length(digitos), 13)),
+            then=Substr(digitos, 3),
+        ),
+        default=digitos,
+    )
+
+
+def _telefone_formatado():
+    """Telefone no formato "(XX) XXXXX-XXXX" ou "(XX) XXXX-XXXX"; os demais ficam como estão"""
+    digitos = _digitos_nacionais()
+    casos = []
+    for tamanho in (11, 10):
+        meio = tamanho - 6
+        formatado = Concat(
+            Value("("),
+            Substr(digitos, 1, 2),
+            Value(") "),
+            Substr(digitos, 3, meio),
+            Value("-"),
+            Substr(digitos, 3 + meio, 4),
+        )
+        casos.append(When(Exact(Length(digitos), tamanho), then=formatado))
+    return Case(*casos, default=F("telefone"))
+
+
+def telefones_fora_do_formato(evento, removidos=()):
+    """Clientes do evento cujo telefone muda com a formatação"""
+    return _clientes(evento, removidos).exclude(telefone="").exclude(telefone=_telefone_formatado())
+
+
+def _aplicar(operacao, registros):
+    """Aplica a operação a um bloco de registros; retorna o número de registros alterados"""
+    if operacao not in OPERACOES_CLIENTE:
+        return registros.excluir_em_lote()
+    agora = timezone.now()
+    if operacao == "normalizar_nomes":
+        # Maiúsculas e espaços nas pontas não mudam nome_normalizado
+        return registros.update(
+            nome_completo=_nome_padronizado(), nome_normalizado=F("nome_normalizado"), atualizado_em=agora
+        )
+    return registros.update(telefone=_telefone_formatado(), telefone_digitos=_digitos_nacionais(), atualizado_em=agora)
+
+
+CONSULTAS = {
+    "validar_emails": emails_invalidos,
+    "remover_duplicados": duplicados,
+    "normalizar_nomes": nomes_fora_do_padrao,
+    "limpar_telefones": telefones_fora_do_formato,
+}
+
+# Registros percorridos em faixas de pk por operação. Filtros que dependem só do
+# próprio registro são avaliados dentro de cada faixa; os duplicados dependem do
+# evento inteiro (ROW_NUMBER) e são percorridos já filtrados.
+UNIVERSOS = {
+    "validar_emails": _participantes,
+    "remover_duplicados": duplicados,
+    "normalizar_nomes": _clientes,
+    "limpar_telefones": _clientes,
+}
+
+
+def _faixas(registros, tamanho):
+    """
+    Divide os registros em faixas consecutivas de pk com até ``tamanho`` registros
+
+    O fim de cada faixa é lido quando ela vai ser processada (a faixa anterior
+    já foi alterada), então registros que deixam de existir não atrapalham.
+
+    Returns:
+        Iterador de Q com a faixa de pk (a última é aberta no fim)
+    """
+    ultimo = None
+    while True:
+        inicio = Q() if ultimo is None else Q(pk__gt=ultimo)
+        fim = registros.filter(inicio).order_by("pk").values_list("pk", flat=True)[tamanho - 1 : tamanho]
+        fim = next(iter(fim), None)
+        if fim is None:
+            yield inicio
+            return
+        yield inicio & Q(pk__lte=fim)
+        ultimo = fim
+
+
+def _em_ordem(evento, operacoes):
+    """
+    Consultas das operações na ordem de execução, sem gravar nada
+
+    Os participantes excluídos por uma operação saem das consultas seguintes,
+    como acontece em ``executar``.
+
+    Returns:
+        Iterador de (operação, queryset dos registros que ela alteraria)
+    """
+    removidos = []
+    for operacao in OPERACOES:
+        if operacao not in operacoes:
+            continue
+        consulta = CONSULTAS[operacao](evento, removidos)
+        yield operacao, consulta
+        if operacao not in OPERACOES_CLIENTE:
+            removidos.append(consulta)
+
+
+def previa(evento, operacoes):
+    """
+    Conta os registros que cada operação alteraria, sem gravar nada
+
+    As contagens seguem a ordem de execução (um participante duplicado e com
+    e-mail inválido conta só como e-mail inválido), então batem com o que
+    ``executar`` altera se os dados não mudarem no meio.
+
+    Returns:
+        Dicionário {operação: quantidade}
+    """
+    return {operacao: consulta.count() for operacao, consulta in _em_ordem(evento, operacoes)}
+
+
+def clientes_compartilhados(evento, operacoes):
+    """
+    Conta, nas operações sobre o cadastro do Cliente, os clientes alterados que
+    também estão inscritos em outros eventos (a correção vale lá também)
+
+    Returns:
+        Dicionário {operação: quantidade} só com as operações de OPERACOES_CLIENTE
+    """
+    em_outros_eventos = Exists(Participante.objects.filter(cliente=OuterRef("pk")).exclude(evento=evento))
+    return {
+        operacao: consulta.filter(em_outros_eventos).count()
+        for operacao, consulta in _em_ordem(evento, operacoes)
+        if operacao in OPERACOES_CLIENTE
+    }
+
+
+def executar(evento, operacoes, tamanho_bloco=None):
+    """
+    Aplica as operações de limpeza ao evento, em blocos
+
+    Args:
+        evento: Evento a limpar
+        operacoes: Nomes das operações (chaves de OPERACOES)
+        tamanho_bloco: Registros por UPDATE/DELETE (padrão: settings.LIMPEZA_TAMANHO_BLOCO)
+
+    Returns:
+        Dicionário {operação: registros alterados}
+    """
+    tamanho = tamanho_bloco or getattr(settings, "LIMPEZA_TAMANHO_BLOCO", 5000)
+    resultado = {}
+    for operacao in OPERACOES:
+        if operacao not in operacoes:
+            continue
+        resultado[operacao] = 0
+        registros = CONSULTAS[operacao](evento)
+        for faixa in _faixas(UNIVERSOS[operacao](evento), tamanho):
+            with transaction.atomic():
+                resultado[operacao] += _aplicar(operacao, registros.filter(faixa))
+    return resultado
@@ -0,0 +1,308 @@
+"""
+Teste de carga dos endpoints de check-in
+
+Cria um evento de amostra com ingressos (a maioria confirmados ou pendentes,
+alguns cancelados) e um usuário temporário, dispara os check-ins em várias
+threads e mede check-ins por segundo e a latência das requisições. Cada
+código é enviado duas vezes (a segunda leitura deve voltar "ja_presente"),
+como acontece com leitores que reenviam leituras. Ao final confere no banco
+os ingressos presentes, os contadores do evento e o resumo diário de vendas,
+e remove os dados de amostra.
+
+Sem --url, as requisições passam pelo Django no próprio processo (cliente de
+teste, com middlewares e sessão); com --url, vão por HTTP para um servidor
+rodando sobre o mesmo banco (login pelo formulário e token CSRF).
+
+Uso:
+    python manage.py benchmark_checkin
+    python manage.py benchmark_checkin --ingressos 20000 --threads 16
+    python manage.py benchmark_checkin --lote 200
+    python manage.py benchmark_checkin --url http://localhost:8000
+"""
+
+import http.cookiejar
+import json
+import logging
+import secrets
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import Counter
+from urllib.error import HTTPError
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Sum
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.models import Cliente, Evento, Participante, VendaDiaria
+
+# Distribuição dos status dos ingressos de amostra (um a cada 20 cancelado)
+STATUS_AMOSTRA = ["confirmado"] * 12 + ["pendente"] * 7 + ["cancelado"]
+
+
+class _ClienteInterno:
+    """Envia as requisições pelo cliente de teste do Django, no próprio processo"""
+
+    def __init__(self, usuario):
+        self.cliente = Client(SERVER_NAME="localhost")
+        self.cliente.force_login(usuario)
+
+    def post(self, caminho, dados):
+        resposta = self.cliente.post(caminho, json.dumps(dados), content_type="application/json")
+        return resposta.status_code, json.loads(resposta.content)
+
+    def fechar(self):
+        connection.close()
+
+
+class _ClienteHttp:
+    """Envia as requisições por HTTP, com sessão e token CSRF do formulário de login"""
+
+    def __init__(self, url, usuario, senha):
+        self.url = url.rstrip("/")
+        self.cookies = http.cookiejar.CookieJar()
+        self.abridor = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+        login = self.url + reverse("login")
+        self.abridor.open(login).read()
+        corpo = urllib.parse.urlencode(
+            {"username": usuario, "password": senha, "csrfmiddlewaretoken": self._cookie("csrftoken")}
+        )
+        self.abridor.open(urllib.request.Request(login, corpo.encode(), headers={"Referer": login})).read()
+        if not self._cookie("sessionid"):
+            raise CommandError(f"Falha no login de '{usuario}' em {self.url}")
+
+    def _cookie(self, nome):
+        return next((cookie.value for cookie in self.cookies if cookie.name == nome), "")
+
+    def post(self, caminho, dados):
+        requisicao = urllib.request.Request(
+            self.url + caminho,
+            json.dumps(dados).encode(),
+            headers={
+                "Content-Type": "application/json",
+                "X-CSRFToken": self._cookie("csrftoken"),
+                "Referer": self.url + caminho,
+            },
+        )
+        try:
+            with self.abridor.open(requisicao) as resposta:
+                return resposta.status, json.loads(resposta.read())
+        except HTTPError as erro:
+            return erro.code, json.loads(erro.read() or b"{}")
+
+    def fechar(self):
+        pass
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+class Command(BaseCommand):
+    help = "Teste de carga dos endpoints de check-in (check-ins por segundo e latência)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ingressos", type=int, default=5000, help="Ingressos de amostra (padrão: 5000)")
+        parser.add_argument("--threads", type=int, default=8, help="Requisições simultâneas (padrão: 8)")
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=0,
+            help="Códigos por requisição no endpoint em lote (padrão: 0, um código por requisição)",
+        )
+        parser.add_argument(
+            "--url", help="URL de um servidor rodando sobre o mesmo banco (ex: http://localhost:8000)"
+        )
+        parser.add_argument(
+            "--usuario",
+            help="Usuário existente para o login via --url (padrão: usuário temporário)",
+        )
+        parser.add_argument("--senha", help="Senha de --usuario")
+
+    def handle(self, *args, **options):
+        quantidade, lote = options["ingressos"], options["lote"]
+        if quantidade < 1 or options["threads"] < 1 or lote < 0:
+            raise CommandError("--ingressos e --threads precisam ser positivos e --lote não pode ser negativo")
+
+        senha = options["senha"] or secrets.token_urlsafe(16)
+        usuario_temporario = None
+        if options["usuario"]:
+            usuario = get_user_model().objects.get(username=options["usuario"])
+        else:
+            usuario = usuario_temporario = get_user_model().objects.create_superuser(
+                f"benchmark-checkin-{secrets.token_hex(4)}", password=senha
+            )
+        evento = self._criar_amostra(quantidade)
+        # Respostas 404/409 são esperadas; não registra um aviso por requisição
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+        try:
+            codigos = list(
+                Participante.objects.filter(evento=evento).order_by("pk").values_list("codigo_ingresso", flat=True)
+            )
+            # Segunda leitura de cada código (reenvio do leitor)
+            envios = codigos + codigos
+            if lote:
+                caminho = reverse("checkin_lote")
+                requisicoes = [
+                    {"codigos": envios[inicio : inicio + lote], "evento": evento.pk}
+                    for inicio in range(0, len(envios), lote)
+                ]
+            else:
+                caminho = reverse("checkin")
+                requisicoes = [{"codigo": codigo, "evento": evento.pk} for codigo in envios]
+
+            def criar_cliente():
+                if options["url"]:
+                    return _ClienteHttp(options["url"], usuario.get_username(), senha)
+                return _ClienteInterno(usuario)
+
+            self.stdout.write(
+                f"→ {len(envios)} leitura(s) de {quantidade} ingresso(s) em {len(requisicoes)} requisição(ões), "
+                f"{options['threads']} thread(s), {options['url'] or 'no próprio processo'}"
+            )
+            resultados, latencias, duracao = self._disparar(criar_cliente, caminho, requisicoes, options["threads"])
+            self._relatorio(envios, resultados, latencias, duracao)
+            self._conferir(evento, resultados)
+        finally:
+            Participante.objects.filter(evento=evento).delete()
+            Cliente.objects.filter(email__startswith=f"checkin-{evento.pk}-").delete()
+            evento.delete()
+            if usuario_temporario is not None:
+                usuario_temporario.delete()
+
+    def _criar_amostra(self, quantidade):
+        evento = Evento.objects.create(
+            nome="Benchmark check-in",
+            data_evento=timezone.now(),
+            local="Benchmark",
+            capacidade_maxima=quantidade,
+            valor_ingresso=50,
+        )
+        clientes = Cliente.objects.bulk_create(
+            (
+                Cliente(nome_completo=f"Participante {i}", email=f"checkin-{evento.pk}-{i}@exemplo.com")
+                for i in range(quantidade)
+            ),
+            batch_size=1000,
+        )
+        Participante.objects.bulk_create(
+            (
+                Participante(
+                    evento=evento,
+                    cliente=cliente,
+                    status=STATUS_AMOSTRA[i % len(STATUS_AMOSTRA)],
+                    valor_pago=50,
+                    codigo_ingresso=f"CHK-{evento.pk}-{i:07d}",
+                )
+                for i, cliente in enumerate(clientes)
+            ),
+            batch_size=1000,
+        )
+        return evento
+
+    def _disparar(self, criar_cliente, caminho, requisicoes, threads):
+        """
+        Envia as requisições distribuídas entre as threads
+
+        Returns:
+            Tupla (Counter de resultados por código, latências em ms, duração total em s)
+        """
+        resultados, latencias, erros = Counter(), [], []
+        trava = threading.Lock()
+        proxima = iter(requisicoes)
+        pronto = threading.Barrier(threads + 1)
+
+        def trabalhar():
+            cliente = None
+            try:
+                cliente = criar_cliente()
+                pronto.wait()
+                while True:
+                    with trava:
+                        dados = next(proxima, None)
+                    if dados is None:
+                        break
+                    inicio = time.perf_counter()
+                    status, corpo = cliente.post(caminho, dados)
+                    decorrido = (time.perf_counter() - inicio) * 1000
+                    itens = corpo.get("resultados", [corpo]) if status != 400 and status != 403 else []
+                    with trava:
+                        latencias.append(decorrido)
+                        if not itens:
+                            erros.append(f"HTTP {status}: {corpo.get('erro')}")
+                        resultados.update(item["resultado"] for item in itens)
+            except Exception as erro:
+                with trava:
+                    erros.append(repr(erro))
+                pronto.abort()
+            finally:
+                if cliente is not None:
+                    cliente.fechar()
+
+        trabalhadores = [threading.Thread(target=trabalhar) for _ in range(threads)]
+        for trabalhador in trabalhadores:
+            trabalhador.start()
+        try:
+            pronto.wait()
+        except threading.BrokenBarrierError:
+            pass
+        inicio = time.perf_counter()
+        for trabalhador in trabalhadores:
+            trabalhador.join()
+        duracao = time.perf_counter() - inicio
+        if erros:
+            raise CommandError(f"{len(erros)} erro(s) durante o teste; primeiro: {erros[0]}")
+        return resultados, latencias, duracao
+
+    def _relatorio(self, envios, resultados, latencias, duracao):
+        self.stdout.write("")
+        self.stdout.write(f"Duração: {duracao:.2f} s")
+        self.stdout.write(f"Leituras por segundo: {len(envios) / duracao:,.0f}")
+        self.stdout.write(f"Check-ins registrados por segundo: {resultados['registrado'] / duracao:,.0f}")
+        self.stdout.write(
+            f"Latência por requisição (ms): p50 {_percentil(latencias, 50):.1f} | "
+            f"p95 {_percentil(latencias, 95):.1f} | p99 {_percentil(latencias, 99):.1f} | "
+            f"máx {max(latencias, default=0):.1f}"
+        )
+        for resultado, total in sorted(resultados.items()):
+            self.stdout.write(f"  {resultado}: {total}")
+
+    def _conferir(self, evento, resultados):
+        """Confere no banco os ingressos presentes, os contadores do evento e o resumo de vendas"""
+        participantes = Participante.objects.filter(evento=evento)
+        presentes = participantes.filter(status="presente").count()
+        evento.refresh_from_db(fields=["total_inscritos", "total_confirmados"])
+        confirmados = participantes.filter(status="confirmado").count()
+        esperado = {
+            (linha["status"], linha["tipo_participante"]): (linha["n"], linha["receita"])
+            for linha in participantes.values("status", "tipo_participante").annotate(
+                n=Count("id"), receita=Sum("valor_pago")
+            )
+        }
+        resumo = {
+            (linha["status"], linha["tipo_participante"]): (linha["n"], linha["receita"])
+            for linha in VendaDiaria.objects.filter(evento=evento)
+            .values("status", "tipo_participante")
+            .annotate(n=Sum("quantidade"), receita=Sum("receita"))
+        }
+        problemas = []
+        if presentes != resultados["registrado"]:
+            problemas.append(f"{presentes} presente(s) no banco para {resultados['registrado']} registrado(s)")
+        if evento.total_confirmados != confirmados:
+            problemas.append(f"total_confirmados {evento.total_confirmados}, esperado {confirmados}")
+        if resumo != esperado:
+            problemas.append("resumo diário de vendas diferente dos participantes")
+        self.stdout.write("")
+        if problemas:
+            for problema in problemas:
+                self.stdout.write(self.style.ERROR(f"✗ {problema}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("✓ Presentes, contadores e resumo de vendas conferem com o banco"))
@@ -0,0 +1,96 @@
+"""
+Mede a geração de códigos de ingresso e confere se há colisões
+
+Compara, para a mesma quantidade de códigos:
+
+- Anterior: ``ING-`` + 8 hexadecimais de um uuid4 (32 bits aleatórios), como
+  Participante.save fazia; as colisões aparecem como IntegrityError ao gravar;
+- Em lotes: ``gerar_codigos`` em chamadas do tamanho de um bloco da
+  importação;
+- Um por vez: ``gerar_codigo``, como no save de um participante.
+
+Para cada cenário são medidos tempo, códigos por segundo, idas ao banco e
+códigos repetidos (e, nos cenários atuais, dígitos verificadores inválidos).
+Os números reservados avançam a sequência do banco; não é gravado nenhum
+ingresso.
+
+Uso:
+    python manage.py benchmark_codigos                     # 1.000.000 de códigos
+    python manage.py benchmark_codigos --quantidade 200000 --lote 5000
+"""
+
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from eventos.codigos import codigo_valido, gerar_codigo, gerar_codigos
+
+
+def _codigos_anteriores(quantidade, lote):
+    return [f"ING-{uuid.uuid4().hex[:8].upper()}" for _ in range(quantidade)]
+
+
+def _codigos_em_lotes(quantidade, lote):
+    codigos = []
+    for inicio in range(0, quantidade, lote):
+        codigos += gerar_codigos(min(lote, quantidade - inicio))
+    return codigos
+
+
+def _codigos_um_por_vez(quantidade, lote):
+    return [gerar_codigo() for _ in range(quantidade)]
+
+
+class Command(BaseCommand):
+    help = "Mede a geração de códigos de ingresso (uuid x sequência embaralhada) e confere colisões"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--quantidade", type=int, default=1_000_000, help="Códigos por cenário (padrão: 1000000)"
+        )
+        parser.add_argument("--lote", type=int, default=1000, help="Códigos por chamada em lote (padrão: 1000)")
+
+    def handle(self, *args, **options):
+        quantidade, lote = options["quantidade"], options["lote"]
+        if quantidade < 1 or lote < 1:
+            raise CommandError("--quantidade e --lote precisam ser positivos")
+
+        cenarios = [
+            ("Anterior (uuid)", _codigos_anteriores, False),
+            (f"Em lotes de {lote}", _codigos_em_lotes, True),
+            ("Um por vez", _codigos_um_por_vez, True),
+        ]
+        linhas = []
+        gerados = set()
+        for nome, gerar, atual in cenarios:
+            self.stdout.write(f"→ {nome}: {quantidade} código(s)")
+            inicio = time.perf_counter()
+            with CaptureQueriesContext(connection) as consultas:
+                codigos = gerar(quantidade, lote)
+            duracao = time.perf_counter() - inicio
+            repetidos = quantidade - len(set(codigos))
+            invalidos = sum(1 for codigo in codigos if not codigo_valido(codigo)) if atual else None
+            if atual:
+                # Os dois cenários atuais usam a mesma sequência: também não podem se repetir entre si
+                repetidos += len(gerados.intersection(codigos))
+                gerados.update(codigos)
+            linhas.append((nome, duracao, len(consultas.captured_queries), repetidos, invalidos))
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'Cenário':<20} | {'s':>7} {'códigos/s':>11} {'consultas':>9} {'repetidos':>9} {'inválidos':>9}"
+        )
+        for nome, duracao, consultas, repetidos, invalidos in linhas:
+            self.stdout.write(
+                f"{nome:<20} | {duracao:>7.2f} {quantidade / duracao:>11,.0f} {consultas:>9} {repetidos:>9}"
+                f" {'-' if invalidos is None else invalidos:>9}"
+            )
+        esperado = quantidade * (quantidade - 1) / 2 / 2**32
+        self.stdout.write(f"Repetidos esperados com 32 bits aleatórios: ~{esperado:,.1f}")
+        if any(repetidos or invalidos for _, _, _, repetidos, invalidos in linhas[1:]):
+            self.stdout.write(self.style.ERROR("✗ O gerador atual produziu códigos repetidos ou inválidos"))
+        else:
+            self.stdout.write(self.style.SUCCESS("✓ Nenhum código repetido ou inválido no gerador atual"))
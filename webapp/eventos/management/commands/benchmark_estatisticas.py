@@ -0,0 +1,147 @@
+"""
+Mede o custo do bloco de ocupação das estatísticas conforme o número de eventos cresce
+
+Para cada quantidade de eventos, cria eventos de amostra (com capacidade e
+alguns participantes confirmados) dentro de uma transação desfeita ao final
+e compara:
+
+- Anterior: soma de capacidade_maxima em Python sobre todos os eventos com
+  vagas, mais a contagem de confirmados com ``evento__in``;
+- Atual: ``Evento.objects.ocupacao()`` agrupado por status e por categoria.
+
+Para cada cenário são medidos consultas, tempo e pico de memória alocada no
+Python (tracemalloc). No caminho atual o número de consultas e a memória não
+dependem do número de eventos.
+
+Uso:
+    python manage.py benchmark_estatisticas
+    python manage.py benchmark_estatisticas --eventos 1000 --eventos 50000
+"""
+
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from eventos.models import Categoria, Evento, Participante
+
+QUANTIDADES_PADRAO = [100, 1000, 10000]
+
+
+class _Desfazer(Exception):
+    """Força o rollback da transação do benchmark"""
+
+
+def ocupacao_anterior():
+    """Taxa de ocupação como era calculada antes (instâncias de Evento no Python)"""
+    eventos_com_vagas = Evento.objects.exclude(capacidade_maxima=0)
+    if not eventos_com_vagas.exists():
+        return 0
+    total_confirmados = Participante.objects.filter(evento__in=eventos_com_vagas, status="confirmado").count()
+    total_vagas = sum(e.capacidade_maxima for e in eventos_com_vagas)
+    return (total_confirmados / total_vagas * 100) if total_vagas > 0 else 0
+
+
+def ocupacao_atual():
+    """Taxa de ocupação geral e por status/categoria com dois agregados SQL"""
+    por_status = list(Evento.objects.ocupacao("status"))
+    list(Evento.objects.ocupacao("categoria__nome"))
+    vagas = sum(item["vagas"] for item in por_status)
+    return (sum(item["confirmados"] for item in por_status) / vagas * 100) if vagas else 0
+
+
+def medir(funcao):
+    """
+    Executa a função medindo consultas, tempo e pico de memória
+
+    Returns:
+        Dicionário com resultado, consultas, tempo (ms) e memória (KB)
+    """
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    with CaptureQueriesContext(connection) as consultas:
+        resultado = funcao()
+    tempo = (time.perf_counter() - inicio) * 1000
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"resultado": resultado, "consultas": len(consultas.captured_queries), "ms": tempo, "kb": pico / 1024}
+
+
+def _criar_eventos(quantidade, inicio, categorias):
+    status = [codigo for codigo, _ in Evento.STATUS_CHOICES]
+    agora = timezone.now()
+    Evento.objects.bulk_create(
+        (
+            Evento(
+                nome=f"Benchmark {i}",
+                categoria=categorias[i % len(categorias)],
+                data_evento=agora,
+                local="Benchmark",
+                status=status[i % len(status)],
+                capacidade_maxima=0 if i % 10 == 0 else 100 + i % 400,
+            )
+            for i in range(inicio, inicio + quantidade)
+        ),
+        batch_size=1000,
+    )
+    # Confirmados em um a cada 50 eventos (o bulk_create atualiza os contadores)
+    eventos = Evento.objects.filter(nome__startswith="Benchmark ", local="Benchmark").order_by("pk")[inicio::50]
+    Participante.objects.bulk_create(
+        (
+            Participante(evento=evento, status="confirmado", codigo_ingresso=f"BENCH-{evento.pk}-{j}")
+            for evento in eventos
+            for j in range(5)
+        ),
+        batch_size=1000,
+    )
+
+
+class Command(BaseCommand):
+    help = "Compara o custo do cálculo de ocupação das estatísticas (Python x agregados SQL) por número de eventos"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--eventos",
+            type=int,
+            action="append",
+            dest="quantidades",
+            help="Número de eventos a medir (pode ser repetido; padrão: 100, 1000 e 10000)",
+        )
+
+    def handle(self, *args, **options):
+        quantidades = sorted(options["quantidades"] or QUANTIDADES_PADRAO)
+        linhas = []
+        try:
+            with transaction.atomic():
+                categorias = Categoria.objects.bulk_create(Categoria(nome=f"Benchmark {i}") for i in range(10))
+                existentes = 0
+                for quantidade in quantidades:
+                    _criar_eventos(quantidade - existentes, existentes, categorias)
+                    existentes = quantidade
+                    self.stdout.write(f"→ {quantidade} evento(s) de amostra")
+                    anterior, atual = medir(ocupacao_anterior), medir(ocupacao_atual)
+                    linhas.append((Evento.objects.count(), anterior, atual))
+                raise _Desfazer
+        except _Desfazer:
+            pass
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'Eventos':>10} | {'Anterior: consultas':>19} {'ms':>9} {'KB':>9}"
+            f" | {'Atual: consultas':>16} {'ms':>9} {'KB':>9}"
+        )
+        for total, anterior, atual in linhas:
+            self.stdout.write(
+                f"{total:>10} | {anterior['consultas']:>19} {anterior['ms']:>9.1f} {anterior['kb']:>9.1f}"
+                f" | {atual['consultas']:>16} {atual['ms']:>9.1f} {atual['kb']:>9.1f}"
+            )
+        divergentes = [
+            total for total, anterior, atual in linhas if abs(anterior["resultado"] - atual["resultado"]) > 1e-6
+        ]
+        if divergentes:
+            self.stdout.write(self.style.WARNING(f"⚠ Taxas diferentes com {divergentes} evento(s)"))
+        else:
+            self.stdout.write(self.style.SUCCESS("✓ Mesma taxa de ocupação nos dois cálculos"))
@@ -0,0 +1,135 @@
+"""
+Mede a limpeza de dados (eventos/limpeza.py) em um evento grande
+
+Cria um evento de amostra com N participantes dentro de uma transação
+desfeita ao final, com clientes "sujos": e-mails repetidos com outra
+capitalização, e-mails inválidos, nomes em maiúsculas/minúsculas com espaços
+nas pontas e telefones só com dígitos ou com o 55 do país. Mede a prévia e a
+execução de todas as operações (consultas, tempo e, com ``--memoria``, pico
+de memória alocada no Python com tracemalloc, que deixa mais lenta a INITCAP
+registrada no SQLite) e confere o resultado:
+
+- depois da limpeza, a prévia não encontra mais nada a alterar;
+- os contadores do evento batem com um recálculo a partir dos participantes.
+
+Uso:
+    python manage.py benchmark_limpeza
+    python manage.py benchmark_limpeza --participantes 10000 --bloco 1000
+    python manage.py benchmark_limpeza --memoria
+"""
+
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from eventos import limpeza
+from eventos.models import Cliente, Evento, Participante
+
+
+class _Desfazer(Exception):
+    """Força o rollback da transação do benchmark"""
+
+
+def medir(funcao, memoria=False):
+    """
+    Executa a função medindo consultas, tempo e (opcionalmente) pico de memória
+
+    Returns:
+        Dicionário com resultado, consultas, tempo (ms) e memória (KB, None sem ``memoria``)
+    """
+    if memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    with CaptureQueriesContext(connection) as consultas:
+        resultado = funcao()
+    tempo = (time.perf_counter() - inicio) * 1000
+    pico = None
+    if memoria:
+        pico = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    return {"resultado": resultado, "consultas": len(consultas.captured_queries), "ms": tempo, "kb": pico}
+
+
+def _cliente(i):
+    """Cliente de amostra: 1 em 10 repete o e-mail do anterior, 1 em 50 tem e-mail inválido"""
+    if i % 10 == 1:
+        email = f"Bench.Limpeza{i - 1}@Exemplo.com"
+    elif i % 50 == 7:
+        email = f"bench.limpeza{i}@exemplo"
+    else:
+        email = f"bench.limpeza{i}@exemplo.com"
+    nome = f"  maria DA silva {i} " if i % 3 else f"João Souza {i}"
+    telefone = ["", f"119{i % 100000000:08d}", f"55219{i % 100000000:08d}", f"(31) 3{i % 1000:03d}-0000"][i % 4]
+    return Cliente(nome_completo=nome, email=email, telefone=telefone)
+
+
+def _criar_evento(quantidade):
+    evento = Evento.objects.create(nome="Benchmark limpeza", data_evento=timezone.now(), local="Benchmark")
+    clientes = Cliente.objects.bulk_create((_cliente(i) for i in range(quantidade)), batch_size=1000)
+    status = [codigo for codigo, _ in Participante.STATUS_CHOICES]
+    Participante.objects.bulk_create(
+        (
+            Participante(evento=evento, cliente=cliente, status=status[i % len(status)])
+            for i, cliente in enumerate(clientes)
+        ),
+        batch_size=1000,
+    )
+    return evento
+
+
+class Command(BaseCommand):
+    help = "Mede a prévia e a execução da limpeza de dados em um evento de amostra"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--participantes", type=int, default=100000, help="Participantes do evento (padrão: 100000)"
+        )
+        parser.add_argument(
+            "--bloco", type=int, help="Registros por UPDATE/DELETE (padrão: settings.LIMPEZA_TAMANHO_BLOCO)"
+        )
+        parser.add_argument("--memoria", action="store_true", help="Mede também o pico de memória (mais lento)")
+
+    def handle(self, *args, **options):
+        operacoes = list(limpeza.OPERACOES)
+        bloco = options["bloco"] or getattr(settings, "LIMPEZA_TAMANHO_BLOCO", 5000)
+        try:
+            with transaction.atomic():
+                evento = _criar_evento(options["participantes"])
+                self.stdout.write(f"→ Evento de amostra com {options['participantes']} participante(s)")
+                previa = medir(lambda: limpeza.previa(evento, operacoes), options["memoria"])
+                execucao = medir(lambda: limpeza.executar(evento, operacoes, tamanho_bloco=bloco), options["memoria"])
+                restante = limpeza.previa(evento, operacoes)
+                evento.refresh_from_db()
+                contadores = (evento.total_inscritos, evento.total_confirmados)
+                Evento.objects.filter(pk=evento.pk).recalcular_contadores()
+                evento.refresh_from_db()
+                recalculados = (evento.total_inscritos, evento.total_confirmados)
+                raise _Desfazer
+        except _Desfazer:
+            pass
+
+        self.stdout.write("")
+        self.stdout.write(f"{'Operação':<22} | {'Prévia':>10} | {'Alterados':>10}")
+        for operacao in operacoes:
+            self.stdout.write(
+                f"{operacao:<22} | {previa['resultado'][operacao]:>10} | {execucao['resultado'][operacao]:>10}"
+            )
+        self.stdout.write("")
+        self.stdout.write(f"{'Etapa':<22} | {'consultas':>10} {'ms':>10} {'KB':>10}")
+        for etapa, medida in (("Prévia", previa), (f"Execução ({bloco}/bloco)", execucao)):
+            kb = "-" if medida["kb"] is None else f"{medida['kb']:.1f}"
+            self.stdout.write(f"{etapa:<22} | {medida['consultas']:>10} {medida['ms']:>10.1f} {kb:>10}")
+
+        if any(restante.values()):
+            self.stdout.write(self.style.WARNING(f"⚠ Ainda há registros a limpar: {restante}"))
+        elif contadores != recalculados:
+            self.stdout.write(
+                self.style.WARNING(f"⚠ Contadores {contadores} diferentes do recálculo {recalculados}"),
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("✓ Nada mais a limpar e contadores do evento consistentes"))
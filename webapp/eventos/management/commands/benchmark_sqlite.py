@@ -0,0 +1,179 @@
+"""
+Mede a concorrência entre leituras e gravações no SQLite antes e depois dos PRAGMAs
+
+Cria um banco temporário ao lado do banco configurado (mesmo disco) e, por
+alguns segundos, roda um escritor gravando blocos de linhas (como uma
+importação) enquanto leitores repetem uma agregação (como o dashboard).
+O cenário é executado com os PRAGMAs padrão do SQLite e com
+settings.SQLITE_PRAGMAS.
+
+Uso:
+    python manage.py benchmark_sqlite
+    python manage.py benchmark_sqlite --segundos 10 --leitores 8 --linhas 1000
+"""
+
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from eventos.banco import executar_pragmas
+
+STATUS = ("pendente", "confirmado", "cancelado", "presente")
+CONSULTA_LEITURA = "SELECT evento_id, status, COUNT(*) FROM participante GROUP BY evento_id, status"
+
+
+def _conectar(caminho, pragmas):
+    conexao = sqlite3.connect(caminho, timeout=5, isolation_level=None, check_same_thread=False)
+    executar_pragmas(conexao, pragmas)
+    return conexao
+
+
+def _linhas(inicio, quantidade):
+    return [(i % 50, STATUS[i % len(STATUS)], f"Participante {i}") for i in range(inicio, inicio + quantidade)]
+
+
+def _preparar(caminho, pragmas, linhas_iniciais):
+    conexao = _conectar(caminho, pragmas)
+    conexao.execute(
+        "CREATE TABLE participante (id INTEGER PRIMARY KEY, evento_id INTEGER, status TEXT, nome TEXT)"
+    )
+    conexao.execute("CREATE INDEX participante_evento_status ON participante (evento_id, status)")
+    conexao.execute("BEGIN")
+    conexao.executemany(
+        "INSERT INTO participante (evento_id, status, nome) VALUES (?, ?, ?)",
+        _linhas(0, linhas_iniciais),
+    )
+    conexao.execute("COMMIT")
+    conexao.close()
+
+
+def executar_cenario(caminho, pragmas, segundos, leitores, linhas_por_bloco, linhas_iniciais):
+    """
+    Roda escritor e leitores em paralelo sobre um banco novo
+
+    Returns:
+        Dicionário com vazão e latências de leitura e gravação
+    """
+    _preparar(caminho, pragmas, linhas_iniciais)
+    parar = threading.Event()
+    latencias_leitura, latencias_gravacao = [], []
+    erros = []
+
+    def escritor():
+        conexao = _conectar(caminho, pragmas)
+        proxima = linhas_iniciais
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            try:
+                conexao.execute("BEGIN IMMEDIATE")
+                conexao.executemany(
+                    "INSERT INTO participante (evento_id, status, nome) VALUES (?, ?, ?)",
+                    _linhas(proxima, linhas_por_bloco),
+                )
+                conexao.execute("COMMIT")
+            except sqlite3.OperationalError as e:
+                erros.append(str(e))
+                if conexao.in_transaction:
+                    conexao.execute("ROLLBACK")
+                continue
+            latencias_gravacao.append(time.perf_counter() - inicio)
+            proxima += linhas_por_bloco
+        conexao.close()
+
+    def leitor():
+        conexao = _conectar(caminho, pragmas)
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            try:
+                conexao.execute(CONSULTA_LEITURA).fetchall()
+            except sqlite3.OperationalError as e:
+                erros.append(str(e))
+                continue
+            latencias_leitura.append(time.perf_counter() - inicio)
+        conexao.close()
+
+    threads = [threading.Thread(target=escritor)] + [threading.Thread(target=leitor) for _ in range(leitores)]
+    for thread in threads:
+        thread.start()
+    time.sleep(segundos)
+    parar.set()
+    for thread in threads:
+        thread.join()
+
+    def percentil(valores, p):
+        if not valores:
+            return 0.0
+        return statistics.quantiles(valores, n=100)[p - 1] * 1000 if len(valores) > 1 else valores[0] * 1000
+
+    return {
+        "leituras_por_segundo": len(latencias_leitura) / segundos,
+        "leitura_p50_ms": percentil(latencias_leitura, 50),
+        "leitura_p95_ms": percentil(latencias_leitura, 95),
+        "leitura_max_ms": max(latencias_leitura, default=0) * 1000,
+        "linhas_gravadas_por_segundo": len(latencias_gravacao) * linhas_por_bloco / segundos,
+        "gravacao_p95_ms": percentil(latencias_gravacao, 95),
+        "erros": len(erros),
+    }
+
+
+class Command(BaseCommand):
+    help = "Compara leituras/gravações concorrentes no SQLite com os PRAGMAs padrão e com SQLITE_PRAGMAS"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--segundos", type=float, default=5, help="Duração de cada cenário (padrão: 5)")
+        parser.add_argument("--leitores", type=int, default=4, help="Threads de leitura (padrão: 4)")
+        parser.add_argument(
+            "--linhas",
+            type=int,
+            default=500,
+            help="Linhas por transação de gravação (padrão: 500)",
+        )
+        parser.add_argument(
+            "--linhas-iniciais", type=int, default=50000, help="Linhas criadas antes da medição (padrão: 50000)"
+        )
+
+    def handle(self, *args, **options):
+        cenarios = [("Padrão do SQLite", {}), ("SQLITE_PRAGMAS", getattr(settings, "SQLITE_PRAGMAS", {}))]
+        diretorio = Path(settings.DATABASES["default"]["NAME"]).parent
+        diretorio.mkdir(parents=True, exist_ok=True)
+
+        resultados = []
+        with tempfile.TemporaryDirectory(dir=diretorio, prefix="benchmark_sqlite_") as temporario:
+            for indice, (nome, pragmas) in enumerate(cenarios):
+                self.stdout.write(f"→ {nome}: {pragmas or 'journal_mode=DELETE, synchronous=FULL'}")
+                caminho = str(Path(temporario) / f"cenario_{indice}.db")
+                resultados.append(
+                    (
+                        nome,
+                        executar_cenario(
+                            caminho,
+                            pragmas,
+                            options["segundos"],
+                            options["leitores"],
+                            options["linhas"],
+                            options["linhas_iniciais"],
+                        ),
+                    )
+                )
+
+        colunas = [
+            ("leituras_por_segundo", "Leituras/s", "{:.0f}"),
+            ("leitura_p50_ms", "Leitura p50 (ms)", "{:.1f}"),
+            ("leitura_p95_ms", "Leitura p95 (ms)", "{:.1f}"),
+            ("leitura_max_ms", "Leitura máx (ms)", "{:.1f}"),
+            ("linhas_gravadas_por_segundo", "Linhas gravadas/s", "{:.0f}"),
+            ("gravacao_p95_ms", "Gravação p95 (ms)", "{:.1f}"),
+            ("erros", "Erros (locked)", "{}"),
+        ]
+        largura = max(len(titulo) for _, titulo, _ in colunas) + 2
+        self.stdout.write("")
+        self.stdout.write(" " * largura + "".join(f"{nome:>20}" for nome, _ in resultados))
+        for chave, titulo, formato in colunas:
+            valores = "".join(f"{formato.format(resultado[chave]):>20}" for _, resultado in resultados)
+            self.stdout.write(f"{titulo:<{largura}}{valores}")
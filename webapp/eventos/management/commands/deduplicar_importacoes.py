@@ -0,0 +1,71 @@
+"""
+Move os arquivos de importações antigas para o armazenamento endereçado pelo conteúdo
+
+Calcula o hash das importações sem hash_conteudo, aponta cada uma para
+importacoes/<hash[:2]>/<hash>.<ext> e remove as cópias que deixaram de ser usadas.
+
+Uso:
+    python manage.py deduplicar_importacoes
+    python manage.py deduplicar_importacoes --dry-run
+"""
+
+import hashlib
+
+from django.core.management.base import BaseCommand
+
+from eventos.importacao import caminho_conteudo
+from eventos.models import ImportacaoExcel
+
+
+class Command(BaseCommand):
+    help = "Calcula o hash das importações antigas e remove arquivos duplicados em media/importacoes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Apenas mostra o que seria feito")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        storage = ImportacaoExcel._meta.get_field("arquivo").storage
+        antigos = set()
+        atualizadas = sem_arquivo = 0
+
+        for importacao in ImportacaoExcel.objects.filter(hash_conteudo="").exclude(arquivo="").iterator():
+            nome_atual = importacao.arquivo.name
+            if not storage.exists(nome_atual):
+                sem_arquivo += 1
+                continue
+
+            digest = hashlib.sha256()
+            with storage.open(nome_atual, "rb") as arquivo:
+                for bloco in arquivo.chunks():
+                    digest.update(bloco)
+            hash_conteudo = digest.hexdigest()
+            novo_nome = caminho_conteudo(hash_conteudo, nome_atual)
+
+            self.stdout.write(f"  {nome_atual} -> {novo_nome}")
+            if dry_run:
+                continue
+
+            if not storage.exists(novo_nome):
+                with storage.open(nome_atual, "rb") as arquivo:
+                    storage.save(novo_nome, arquivo)
+            ImportacaoExcel.objects.filter(pk=importacao.pk).update(arquivo=novo_nome, hash_conteudo=hash_conteudo)
+            antigos.add(nome_atual)
+            atualizadas += 1
+
+        # Remove apenas arquivos que nenhuma importação referencia mais
+        removidos = 0
+        for nome in antigos:
+            if not ImportacaoExcel.objects.filter(arquivo=nome).exists():
+                storage.delete(nome)
+                removidos += 1
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING("Nenhuma alteração gravada (--dry-run)"))
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ {atualizadas} importação(ões) atualizada(s), {removidos} arquivo(s) duplicado(s) removido(s)"
+                + (f", {sem_arquivo} sem arquivo" if sem_arquivo else "")
+            )
+        )
@@ -0,0 +1,38 @@
+"""
+Remove arquivos antigos do cache de exportações (media/exportacoes/cache)
+
+Uso:
+    python manage.py limpar_cache_exportacoes
+    python manage.py limpar_cache_exportacoes --idade 3600 --tamanho 104857600
+    python manage.py limpar_cache_exportacoes --tudo
+"""
+
+from django.core.management.base import BaseCommand
+
+from eventos import cache_exportacao
+
+
+class Command(BaseCommand):
+    help = "Remove exportações em cache por idade (último uso) e tamanho total do diretório"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--idade",
+            type=int,
+            help="Segundos desde o último uso (padrão: EXPORTACAO_CACHE_IDADE_MAXIMA)",
+        )
+        parser.add_argument(
+            "--tamanho",
+            type=int,
+            help="Tamanho máximo do cache em bytes (padrão: EXPORTACAO_CACHE_TAMANHO_MAXIMO)",
+        )
+        parser.add_argument("--tudo", action="store_true", help="Esvazia o cache")
+
+    def handle(self, *args, **options):
+        if options["tudo"]:
+            removidos, liberados = cache_exportacao.limpar(idade_maxima=0, tamanho_maximo=0)
+        else:
+            removidos, liberados = cache_exportacao.limpar(options["idade"], options["tamanho"])
+        self.stdout.write(
+            self.style.SUCCESS(f"✓ {removidos} arquivo(s) removido(s), {liberados / 1024 / 1024:.1f} MB liberados")
+        )
@@ -0,0 +1,69 @@
+"""
+Worker que processa a fila de importações (ImportacaoExcel com status na_fila)
+
+Importações em "processando" há mais de ``settings.IMPORTACAO_TEMPO_LIMITE``
+segundos (worker encerrado no meio) são marcadas como erro antes de cada
+reserva, para não ficarem "processando" para sempre.
+
+Uso:
+    python manage.py processar_importacoes            # roda continuamente
+    python manage.py processar_importacoes --uma-vez  # esvazia a fila e encerra
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from eventos.importacao import processar_importacao, proxima_importacao
+
+
+class Command(BaseCommand):
+    help = (
+        "Processa em segundo plano as importações de planilhas enfileiradas. Importações em processamento "
+        "há mais de IMPORTACAO_TEMPO_LIMITE segundos são marcadas como erro (worker interrompido)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--intervalo",
+            type=float,
+            default=2.0,
+            help="Segundos de espera entre consultas quando a fila está vazia (padrão: 2)",
+        )
+        parser.add_argument(
+            "--uma-vez",
+            action="store_true",
+            help="Processa as importações pendentes e encerra",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Worker de importações iniciado")
+        try:
+            while True:
+                importacao = proxima_importacao()
+                if importacao is None:
+                    if options["uma_vez"]:
+                        break
+                    time.sleep(options["intervalo"])
+                    continue
+                self._processar(importacao)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write("Worker de importações encerrado")
+
+    def _processar(self, importacao):
+        self.stdout.write(f"→ Processando {importacao.nome_arquivo} (#{importacao.pk})")
+        try:
+            resultado = processar_importacao(importacao)
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f"✗ Erro na importação #{importacao.pk}: {e}"))
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ #{importacao.pk}: {resultado['linhas_importadas']} importadas | "
+                f"Novos: {resultado['linhas_novas']} | "
+                f"Atualizados: {resultado['linhas_atualizadas']} | "
+                f"Erros: {resultado['linhas_com_erro']} "
+                f"({importacao.linhas_por_segundo:.0f} linhas/s)"
+            )
+        )
@@ -0,0 +1,31 @@
+"""
+Recalcula os contadores materializados de ocupação dos eventos
+
+Uso:
+    python manage.py recalcular_contadores
+    python manage.py recalcular_contadores --evento 12 --evento 15
+"""
+
+from django.core.management.base import BaseCommand
+
+from eventos.models import Evento
+
+
+class Command(BaseCommand):
+    help = "Recalcula total_inscritos e total_confirmados de Evento a partir dos participantes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--evento",
+            type=int,
+            action="append",
+            dest="eventos",
+            help="ID do evento a recalcular (pode ser repetido; padrão: todos)",
+        )
+
+    def handle(self, *args, **options):
+        eventos = Evento.objects.all()
+        if options["eventos"]:
+            eventos = eventos.filter(pk__in=options["eventos"])
+        atualizados = eventos.recalcular_contadores()
+        self.stdout.write(self.style.SUCCESS(f"✓ Contadores recalculados para {atualizados} evento(s)"))
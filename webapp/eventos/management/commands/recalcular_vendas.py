@@ -0,0 +1,30 @@
+"""
+Reconstrói o resumo diário de vendas (VendaDiaria) a partir dos participantes
+
+Uso:
+    python manage.py recalcular_vendas
+    python manage.py recalcular_vendas --evento 12 --evento 15
+"""
+
+from django.core.management.base import BaseCommand
+
+from eventos import cache_agregados
+from eventos.models import VendaDiaria
+
+
+class Command(BaseCommand):
+    help = "Reconstrói VendaDiaria (ingressos e receita por dia, evento, status e tipo) a partir dos participantes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--evento",
+            type=int,
+            action="append",
+            dest="eventos",
+            help="ID do evento a reconstruir (pode ser repetido; padrão: todos)",
+        )
+
+    def handle(self, *args, **options):
+        gravadas = VendaDiaria.objects.recalcular(eventos=options["eventos"])
+        cache_agregados.invalidar(VendaDiaria.objects.db)
+        self.stdout.write(self.style.SUCCESS(f"✓ Resumo de vendas reconstruído: {gravadas} linha(s)"))
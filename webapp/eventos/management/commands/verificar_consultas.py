@@ -0,0 +1,43 @@
+"""
+Verifica se as listagens executam um número fixo de consultas (sem N+1)
+
+Uso:
+    python manage.py verificar_consultas
+    python manage.py verificar_consultas --tamanhos 10 50 --pagina "/participantes/?evento={evento}"
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from eventos.diagnostico import TAMANHOS_PADRAO, ConsultasCrescentes, verificar_paginas
+
+
+class Command(BaseCommand):
+    help = "Renderiza as listagens com volumes diferentes de dados e falha se o número de consultas crescer"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tamanhos",
+            type=int,
+            nargs="+",
+            default=list(TAMANHOS_PADRAO),
+            help="Quantidades de participantes de amostra (padrão: 5 20)",
+        )
+        parser.add_argument(
+            "--pagina",
+            action="append",
+            dest="paginas",
+            help=(
+                "URL a verificar, aceita {evento}, {categoria} e {marcador} "
+                "(pode ser repetido; padrão: listagens do app e do admin)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        try:
+            medicoes = verificar_paginas(sorted(options["tamanhos"]), options["paginas"])
+        except ConsultasCrescentes as erro:
+            raise CommandError(str(erro))
+
+        for url, totais in medicoes.items():
+            self.stdout.write(f"  {url}: {totais[0]} consulta(s)")
+        self.stdout.write(self.style.SUCCESS(f"✓ {len(medicoes)} página(s) com número fixo de consultas"))
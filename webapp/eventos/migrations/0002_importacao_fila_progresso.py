@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importacaoexcel',
+            name='evento',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='importacoes', to='eventos.evento', verbose_name='Evento'),
+        ),
+        migrations.AddField(
+            model_name='importacaoexcel',
+            name='iniciado_em',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em'),
+        ),
+        migrations.AddField(
+            model_name='importacaoexcel',
+            name='linhas_por_segundo',
+            field=models.FloatField(default=0, verbose_name='Linhas por Segundo'),
+        ),
+        migrations.AddField(
+            model_name='importacaoexcel',
+            name='linhas_processadas',
+            field=models.IntegerField(default=0, verbose_name='Linhas Processadas'),
+        ),
+        migrations.AlterField(
+            model_name='importacaoexcel',
+            name='status',
+            field=models.CharField(choices=[('na_fila', 'Na Fila'), ('processando', 'Processando'), ('sucesso', 'Sucesso'), ('erro', 'Erro')], default='processando', max_length=20, verbose_name='Status'),
+        ),
+        migrations.AddIndex(
+            model_name='importacaoexcel',
+            index=models.Index(fields=['status', 'criado_em'], name='eventos_imp_status_9d022e_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0002_importacao_fila_progresso'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='participante',
+            options={'ordering': ['-data_inscricao', '-id'], 'verbose_name': 'Participante', 'verbose_name_plural': 'Participantes'},
+        ),
+        migrations.RemoveIndex(
+            model_name='participante',
+            name='eventos_par_data_in_26d74d_idx',
+        ),
+        migrations.AddIndex(
+            model_name='participante',
+            index=models.Index(fields=['data_inscricao', 'id'], name='eventos_par_data_in_a15bc8_idx'),
+        ),
+    ]
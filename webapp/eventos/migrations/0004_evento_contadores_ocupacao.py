@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:25
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def preencher_contadores(apps, schema_editor):
+    Evento = apps.get_model("eventos", "Evento")
+    Participante = apps.get_model("eventos", "Participante")
+    participantes = Participante.objects.filter(evento=OuterRef("pk")).order_by().values("evento")
+    Evento.objects.update(
+        total_inscritos=Coalesce(Subquery(participantes.annotate(n=Count("id")).values("n")), 0),
+        total_confirmados=Coalesce(
+            Subquery(participantes.filter(status="confirmado").annotate(n=Count("id")).values("n")), 0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0003_participante_indice_paginacao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='total_confirmados',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Total de Confirmados'),
+        ),
+        migrations.AddField(
+            model_name='evento',
+            name='total_inscritos',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Total de Inscritos'),
+        ),
+        migrations.RunPython(preencher_contadores, migrations.RunPython.noop),
+    ]
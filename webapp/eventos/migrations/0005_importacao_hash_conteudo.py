@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0004_evento_contadores_ocupacao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importacaoexcel',
+            name='hash_conteudo',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='Hash do Conteúdo (SHA-256)'),
+        ),
+    ]
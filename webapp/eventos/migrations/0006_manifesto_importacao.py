@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0005_importacao_hash_conteudo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinhaManifesto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chave', models.CharField(max_length=16, verbose_name='Chave')),
+                ('email', models.CharField(max_length=254, verbose_name='E-mail')),
+                ('hash_linha', models.CharField(max_length=16, verbose_name='Hash da Linha')),
+                ('importacao', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='manifesto', to='eventos.importacaoexcel', verbose_name='Importação')),
+            ],
+            options={
+                'verbose_name': 'Linha do Manifesto',
+                'verbose_name_plural': 'Manifesto de Importação',
+                'constraints': [models.UniqueConstraint(fields=('importacao', 'chave'), name='manifesto_importacao_chave_unica')],
+            },
+        ),
+    ]
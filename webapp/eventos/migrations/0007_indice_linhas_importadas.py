@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0006_manifesto_importacao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importacaoexcel',
+            name='linhas_ignoradas',
+            field=models.IntegerField(default=0, verbose_name='Linhas sem Alteração'),
+        ),
+        migrations.CreateModel(
+            name='IndiceLinhaImportada',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chave', models.CharField(max_length=16, verbose_name='Chave')),
+                ('hash_linha', models.CharField(max_length=16, verbose_name='Hash da Linha')),
+                ('gravado_em', models.DateTimeField(verbose_name='Gravado em')),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='indice_linhas', to='eventos.evento', verbose_name='Evento')),
+            ],
+            options={
+                'verbose_name': 'Índice de Linha Importada',
+                'verbose_name_plural': 'Índice de Linhas Importadas',
+                'constraints': [models.UniqueConstraint(fields=('evento', 'chave'), name='indice_linha_evento_chave_unica')],
+            },
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:41
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+LINHA_LOG = re.compile(r"^\S+ Linha (\d+): (.*)$")
+CLIENTE_CRIADO, INGRESSO_CRIADO, ATUALIZADO, IGNORADO, ERRO = 1, 2, 3, 4, 5
+
+
+def _resultado(texto):
+    if texto.startswith("Erro - "):
+        return ERRO
+    if "Novo cliente" in texto:
+        return CLIENTE_CRIADO
+    if "Novo ingresso" in texto:
+        return INGRESSO_CRIADO
+    if "Sem alterações" in texto:
+        return IGNORADO
+    return ATUALIZADO
+
+
+def converter_logs(apps, schema_editor):
+    """Converte o texto de log_processamento das importações existentes em registros"""
+    ImportacaoExcel = apps.get_model("eventos", "ImportacaoExcel")
+    MensagemImportacao = apps.get_model("eventos", "MensagemImportacao")
+    RegistroImportacao = apps.get_model("eventos", "RegistroImportacao")
+
+    mensagens = {}
+    logs = ImportacaoExcel.objects.exclude(log_processamento="").values_list("pk", "log_processamento")
+    for importacao_id, log in logs.iterator(chunk_size=100):
+        registros = []
+        for linha in log.splitlines():
+            encontrado = LINHA_LOG.match(linha.strip())
+            if not encontrado:
+                continue
+            # O cliente não é conhecido no texto antigo: o trecho original vira a mensagem
+            texto = encontrado.group(2)[:1000]
+            if texto not in mensagens:
+                mensagens[texto] = MensagemImportacao.objects.get_or_create(texto=texto)[0].pk
+            registros.append(
+                RegistroImportacao(
+                    importacao_id=importacao_id,
+                    linha=int(encontrado.group(1)),
+                    resultado=_resultado(texto),
+                    mensagem_id=mensagens[texto],
+                )
+            )
+        RegistroImportacao.objects.bulk_create(registros, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0007_indice_linhas_importadas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MensagemImportacao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('texto', models.CharField(max_length=1000, unique=True, verbose_name='Texto')),
+            ],
+            options={
+                'verbose_name': 'Mensagem de Importação',
+                'verbose_name_plural': 'Mensagens de Importação',
+            },
+        ),
+        migrations.CreateModel(
+            name='RegistroImportacao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('linha', models.PositiveIntegerField(verbose_name='Linha')),
+                ('resultado', models.PositiveSmallIntegerField(choices=[(1, 'Novo cliente e ingresso criados'), (2, 'Novo ingresso criado'), (3, 'Ingresso atualizado'), (4, 'Sem alterações (ignorada)'), (5, 'Erro')], verbose_name='Resultado')),
+                ('cliente', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='eventos.cliente', verbose_name='Cliente')),
+                ('importacao', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registros', to='eventos.importacaoexcel', verbose_name='Importação')),
+                ('mensagem', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='eventos.mensagemimportacao', verbose_name='Mensagem')),
+            ],
+            options={
+                'verbose_name': 'Registro de Importação',
+                'verbose_name_plural': 'Registros de Importação',
+                'ordering': ['importacao', 'linha'],
+                'indexes': [models.Index(fields=['importacao', 'linha'], name='eventos_reg_importa_dc64ab_idx'), models.Index(fields=['importacao', 'resultado', 'linha'], name='eventos_reg_importa_a80a45_idx')],
+            },
+        ),
+        migrations.RunPython(converter_logs, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='importacaoexcel',
+            name='log_processamento',
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def preencher_vendas(apps, schema_editor):
+    Participante = apps.get_model("eventos", "Participante")
+    VendaDiaria = apps.get_model("eventos", "VendaDiaria")
+    grupos = (
+        Participante.objects.order_by()
+        .annotate(dia=TruncDate("data_inscricao"))
+        .values("dia", "evento_id", "status", "tipo_participante")
+        .annotate(quantidade=Count("id"), receita=Sum("valor_pago"))
+    )
+    VendaDiaria.objects.bulk_create((VendaDiaria(**grupo) for grupo in grupos.iterator()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0008_registros_importacao'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendaDiaria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dia', models.DateField(verbose_name='Dia')),
+                ('status', models.CharField(max_length=20, verbose_name='Status')),
+                ('tipo_participante', models.CharField(max_length=20, verbose_name='Tipo')),
+                ('quantidade', models.IntegerField(default=0, verbose_name='Ingressos')),
+                ('receita', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Receita')),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vendas_diarias', to='eventos.evento', verbose_name='Evento')),
+            ],
+            options={
+                'verbose_name': 'Venda Diária',
+                'verbose_name_plural': 'Vendas Diárias',
+                'ordering': ['dia'],
+                'indexes': [models.Index(fields=['evento', 'dia'], name='eventos_ven_evento__24122a_idx')],
+                'constraints': [models.UniqueConstraint(fields=('dia', 'evento', 'status', 'tipo_participante'), name='venda_diaria_chave_unica')],
+            },
+        ),
+        migrations.RunPython(preencher_vendas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:58
+
+from django.db import migrations, models
+
+from eventos.normalizacao import apenas_digitos, normalizar_texto
+
+
+def preencher_colunas_busca(apps, schema_editor):
+    Cliente = apps.get_model("eventos", "Cliente")
+    lote = []
+    for cliente in Cliente.objects.only("pk", "nome_completo", "email", "cpf", "telefone").iterator(chunk_size=1000):
+        cliente.nome_normalizado = normalizar_texto(cliente.nome_completo)
+        cliente.email_normalizado = normalizar_texto(cliente.email)
+        cliente.cpf_digitos = apenas_digitos(cliente.cpf)
+        cliente.telefone_digitos = apenas_digitos(cliente.telefone)
+        lote.append(cliente)
+        if len(lote) == 1000:
+            Cliente.objects.bulk_update(lote, ["nome_normalizado", "email_normalizado", "cpf_digitos", "telefone_digitos"])
+            lote = []
+    if lote:
+        Cliente.objects.bulk_update(lote, ["nome_normalizado", "email_normalizado", "cpf_digitos", "telefone_digitos"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0009_vendas_diarias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='cpf_digitos',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=14, verbose_name='CPF (busca)'),
+        ),
+        migrations.AddField(
+            model_name='cliente',
+            name='email_normalizado',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=254, verbose_name='E-mail (busca)'),
+        ),
+        migrations.AddField(
+            model_name='cliente',
+            name='nome_normalizado',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=200, verbose_name='Nome (busca)'),
+        ),
+        migrations.AddField(
+            model_name='cliente',
+            name='telefone_digitos',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20, verbose_name='Telefone (busca)'),
+        ),
+        migrations.RunPython(preencher_colunas_busca, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:13
+
+import secrets
+
+from django.db import migrations, models
+
+SEQUENCIA_POSTGRES = "eventos_codigo_ingresso_seq"
+
+
+def criar_sequencia(apps, schema_editor):
+    SequenciaIngresso = apps.get_model("eventos", "SequenciaIngresso")
+    SequenciaIngresso.objects.using(schema_editor.connection.alias).get_or_create(
+        pk=1, defaults={"chave": secrets.randbits(63)}
+    )
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"CREATE SEQUENCE IF NOT EXISTS {SEQUENCIA_POSTGRES}")
+
+
+def remover_sequencia(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP SEQUENCE IF EXISTS {SEQUENCIA_POSTGRES}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0010_cliente_colunas_busca'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SequenciaIngresso',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chave', models.BigIntegerField(editable=False, verbose_name='Chave')),
+                ('proximo', models.BigIntegerField(default=0, editable=False, verbose_name='Próximo número')),
+            ],
+            options={
+                'verbose_name': 'Sequência de Ingressos',
+                'verbose_name_plural': 'Sequência de Ingressos',
+            },
+        ),
+        migrations.RunPython(criar_sequencia, remover_sequencia),
+    ]
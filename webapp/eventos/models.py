@@ -3,10 +3,17 @@ Models para gerenciamento de eventos e participantes
 """
 
 import random
-from django.db import models
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Coalesce, TruncDate
 from django.core.validators import EmailValidator, RegexValidator
 from django.utils import timezone
 
+from . import cache_agregados
+from .normalizacao import apenas_digitos, normalizar_texto
+
 
 class Categoria(models.Model):
     """Categoria de eventos"""
@@ -37,6 +44,74 @@ class Categoria(models.Model):
         super().save(*args, **kwargs)
 
 
+# Colunas de busca de Cliente: campo de origem -> (coluna normalizada, função de normalização)
+CAMPOS_NORMALIZADOS = {
+    "nome_completo": ("nome_normalizado", normalizar_texto),
+    "email": ("email_normalizado", normalizar_texto),
+    "cpf": ("cpf_digitos", apenas_digitos),
+    "telefone": ("telefone_digitos", apenas_digitos),
+}
+
+
+class ClienteQuerySet(models.QuerySet):
+    """QuerySet de Cliente que mantém as colunas normalizadas de busca nas escritas em lote"""
+
+    def update(self, **kwargs):
+        pendentes = [
+            origem for origem, (coluna, _) in CAMPOS_NORMALIZADOS.items() if origem in kwargs and coluna not in kwargs
+        ]
+        if not pendentes:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            pks = list(self.order_by().values_list("pk", flat=True))
+            linhas = super().update(**kwargs)
+            # Os valores podem ser expressões: normaliza a partir do que foi gravado
+            self.model.objects.using(self.db).filter(pk__in=pks).normalizar()
+        return linhas
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.normalizar()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    bulk_create.alters_data = True
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.normalizar()
+        fields = list(fields)
+        fields += [coluna for origem, (coluna, _) in CAMPOS_NORMALIZADOS.items() if origem in fields]
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    bulk_update.alters_data = True
+
+    def normalizar(self, batch_size=1000):
+        """
+        Recalcula as colunas normalizadas de busca dos clientes
+
+        Returns:
+            Número de clientes atualizados
+        """
+        colunas = [coluna for coluna, _ in CAMPOS_NORMALIZADOS.values()]
+        gerenciador = self.model.objects.using(self.db)
+        atualizados = 0
+        lote = []
+        for cliente in self.only("pk", *CAMPOS_NORMALIZADOS).iterator(chunk_size=batch_size):
+            lote.append(cliente)
+            if len(lote) == batch_size:
+                atualizados += gerenciador.bulk_update(lote, colunas)
+                lote = []
+        if lote:
+            atualizados += gerenciador.bulk_update(lote, colunas)
+        return atualizados
+
+    normalizar.alters_data = True
+
+
 class Cliente(models.Model):
     """Cadastro único de clientes/pessoas"""
 
@@ -63,10 +138,18 @@ class Cliente(models.Model):
     estado = models.CharField("Estado", max_length=2, blank=True)
     observacoes = models.TextField("Observações", blank=True)
 
+    # Colunas de busca (sem acentos/minúsculas e só dígitos), preenchidas por normalizar()
+    nome_normalizado = models.CharField("Nome (busca)", max_length=200, blank=True, editable=False, db_index=True)
+    email_normalizado = models.CharField("E-mail (busca)", max_length=254, blank=True, editable=False, db_index=True)
+    cpf_digitos = models.CharField("CPF (busca)", max_length=14, blank=True, editable=False, db_index=True)
+    telefone_digitos = models.CharField("Telefone (busca)", max_length=20, blank=True, editable=False, db_index=True)
+
     # Campos de controle
     criado_em = models.DateTimeField("Criado em", auto_now_add=True)
     atualizado_em = models.DateTimeField("Atualizado em", auto_now=True)
 
+    objects = ClienteQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Cliente"
         verbose_name_plural = "Clientes"
@@ -79,6 +162,20 @@ class Cliente(models.Model):
     def __str__(self):
         return f"{self.nome_completo} ({self.email})"
 
+    def normalizar(self):
+        """Preenche as colunas normalizadas de busca a partir dos campos de origem"""
+        for origem, (coluna, funcao) in CAMPOS_NORMALIZADOS.items():
+            setattr(self, coluna, funcao(getattr(self, origem)))
+
+    def save(self, *args, **kwargs):
+        self.normalizar()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            update_fields |= {coluna for origem, (coluna, _) in CAMPOS_NORMALIZADOS.items() if origem in update_fields}
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+
     @property
     def total_eventos(self):
         """Total de eventos que o cliente participou"""
@@ -97,6 +194,65 @@ class Cliente(models.Model):
         return None
 
 
+# Contadores materializados de Evento
+CAMPOS_CONTADORES_EVENTO = {"total_inscritos", "total_confirmados"}
+
+
+class EventoQuerySet(models.QuerySet):
+    """QuerySet de Evento com manutenção dos contadores de ocupação"""
+
+    def update(self, **kwargs):
+        # Inclui as ações do admin e recalcular_contadores
+        linhas = super().update(**kwargs)
+        cache_agregados.invalidar(self.db)
+        return linhas
+
+    update.alters_data = True
+
+    def recalcular_contadores(self):
+        """
+        Recalcula total_inscritos e total_confirmados a partir dos participantes
+
+        Executa um único UPDATE com subconsultas correlacionadas, sem trazer
+        eventos ou participantes para o Python.
+
+        Returns:
+            Número de eventos atualizados
+        """
+        participantes = Participante.objects.filter(evento=models.OuterRef("pk")).order_by().values("evento")
+        inscritos = participantes.annotate(n=models.Count("id")).values("n")
+        confirmados = participantes.filter(status="confirmado").annotate(n=models.Count("id")).values("n")
+        return self.update(
+            total_inscritos=Coalesce(models.Subquery(inscritos), 0),
+            total_confirmados=Coalesce(models.Subquery(confirmados), 0),
+        )
+
+    def ocupacao(self, *campos):
+        """
+        Agrega eventos, vagas e confirmados agrupando pelos campos informados
+
+        Vagas e confirmados só consideram eventos com capacidade_maxima > 0 (os
+        demais não têm limite de vagas). Usa os contadores materializados em uma
+        única consulta com GROUP BY, sem trazer eventos para o Python.
+
+        Args:
+            *campos: Campos de agrupamento (ex: "status", "categoria__nome")
+
+        Returns:
+            QuerySet de dicionários com os campos e "eventos", "vagas" e "confirmados"
+        """
+        com_vagas = models.Q(capacidade_maxima__gt=0)
+        return (
+            self.order_by()
+            .values(*campos)
+            .annotate(
+                eventos=models.Count("id"),
+                vagas=Coalesce(models.Sum("capacidade_maxima", filter=com_vagas), 0),
+                confirmados=Coalesce(models.Sum("total_confirmados", filter=com_vagas), 0),
+            )
+        )
+
+
 class Evento(models.Model):
     """Modelo principal para eventos"""
 
@@ -121,11 +277,17 @@ class Evento(models.Model):
     status = models.CharField("Status", max_length=20, choices=STATUS_CHOICES, default="planejamento")
     observacoes = models.TextField("Observações", blank=True)
 
+    # Contadores materializados (mantidos pelos sinais e pelo ParticipanteQuerySet)
+    total_inscritos = models.IntegerField("Total de Inscritos", default=0, editable=False)
+    total_confirmados = models.IntegerField("Total de Confirmados", default=0, editable=False)
+
     # Campos de controle
     criado_em = models.DateTimeField("Criado em", auto_now_add=True)
     atualizado_em = models.DateTimeField("Atualizado em", auto_now=True)
     ativo = models.BooleanField("Ativo", default=True)
 
+    objects = EventoQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Evento"
         verbose_name_plural = "Eventos"
@@ -138,19 +300,29 @@ class Evento(models.Model):
     def __str__(self):
         return f"{self.nome} - {self.data_evento.strftime('%d/%m/%Y')}"
 
+    def save(self, *args, **kwargs):
+        # Os contadores só mudam por UPDATEs no banco: um save comum não grava os
+        # valores carregados na instância, que podem estar desatualizados
+        if not self._state.adding and kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+            ignorados = CAMPOS_CONTADORES_EVENTO | self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                campo.name
+                for campo in self._meta.concrete_fields
+                if not campo.primary_key and campo.attname not in ignorados
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def vagas_disponiveis(self):
         """Retorna número de vagas disponíveis"""
-        total_inscricoes = self.participantes.filter(status="confirmado").count()
-        return max(0, self.capacidade_maxima - total_inscricoes)
+        return max(0, self.capacidade_maxima - self.total_confirmados)
 
     @property
     def taxa_ocupacao(self):
         """Retorna percentual de ocupação"""
         if self.capacidade_maxima == 0:
             return 0
-        total_inscricoes = self.participantes.filter(status="confirmado").count()
-        return (total_inscricoes / self.capacidade_maxima) * 100
+        return (self.total_confirmados / self.capacidade_maxima) * 100
 
     @property
     def esta_lotado(self):
@@ -158,6 +330,157 @@ class Evento(models.Model):
         return self.vagas_disponiveis == 0
 
 
+class ParticipanteQuerySet(models.QuerySet):
+    """QuerySet de Participante com agregações reutilizáveis"""
+
+    def with_related(self):
+        """Carrega cliente, evento e categoria no mesmo SELECT (nome/email/telefone vêm do cliente)"""
+        return self.select_related("cliente", "evento", "evento__categoria")
+
+    def contagens(self):
+        """
+        Conta participantes por status e por tipo em uma única consulta
+
+        Returns:
+            Dicionário {"total": n, "por_status": {status: n}, "por_tipo": {tipo: n}}
+            com todos os status/tipos presentes (zero quando não há registros)
+        """
+        agregacoes = {"total": models.Count("id")}
+        for codigo, _ in Participante.STATUS_CHOICES:
+            agregacoes[f"status_{codigo}"] = models.Count("id", filter=models.Q(status=codigo))
+        for codigo, _ in Participante.TIPO_CHOICES:
+            agregacoes[f"tipo_{codigo}"] = models.Count("id", filter=models.Q(tipo_participante=codigo))
+
+        resultado = self.order_by().aggregate(**agregacoes)
+        return {
+            "total": resultado["total"],
+            "por_status": {codigo: resultado[f"status_{codigo}"] for codigo, _ in Participante.STATUS_CHOICES},
+            "por_tipo": {codigo: resultado[f"tipo_{codigo}"] for codigo, _ in Participante.TIPO_CHOICES},
+        }
+
+    # Escritas em lote não disparam save()/sinais: os contadores dos eventos e o
+    # resumo diário de vendas afetados são recalculados na mesma transação.
+
+    def update(self, **kwargs):
+        cache_agregados.invalidar(self.db)
+        contadores = CAMPOS_CONTADORES.intersection(kwargs)
+        vendas = CAMPOS_VENDAS.intersection(kwargs)
+        if not contadores and not vendas:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            # Pares (evento, dia) dos participantes afetados, antes da alteração
+            pares = set(
+                self.order_by().annotate(dia=TruncDate("data_inscricao")).values_list("evento_id", "dia").distinct()
+            )
+            linhas = super().update(**kwargs)
+            novo_evento = kwargs.get("evento_id", kwargs.get("evento"))
+            if novo_evento is not None:
+                novo_evento = getattr(novo_evento, "pk", novo_evento)
+                pares |= {(novo_evento, dia) for _, dia in pares}
+            eventos = {evento for evento, _ in pares}
+            if contadores:
+                Evento.objects.filter(pk__in=eventos).recalcular_contadores()
+            if vendas:
+                if "data_inscricao" in kwargs:
+                    VendaDiaria.objects.recalcular(eventos=eventos)
+                else:
+                    VendaDiaria.objects.recalcular(pares=pares)
+        return linhas
+
+    update.alters_data = True
+
+    def excluir_em_lote(self):
+        """
+        Exclui os participantes com um único DELETE, sem disparar sinais
+
+        Participante não tem dependentes em cascata. Os excluídos são travados e
+        descontados dos contadores dos eventos e do resumo diário de vendas na
+        mesma transação, sem recalcular o dia inteiro: use em blocos de tamanho
+        limitado (cada participante excluído é carregado com os campos do resumo).
+
+        Returns:
+            Número de participantes excluídos
+        """
+        with transaction.atomic(using=self.db):
+            excluidos = list(
+                self.order_by()
+                .select_for_update(of=("self",))
+                .only("pk", "evento_id", "data_inscricao", "status", "tipo_participante", "valor_pago")
+            )
+            if not excluidos:
+                return 0
+            deltas = {}
+            inscritos, confirmados = defaultdict(int), defaultdict(int)
+            for participante in excluidos:
+                _acumular_venda(deltas, participante.estado_venda(), -1)
+                inscritos[participante.evento_id] += 1
+                if participante.status == "confirmado":
+                    confirmados[participante.evento_id] += 1
+            Participante.objects.using(self.db).filter(pk__in=[p.pk for p in excluidos])._raw_delete(self.db)
+            VendaDiaria.objects.using(self.db).somar(deltas)
+            # EventoQuerySet.update também invalida os agregados em cache
+            for evento_id, quantidade in inscritos.items():
+                Evento.objects.using(self.db).filter(pk=evento_id).update(
+                    total_inscritos=models.F("total_inscritos") - quantidade,
+                    total_confirmados=models.F("total_confirmados") - confirmados[evento_id],
+                )
+        return len(excluidos)
+
+    excluir_em_lote.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from .codigos import gerar_codigos
+
+        objs = list(objs)
+        # Códigos de ingresso dos objetos sem código (o save não roda no bulk_create)
+        sem_codigo = [obj for obj in objs if not obj.codigo_ingresso]
+        for obj, codigo in zip(sem_codigo, gerar_codigos(len(sem_codigo), using=self.db)):
+            obj.codigo_ingresso = codigo
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            eventos = {obj.evento_id for obj in objs}
+            # O recálculo dos contadores (EventoQuerySet.update) também invalida os agregados em cache
+            Evento.objects.filter(pk__in=eventos).recalcular_contadores()
+            if kwargs.get("ignore_conflicts") or kwargs.get("update_conflicts"):
+                # Não se sabe quais objetos foram realmente inseridos
+                VendaDiaria.objects.recalcular(eventos=eventos)
+            else:
+                deltas = {}
+                for obj in objs:
+                    _acumular_venda(deltas, obj.estado_venda(), +1)
+                VendaDiaria.objects.somar(deltas)
+        for obj in objs:
+            obj._estado_contadores = (obj.evento_id, obj.status)
+            obj._estado_vendas = obj.estado_venda()
+        return objs
+
+    bulk_create.alters_data = True
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        linhas = super().bulk_update(objs, fields, *args, **kwargs)
+        for obj in objs:
+            obj._estado_contadores = (obj.evento_id, obj.status)
+            obj._estado_vendas = obj.estado_venda()
+        return linhas
+
+    bulk_update.alters_data = True
+
+
+# Campos de Participante que alteram os contadores de Evento
+CAMPOS_CONTADORES = {"status", "evento", "evento_id"}
+
+# Campos de Participante que alteram o resumo diário de vendas (VendaDiaria)
+CAMPOS_VENDAS = {"status", "tipo_participante", "valor_pago", "evento", "evento_id", "data_inscricao"}
+
+
+def _acumular_venda(deltas, estado, sinal):
+    """Soma (sinal = +1/-1) um ingresso, dado por Participante.estado_venda(), aos deltas do resumo"""
+    chave, valor = estado
+    quantidade, receita = deltas.get(chave, (0, Decimal(0)))
+    deltas[chave] = (quantidade + sinal, receita + sinal * valor)
+
+
 class Participante(models.Model):
     """Ingressos/Participações em eventos - vincula Cliente a Evento"""
 
@@ -197,26 +520,47 @@ class Participante(models.Model):
     data_inscricao = models.DateTimeField("Data da Inscrição", auto_now_add=True)
     atualizado_em = models.DateTimeField("Atualizado em", auto_now=True)
 
+    objects = ParticipanteQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Participante"
         verbose_name_plural = "Participantes"
-        ordering = ["-data_inscricao"]
+        ordering = ["-data_inscricao", "-id"]
         unique_together = ["evento", "cliente"]  # Um cliente não pode ter 2 ingressos para o mesmo evento
         indexes = [
             models.Index(fields=["status"]),
-            models.Index(fields=["data_inscricao"]),
+            # Chave da paginação por cursor (eventos/paginacao.py)
+            models.Index(fields=["data_inscricao", "id"]),
         ]
 
     def __str__(self):
         return f"{self.cliente.nome_completo} - {self.evento.nome}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Estado original, usado para ajustar os contadores do evento e o resumo de vendas no save
+        carregados = instance.__dict__.keys()
+        instance._estado_contadores = (
+            (instance.evento_id, instance.status) if CAMPOS_CONTADORES_CARREGADOS <= carregados else None
+        )
+        instance._estado_vendas = instance.estado_venda() if CAMPOS_VENDAS_CARREGADOS <= carregados else None
+        return instance
+
+    def estado_venda(self):
+        """Chave do resumo diário (dia, evento, status, tipo) e valor pago deste ingresso"""
+        chave = (timezone.localdate(self.data_inscricao), self.evento_id, self.status, self.tipo_participante)
+        return chave, Decimal(str(self.valor_pago or 0))
+
     def save(self, *args, **kwargs):
         # Gerar código de ingresso se não existir
         if not self.codigo_ingresso:
-            import uuid
+            from .codigos import gerar_codigo
 
-            self.codigo_ingresso = f"ING-{uuid.uuid4().hex[:8].upper()}"
-        super().save(*args, **kwargs)
+            self.codigo_ingresso = gerar_codigo(using=kwargs.get("using") or "default")
+        # Contadores do evento são ajustados no post_save, na mesma transação
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
 
     @property
     def nome_completo(self):
@@ -234,10 +578,159 @@ class Participante(models.Model):
         return self.cliente.telefone
 
 
+# Atributos necessários para o estado dos contadores e para Participante.estado_venda()
+CAMPOS_CONTADORES_CARREGADOS = {"evento_id", "status"}
+CAMPOS_VENDAS_CARREGADOS = {"data_inscricao", "evento_id", "status", "tipo_participante", "valor_pago"}
+
+
+class VendaDiariaQuerySet(models.QuerySet):
+    """QuerySet do resumo diário de vendas com manutenção incremental e reconstrução"""
+
+    def somar(self, deltas):
+        """
+        Soma quantidades e receitas ao resumo (atualização incremental)
+
+        Cada chave recebe um UPDATE com F(); chaves novas são criadas. Linhas que
+        chegam a zero ingressos são removidas.
+
+        Args:
+            deltas: Dicionário {(dia, evento_id, status, tipo_participante): (quantidade, receita)}
+        """
+        for (dia, evento_id, status, tipo), (quantidade, receita) in deltas.items():
+            if not quantidade and not receita:
+                continue
+            linha = self.filter(dia=dia, evento_id=evento_id, status=status, tipo_participante=tipo)
+            incremento = {"quantidade": models.F("quantidade") + quantidade, "receita": models.F("receita") + receita}
+            if linha.update(**incremento):
+                if quantidade < 0:
+                    linha.filter(quantidade__lte=0).delete()
+                continue
+            if quantidade <= 0:
+                # Nada a descontar (ex: evento sendo excluído em cascata)
+                continue
+            try:
+                with transaction.atomic(using=self.db):
+                    self.create(
+                        dia=dia,
+                        evento_id=evento_id,
+                        status=status,
+                        tipo_participante=tipo,
+                        quantidade=quantidade,
+                        receita=receita,
+                    )
+            except IntegrityError:
+                # Criada por outra transação entre o UPDATE e o INSERT
+                linha.update(**incremento)
+
+    somar.alters_data = True
+
+    def recalcular(self, pares=None, eventos=None):
+        """
+        Reconstrói o resumo a partir dos participantes
+
+        Args:
+            pares: Conjunto de (evento_id, dia) a reconstruir
+            eventos: IDs dos eventos a reconstruir por inteiro
+                (sem pares nem eventos, reconstrói o resumo inteiro)
+
+        Returns:
+            Número de linhas do resumo gravadas
+        """
+        if pares is not None:
+            dias_por_evento = defaultdict(set)
+            for evento_id, dia in pares:
+                dias_por_evento[evento_id].add(dia)
+            filtros = [
+                (
+                    models.Q(evento_id=evento_id, dia__in=dias),
+                    models.Q(evento_id=evento_id, data_inscricao__date__in=dias),
+                )
+                for evento_id, dias in dias_por_evento.items()
+            ]
+        elif eventos is not None:
+            filtros = [(models.Q(evento_id__in=eventos), models.Q(evento_id__in=eventos))] if eventos else []
+        else:
+            filtros = [(models.Q(), models.Q())]
+
+        gravadas = 0
+        with transaction.atomic(using=self.db):
+            for filtro_resumo, filtro_participantes in filtros:
+                self.filter(filtro_resumo).delete()
+                grupos = (
+                    Participante.objects.filter(filtro_participantes)
+                    .order_by()
+                    .annotate(dia=TruncDate("data_inscricao"))
+                    .values("dia", "evento_id", "status", "tipo_participante")
+                    .annotate(quantidade=models.Count("id"), receita=models.Sum("valor_pago"))
+                )
+                linhas = [VendaDiaria(**grupo) for grupo in grupos.iterator()]
+                gravadas += len(self.bulk_create(linhas, batch_size=1000))
+        return gravadas
+
+    recalcular.alters_data = True
+
+
+class VendaDiaria(models.Model):
+    """
+    Resumo diário de vendas: ingressos e receita por (dia, evento, status, tipo)
+
+    Mantido incrementalmente a cada escrita de Participante (sinais e
+    ParticipanteQuerySet) e reconstruível com ``manage.py recalcular_vendas``.
+    Os gráficos do histórico de vendas leem daqui, com custo proporcional ao
+    número de dias e não ao de ingressos.
+    """
+
+    dia = models.DateField("Dia")
+    evento = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name="vendas_diarias", verbose_name="Evento")
+    status = models.CharField("Status", max_length=20)
+    tipo_participante = models.CharField("Tipo", max_length=20)
+    quantidade = models.IntegerField("Ingressos", default=0)
+    receita = models.DecimalField("Receita", max_digits=14, decimal_places=2, default=0)
+
+    objects = VendaDiariaQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Venda Diária"
+        verbose_name_plural = "Vendas Diárias"
+        ordering = ["dia"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dia", "evento", "status", "tipo_participante"], name="venda_diaria_chave_unica"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["evento", "dia"]),
+        ]
+
+    def __str__(self):
+        return f"{self.dia:%d/%m/%Y} - {self.evento_id} - {self.status}/{self.tipo_participante}: {self.quantidade}"
+
+
+class SequenciaIngresso(models.Model):
+    """
+    Estado do gerador de códigos de ingresso (eventos/codigos.py)
+
+    Linha única criada na migração: a chave do embaralhamento dos números e,
+    nos bancos sem SEQUENCE, o próximo número livre (no PostgreSQL os números
+    vêm da sequência ``eventos_codigo_ingresso_seq``).
+    """
+
+    chave = models.BigIntegerField("Chave", editable=False)
+    proximo = models.BigIntegerField("Próximo número", default=0, editable=False)
+
+    class Meta:
+        verbose_name = "Sequência de Ingressos"
+        verbose_name_plural = "Sequência de Ingressos"
+
+    def __str__(self):
+        return f"Próximo número: {self.proximo}"
+
+
 class ImportacaoExcel(models.Model):
     """Registro de importações de arquivos Excel"""
 
     STATUS_CHOICES = [
+        ("na_fila", "Na Fila"),
         ("processando", "Processando"),
         ("sucesso", "Sucesso"),
         ("erro", "Erro"),
@@ -245,14 +738,28 @@ class ImportacaoExcel(models.Model):
 
     arquivo = models.FileField("Arquivo Excel", upload_to="importacoes/")
     nome_arquivo = models.CharField("Nome do Arquivo", max_length=255)
+    hash_conteudo = models.CharField("Hash do Conteúdo (SHA-256)", max_length=64, blank=True, db_index=True)
     status = models.CharField("Status", max_length=20, choices=STATUS_CHOICES, default="processando")
+    evento = models.ForeignKey(
+        Evento,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="importacoes",
+        verbose_name="Evento",
+    )
 
     total_linhas = models.IntegerField("Total de Linhas", default=0)
     linhas_importadas = models.IntegerField("Linhas Importadas", default=0)
     linhas_com_erro = models.IntegerField("Linhas com Erro", default=0)
+    linhas_ignoradas = models.IntegerField("Linhas sem Alteração", default=0)
+
+    # Progresso do processamento em segundo plano
+    linhas_processadas = models.IntegerField("Linhas Processadas", default=0)
+    linhas_por_segundo = models.FloatField("Linhas por Segundo", default=0)
+    iniciado_em = models.DateTimeField("Iniciado em", null=True, blank=True)
 
     mensagem_erro = models.TextField("Mensagem de Erro", blank=True)
-    log_processamento = models.TextField("Log de Processamento", blank=True)
 
     usuario = models.ForeignKey("auth.User", on_delete=models.SET_NULL, null=True, blank=True, verbose_name="Usuário")
 
@@ -263,10 +770,142 @@ class ImportacaoExcel(models.Model):
         verbose_name = "Importação de Excel"
         verbose_name_plural = "Importações de Excel"
         ordering = ["-criado_em"]
+        indexes = [
+            models.Index(fields=["status", "criado_em"]),
+        ]
 
     def __str__(self):
         return f"{self.nome_arquivo} - {self.get_status_display()}"
 
+    @property
+    def percentual_concluido(self):
+        """Percentual de linhas já processadas"""
+        if self.total_linhas == 0:
+            return 100.0 if self.status in ("sucesso", "erro") else 0.0
+        return min(100.0, self.linhas_processadas / self.total_linhas * 100)
+
+    @property
+    def eta_segundos(self):
+        """Tempo estimado (em segundos) até o fim do processamento"""
+        if self.status != "processando" or self.linhas_por_segundo <= 0:
+            return None
+        return max(0, self.total_linhas - self.linhas_processadas) / self.linhas_por_segundo
+
+
+class LinhaManifesto(models.Model):
+    """
+    Manifesto de uma importação: uma entrada por e-mail com o hash dos campos da linha
+
+    Ordenado por ``chave`` (hash do e-mail normalizado, em hexadecimal), que tem
+    a mesma ordem em qualquer collation do banco e permite comparar duas
+    importações mesclando os manifestos já ordenados.
+    """
+
+    importacao = models.ForeignKey(
+        ImportacaoExcel, on_delete=models.CASCADE, related_name="manifesto", verbose_name="Importação"
+    )
+    chave = models.CharField("Chave", max_length=16)
+    email = models.CharField("E-mail", max_length=254)
+    hash_linha = models.CharField("Hash da Linha", max_length=16)
+
+    class Meta:
+        verbose_name = "Linha do Manifesto"
+        verbose_name_plural = "Manifesto de Importação"
+        constraints = [
+            models.UniqueConstraint(fields=["importacao", "chave"], name="manifesto_importacao_chave_unica"),
+        ]
+
+    def __str__(self):
+        return f"{self.importacao_id}: {self.email}"
+
+
+class IndiceLinhaImportada(models.Model):
+    """
+    Hash da última linha importada para cada (evento, e-mail)
+
+    Permite que reimportações da mesma planilha pulem as linhas idênticas às
+    já gravadas. A entrada só vale enquanto o ingresso e o cliente não forem
+    alterados depois de ``gravado_em``.
+    """
+
+    evento = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name="indice_linhas", verbose_name="Evento")
+    chave = models.CharField("Chave", max_length=16)
+    hash_linha = models.CharField("Hash da Linha", max_length=16)
+    gravado_em = models.DateTimeField("Gravado em")
+
+    class Meta:
+        verbose_name = "Índice de Linha Importada"
+        verbose_name_plural = "Índice de Linhas Importadas"
+        constraints = [
+            models.UniqueConstraint(fields=["evento", "chave"], name="indice_linha_evento_chave_unica"),
+        ]
+
+    def __str__(self):
+        return f"{self.evento_id}: {self.chave}"
+
+
+class MensagemImportacao(models.Model):
+    """Texto de uma mensagem de erro de importação, gravado uma única vez e referenciado pelos registros"""
+
+    TAMANHO_MAXIMO = 1000
+
+    texto = models.CharField("Texto", max_length=TAMANHO_MAXIMO, unique=True)
+
+    class Meta:
+        verbose_name = "Mensagem de Importação"
+        verbose_name_plural = "Mensagens de Importação"
+
+    def __str__(self):
+        return self.texto
+
+
+class RegistroImportacao(models.Model):
+    """
+    Resultado de uma linha importada (linha, resultado, cliente e mensagem)
+
+    Substitui o antigo texto ``log_processamento``: cada linha vira um registro
+    compacto, gravado em lote ao fim de cada bloco, e o log é consultado
+    paginado e filtrado por resultado.
+    """
+
+    CLIENTE_CRIADO = 1
+    INGRESSO_CRIADO = 2
+    ATUALIZADO = 3
+    IGNORADO = 4
+    ERRO = 5
+
+    RESULTADO_CHOICES = [
+        (CLIENTE_CRIADO, "Novo cliente e ingresso criados"),
+        (INGRESSO_CRIADO, "Novo ingresso criado"),
+        (ATUALIZADO, "Ingresso atualizado"),
+        (IGNORADO, "Sem alterações (ignorada)"),
+        (ERRO, "Erro"),
+    ]
+
+    importacao = models.ForeignKey(
+        ImportacaoExcel, on_delete=models.CASCADE, related_name="registros", verbose_name="Importação"
+    )
+    linha = models.PositiveIntegerField("Linha")
+    resultado = models.PositiveSmallIntegerField("Resultado", choices=RESULTADO_CHOICES)
+    cliente = models.ForeignKey(
+        Cliente, on_delete=models.SET_NULL, null=True, blank=True, related_name="+", verbose_name="Cliente"
+    )
+    mensagem = models.ForeignKey(
+        MensagemImportacao, on_delete=models.PROTECT, null=True, blank=True, related_name="+", verbose_name="Mensagem"
+    )
+
+    class Meta:
+        verbose_name = "Registro de Importação"
+        verbose_name_plural = "Registros de Importação"
+        ordering = ["importacao", "linha"]
+        indexes = [
+            models.Index(fields=["importacao", "linha"]),
+            models.Index(fields=["importacao", "resultado", "linha"]),
+        ]
+
+    def __str__(self):
+        return f"Linha {self.linha}: {self.get_resultado_display()}"
+
 
 class RelatorioGerado(models.Model):
     """Histórico de relatórios gerados"""
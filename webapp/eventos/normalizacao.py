@@ -0,0 +1,37 @@
+"""
+Normalização de textos para busca
+
+Usada para preencher as colunas de busca de Cliente (nome e e-mail sem
+acentos e em minúsculas, CPF e telefone só com dígitos) no save, nas escritas
+em lote e na importação, e para normalizar o texto buscado do mesmo jeito.
+"""
+
+import re
+import unicodedata
+
+_ESPACOS = re.compile(r"\s+")
+_NAO_DIGITOS = re.compile(r"\D")
+
+
+def normalizar_texto(valor):
+    """
+    Remove acentos, ignora maiúsculas e junta espaços repetidos
+
+    Args:
+        valor: Texto original (None vira "")
+
+    Returns:
+        Texto normalizado (ex: "  João  CONCEIÇÃO" -> "joao conceicao")
+    """
+    if not valor:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", str(valor))
+    sem_acentos = "".join(caractere for caractere in decomposto if not unicodedata.combining(caractere))
+    return _ESPACOS.sub(" ", sem_acentos.casefold()).strip()
+
+
+def apenas_digitos(valor):
+    """Mantém só os dígitos do valor (ex: "123.456.789-00" -> "12345678900")"""
+    if not valor:
+        return ""
+    return _NAO_DIGITOS.sub("", str(valor))
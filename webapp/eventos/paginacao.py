@@ -0,0 +1,210 @@
+"""
+Paginação por cursor (keyset) para listagens grandes
+
+Em vez de ``OFFSET``/``LIMIT`` (custo cresce com o número da página) cada
+página é buscada com ``WHERE (campo, id) < (valor, id)`` sobre um índice,
+então a página 10.000 custa o mesmo que a primeira.
+"""
+
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import F, Q
+
+ULTIMA_PAGINA = "ultima"
+
+
+def _codificar_cursor(dados):
+    texto = json.dumps(dados, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip("=")
+
+
+def _decodificar_cursor(cursor):
+    preenchimento = "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(cursor + preenchimento).decode())
+
+
+class KeysetPage:
+    """Página retornada pelo KeysetPaginator (interface próxima de django.core.paginator.Page)"""
+
+    def __init__(self, object_list, paginator, inicio, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.inicio = inicio
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def number(self):
+        """Número da página (None quando a posição é desconhecida)"""
+        if self.inicio is None:
+            return None
+        return self.inicio // self.paginator.per_page + 1
+
+    def start_index(self):
+        """Posição (1-based) do primeiro registro da página"""
+        if self.inicio is None or not self.object_list:
+            return 0
+        return self.inicio + 1
+
+    def end_index(self):
+        """Posição (1-based) do último registro da página"""
+        if self.inicio is None:
+            return 0
+        return self.inicio + len(self.object_list)
+
+    @property
+    def next_cursor(self):
+        if not self._has_next or not self.object_list:
+            return None
+        ultimo = self.object_list[-1]
+        posicao = self.end_index() if self.inicio is not None else None
+        return self.paginator.cursor_para(ultimo, "n", posicao)
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        if not self.object_list:
+            # Página vazia depois de um cursor (fim da lista ou registros excluídos)
+            return ULTIMA_PAGINA
+        primeiro = self.object_list[0]
+        return self.paginator.cursor_para(primeiro, "p", self.inicio)
+
+
+class KeysetPaginator:
+    """
+    Pagina um queryset pela chave (campo, id)
+
+    O queryset é ordenado por ``campo`` e ``id`` (no mesmo sentido), o que
+    coincide com Participante.Meta.ordering e o índice (data_inscricao, id).
+    Chaves NULL (ex.: ``cliente__nome_completo`` de participante sem cliente)
+    ficam onde o banco as ordena (no fim da ordem crescente no PostgreSQL, no
+    início no SQLite) e o cursor as atravessa com filtros ``isnull``.
+    """
+
+    def __init__(self, queryset, per_page, campo="data_inscricao", descendente=True, total=None):
+        """
+        Inicializa o paginador
+
+        Args:
+            queryset: QuerySet a paginar (filtros já aplicados)
+            per_page: Registros por página
+            campo: Campo principal da chave (pode atravessar relações, ex: "cliente__nome_completo")
+            descendente: Se True, ordena do maior para o menor
+            total: "exata" (COUNT(*)), um total já calculado pela view (int, ex.: um
+                contador materializado) ou None (sem total)
+        """
+        self.per_page = per_page
+        self.campo = campo
+        self.descendente = descendente
+        self.modo_total = total
+        self.queryset = queryset.annotate(chave_cursor=F(campo))
+        self._count = total if isinstance(total, int) else None
+
+    @property
+    def count(self):
+        """Total de registros conforme o modo escolhido (None se não calculado)"""
+        if self._count is None and self.modo_total == "exata":
+            self._count = self.queryset.count()
+        return self._count
+
+    @property
+    def num_pages(self):
+        if self.count is None:
+            return None
+        return max(1, -(-self.count // self.per_page))
+
+    def _ordenado(self, invertido=False):
+        descendente = self.descendente != invertido
+        prefixo = "-" if descendente else ""
+        return self.queryset.order_by(f"{prefixo}chave_cursor", f"{prefixo}id")
+
+    def _depois_de(self, valor, pk, invertido=False):
+        """Filtra registros posteriores à chave (valor, pk) no sentido da ordenação"""
+        descendente = self.descendente != invertido
+        op = "lt" if descendente else "gt"
+        # Comparações com NULL nunca são verdadeiras: as chaves NULL formam um bloco
+        # no início ou no fim da ordem, conforme o banco
+        nulos_no_fim = connections[self.queryset.db].features.nulls_order_largest != descendente
+        if valor is None:
+            depois = Q(chave_cursor__isnull=True, **{f"id__{op}": pk})
+            return depois if nulos_no_fim else depois | Q(chave_cursor__isnull=False)
+        depois = Q(**{f"chave_cursor__{op}": valor}) | Q(chave_cursor=valor, **{f"id__{op}": pk})
+        return depois | Q(chave_cursor__isnull=True) if nulos_no_fim else depois
+
+    def cursor_para(self, obj, direcao, posicao):
+        """Gera o cursor que aponta para depois ("n") ou antes ("p") de obj"""
+        return _codificar_cursor({"d": direcao, "v": obj.chave_cursor, "id": obj.pk, "p": posicao})
+
+    def _valor_cursor(self, valor):
+        if valor is None:
+            return None
+        campo = self.queryset.query.resolve_ref("chave_cursor").output_field
+        return campo.to_python(valor)
+
+    def get_page(self, cursor=None):
+        """
+        Retorna a página indicada pelo cursor (cursor inválido volta à primeira página)
+
+        Args:
+            cursor: Cursor gerado por next_cursor/previous_cursor, "ultima" ou None
+
+        Returns:
+            KeysetPage com os registros da página
+        """
+        if cursor == ULTIMA_PAGINA:
+            registros = list(self._ordenado(invertido=True)[: self.per_page])
+            registros.reverse()
+            inicio = max(0, self.count - len(registros)) if self.count is not None else None
+            has_previous = inicio is None or inicio > 0
+            return KeysetPage(registros, self, inicio, has_next=False, has_previous=has_previous)
+
+        dados = None
+        if cursor:
+            try:
+                dados = _decodificar_cursor(cursor)
+                dados["v"] = self._valor_cursor(dados["v"])
+            except (ValueError, KeyError, TypeError, ValidationError):
+                dados = None
+
+        if dados is None:
+            registros = list(self._ordenado()[: self.per_page + 1])
+            has_next = len(registros) > self.per_page
+            return KeysetPage(registros[: self.per_page], self, 0, has_next=has_next, has_previous=False)
+
+        if dados["d"] == "p":
+            qs = self._ordenado(invertido=True).filter(self._depois_de(dados["v"], dados["id"], invertido=True))
+            registros = list(qs[: self.per_page + 1])
+            has_previous = len(registros) > self.per_page
+            registros = registros[: self.per_page]
+            registros.reverse()
+            inicio = dados["p"] - len(registros) if dados["p"] is not None else None
+            if inicio is not None and not has_previous:
+                inicio = 0
+            return KeysetPage(registros, self, inicio, has_next=True, has_previous=has_previous)
+
+        qs = self._ordenado().filter(self._depois_de(dados["v"], dados["id"]))
+        registros = list(qs[: self.per_page + 1])
+        has_next = len(registros) > self.per_page
+        return KeysetPage(registros[: self.per_page], self, dados["p"], has_next=has_next, has_previous=True)
@@ -0,0 +1,96 @@
+"""
+Sinais que mantêm os contadores de ocupação de Evento, o resumo diário de
+vendas e o cache de agregados
+
+Cada save/delete de Participante ajusta total_inscritos/total_confirmados do
+evento e a linha de VendaDiaria do ingresso com UPDATEs incrementais
+(F() +/- 1). Saves/deletes de Participante,
+Evento e Categoria invalidam os agregados em cache (cache_agregados). Escritas
+em lote são tratadas pelo ParticipanteQuerySet e pelo EventoQuerySet.
+"""
+
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache_agregados
+from .models import Categoria, Evento, Participante, VendaDiaria, _acumular_venda
+
+
+def _ajustar(evento_id, status, sinal):
+    if evento_id is None:
+        return
+    alteracoes = {"total_inscritos": F("total_inscritos") + sinal}
+    if status == "confirmado":
+        alteracoes["total_confirmados"] = F("total_confirmados") + sinal
+    Evento.objects.filter(pk=evento_id).update(**alteracoes)
+
+
+@receiver(post_save, sender=Participante)
+def atualizar_contadores_ao_salvar(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    atual = (instance.evento_id, instance.status)
+    anterior = None if created else getattr(instance, "_estado_contadores", None)
+
+    if created:
+        _ajustar(*atual, +1)
+    elif anterior is None:
+        # Estado original desconhecido (instância criada à mão ou evento/status
+        # adiados no carregamento): recalcula o evento inteiro
+        Evento.objects.filter(pk=instance.evento_id).recalcular_contadores()
+    elif anterior != atual:
+        _ajustar(*anterior, -1)
+        _ajustar(*atual, +1)
+
+    instance._estado_contadores = atual
+
+
+@receiver(post_delete, sender=Participante)
+def atualizar_contadores_ao_excluir(sender, instance, **kwargs):
+    _ajustar(instance.evento_id, instance.status, -1)
+
+
+@receiver(post_save, sender=Participante)
+def atualizar_vendas_ao_salvar(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    atual = instance.estado_venda()
+    anterior = None if created else getattr(instance, "_estado_vendas", None)
+
+    if created:
+        deltas = {}
+        _acumular_venda(deltas, atual, +1)
+        VendaDiaria.objects.somar(deltas)
+    elif anterior is None:
+        # Instância sem estado original conhecido: recalcula o evento inteiro
+        VendaDiaria.objects.recalcular(eventos={instance.evento_id})
+    elif anterior != atual:
+        deltas = {}
+        _acumular_venda(deltas, anterior, -1)
+        _acumular_venda(deltas, atual, +1)
+        VendaDiaria.objects.somar(deltas)
+
+    instance._estado_vendas = atual
+
+
+@receiver(post_delete, sender=Participante)
+def atualizar_vendas_ao_excluir(sender, instance, **kwargs):
+    anterior = getattr(instance, "_estado_vendas", None)
+    if anterior is None:
+        VendaDiaria.objects.recalcular(eventos={instance.evento_id})
+        return
+    deltas = {}
+    _acumular_venda(deltas, anterior, -1)
+    VendaDiaria.objects.somar(deltas)
+
+
+@receiver(post_save, sender=Participante)
+@receiver(post_delete, sender=Participante)
+@receiver(post_save, sender=Evento)
+@receiver(post_delete, sender=Evento)
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def invalidar_agregados(sender, using=None, raw=False, **kwargs):
+    if not raw:
+        cache_agregados.invalidar(using)
@@ -0,0 +1,29 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from eventos import busca
+from eventos.models import Cliente, Evento
+
+
+class BuscaTextualTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.maria = Cliente.objects.create(nome_completo="Maria da Conceição", email="maria@teste.com")
+        cls.joao = Cliente.objects.create(nome_completo="João Souza", email="joao@teste.com", telefone="11987654321")
+        cls.festival = Evento.objects.create(nome="Festival de Jazz", data_evento=timezone.now(), local="São Paulo")
+        Evento.objects.create(nome="Feira de Livros", data_evento=timezone.now(), local="Recife")
+
+    def _clientes(self, texto):
+        return set(Cliente.objects.filter(busca.filtro_clientes(texto)))
+
+    def test_prefixos_de_palavras_em_qualquer_ordem(self):
+        self.assertEqual(self._clientes("conceição mar"), {self.maria})
+        self.assertEqual(self._clientes("joao sou"), {self.joao})
+        self.assertEqual(self._clientes("11987"), {self.joao})
+
+    def test_texto_sem_palavras_nao_casa_nada(self):
+        self.assertEqual(self._clientes(" - "), set())
+        self.assertFalse(Evento.objects.filter(busca.filtro_eventos("")).exists())
+
+    def test_eventos_por_nome_ou_local(self):
+        self.assertEqual(list(Evento.objects.filter(busca.filtro_eventos("paulo jaz"))), [self.festival])
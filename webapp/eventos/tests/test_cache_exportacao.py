@@ -0,0 +1,57 @@
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos import cache_exportacao
+from eventos.models import Categoria, Cliente, Evento, Participante
+
+
+class CacheExportacaoCategoriaTests(TestCase):
+    """Renomear uma categoria invalida as exportações que mostram o nome dela"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.categoria = Categoria.objects.create(nome="Palestra")
+        evento = Evento.objects.create(
+            nome="Exportação", data_evento=timezone.now(), local="Teste", categoria=cls.categoria
+        )
+        cliente = Cliente.objects.create(nome_completo="Ana Lima", email="ana@teste.com")
+        Participante.objects.create(evento=evento, cliente=cliente)
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        configuracao = override_settings(MEDIA_ROOT=media)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "senha"))
+
+    def _exportar(self, **cabecalhos):
+        resposta = self.client.get(reverse("exportar_dados_completo"), {"formato": "csv"}, headers=cabecalhos)
+        conteudo = b"".join(resposta.streaming_content) if resposta.streaming else resposta.content
+        return resposta, conteudo.decode("utf-8-sig")
+
+    def test_renomear_categoria_muda_impressao(self):
+        antes = cache_exportacao.impressao_digital("dados_completos", "csv", {})
+        Categoria.objects.filter(pk=self.categoria.pk).update(nome="Workshop")
+        depois = cache_exportacao.impressao_digital("dados_completos", "csv", {})
+        self.assertNotEqual(antes, depois)
+        self.assertIsNone(cache_exportacao.buscar(depois, "csv"))
+
+    def test_renomear_categoria_gera_novo_arquivo(self):
+        primeira, conteudo = self._exportar()
+        self.assertIn("Palestra", conteudo)
+        self.assertEqual(self._exportar(If_None_Match=primeira["ETag"])[0].status_code, 304)
+
+        self.categoria.nome = "Workshop"
+        self.categoria.save()
+
+        segunda, conteudo = self._exportar(If_None_Match=primeira["ETag"])
+        self.assertEqual(segunda.status_code, 200)
+        self.assertNotEqual(segunda["ETag"], primeira["ETag"])
+        self.assertIn("Workshop", conteudo)
+        self.assertNotIn("Palestra", conteudo)
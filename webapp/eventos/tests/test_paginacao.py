@@ -0,0 +1,68 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.models import Cliente, Evento, Participante
+from eventos.paginacao import ULTIMA_PAGINA, KeysetPaginator
+
+
+class KeysetPaginatorChavesNulasTests(TestCase):
+    """Paginação por cliente__nome_completo com participantes sem cliente (chave NULL)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.evento = Evento.objects.create(nome="Paginação", data_evento=timezone.now(), local="Teste")
+        for i, nome in enumerate(["Bruno", None, "Ana", None, "Carla", "Ana", None]):
+            cliente = Cliente.objects.create(nome_completo=nome, email=f"pagina{i}@teste.com") if nome else None
+            Participante.objects.create(evento=cls.evento, cliente=cliente)
+
+    def _paginador(self, descendente, por_pagina):
+        return KeysetPaginator(
+            Participante.objects.filter(evento=self.evento),
+            por_pagina,
+            campo="cliente__nome_completo",
+            descendente=descendente,
+            total="exata",
+        )
+
+    def _ida_e_volta(self, descendente, por_pagina):
+        paginator = self._paginador(descendente, por_pagina)
+        pagina = paginator.get_page()
+        ida = [p.pk for p in pagina]
+        while pagina.has_next():
+            pagina = paginator.get_page(pagina.next_cursor)
+            ida.extend(p.pk for p in pagina)
+
+        pagina = paginator.get_page(ULTIMA_PAGINA)
+        volta = [p.pk for p in pagina]
+        while pagina.has_previous():
+            pagina = paginator.get_page(pagina.previous_cursor)
+            volta[:0] = [p.pk for p in pagina]
+        esperado = list(paginator._ordenado().values_list("pk", flat=True))
+        return ida, volta, esperado
+
+    def test_crescente_atravessa_chaves_nulas(self):
+        for por_pagina in (1, 2, 3):
+            ida, volta, esperado = self._ida_e_volta(descendente=False, por_pagina=por_pagina)
+            self.assertEqual(len(esperado), 7)
+            self.assertEqual(ida, esperado)
+            self.assertEqual(volta, esperado)
+
+    def test_decrescente_atravessa_chaves_nulas(self):
+        for por_pagina in (1, 2, 3):
+            ida, volta, esperado = self._ida_e_volta(descendente=True, por_pagina=por_pagina)
+            self.assertEqual(len(esperado), 7)
+            self.assertEqual(ida, esperado)
+            self.assertEqual(volta, esperado)
+
+    def test_central_dados_aceita_cursor_de_chave_nula(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "senha"))
+        paginator = self._paginador(descendente=False, por_pagina=1)
+        sem_cliente = Participante.objects.filter(evento=self.evento, cliente__isnull=True).first()
+        sem_cliente.chave_cursor = None
+        cursor = paginator.cursor_para(sem_cliente, "n", 0)
+        resposta = self.client.get(
+            reverse("central_dados"), {"evento": self.evento.pk, "ordem": "nome_completo", "cursor": cursor}
+        )
+        self.assertEqual(resposta.status_code, 200)
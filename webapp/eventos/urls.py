@@ -16,9 +16,16 @@ urlpatterns = [
     path("eventos/<int:evento_id>/relatorio/", views.gerar_relatorio, name="gerar_relatorio"),
     path("estatisticas/", views.estatisticas, name="estatisticas"),
     path("historico-vendas/", views.historico_vendas, name="historico_vendas"),
+    # Check-in
+    path("checkin/", views.checkin, name="checkin"),
+    path("checkin/lote/", views.checkin_lote, name="checkin_lote"),
     # Central de Dados
     path("central-dados/", views.central_dados, name="central_dados"),
     path("central-dados/exportar/", views.exportar_dados_completo, name="exportar_dados_completo"),
     path("importacoes/historico/", views.historico_importacoes, name="historico_importacoes"),
+    path(
+        "importacoes/<int:importacao_id>/progresso/", views.progresso_importacao, name="progresso_importacao"
+    ),
+    path("importacoes/<int:importacao_id>/log/", views.log_importacao, name="log_importacao"),
     path("importacoes/comparar/", views.comparar_importacoes, name="comparar_importacoes"),
 ]
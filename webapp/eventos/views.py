@@ -10,22 +10,48 @@ from datetime import datetime, timedelta
 # Adiciona o diretório raiz ao path para importar módulos src
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse, FileResponse, JsonResponse
+from django.http import FileResponse, JsonResponse
+from django.views.decorators.http import require_POST
 from django.utils import timezone
-from django.db.models import Count, Q, Sum, Prefetch, Max, Min
+from django.utils.dateparse import parse_date
+from django.db.models import Count, F, Sum, Prefetch, Max, Min
+from django.db.models.functions import TruncMonth
 from django.core.paginator import Paginator
 import pandas as pd
 
-from .models import Evento, Participante, Categoria, ImportacaoExcel, RelatorioGerado
-from src.data_cleaner import DataCleaner
+from .models import (
+    Categoria,
+    Cliente,
+    Evento,
+    ImportacaoExcel,
+    Participante,
+    RegistroImportacao,
+    RelatorioGerado,
+    VendaDiaria,
+)
+from . import busca as busca_textual
+from . import cache_agregados
+from . import checkin as checkin_ingressos
+from . import limpeza
+from .comparacao import comparar
+from .exportacao import COLUNAS_DADOS_COMPLETOS, COLUNAS_PARTICIPANTES, estatisticas_relatorio, exportar
+from .importacao import armazenar_arquivo, importacao_anterior, processar_importacao
+from .paginacao import KeysetPaginator
 from src.report_generator import ReportGenerator
 
 
 def dashboard(request):
     """Dashboard principal"""
+    # Agregados servidos do cache até a próxima escrita nos dados
+    context = cache_agregados.obter("dashboard", _agregados_dashboard)
+    return render(request, "eventos/dashboard.html", context)
+
+
+def _agregados_dashboard():
     total_eventos = Evento.objects.filter(ativo=True).count()
     total_participantes = Participante.objects.count()
     eventos_proximos = Evento.objects.filter(data_evento__gte=timezone.now(), ativo=True).order_by("data_evento")[:5]
@@ -34,14 +60,13 @@ def dashboard(request):
     eventos_por_status = Evento.objects.values("status").annotate(total=Count("id"))
     participantes_por_status = Participante.objects.values("status").annotate(total=Count("id"))
 
-    context = {
+    return {
         "total_eventos": total_eventos,
         "total_participantes": total_participantes,
-        "eventos_proximos": eventos_proximos,
-        "eventos_por_status": eventos_por_status,
-        "participantes_por_status": participantes_por_status,
+        "eventos_proximos": list(eventos_proximos),
+        "eventos_por_status": list(eventos_por_status),
+        "participantes_por_status": list(participantes_por_status),
     }
-    return render(request, "eventos/dashboard.html", context)
 
 
 def listar_eventos(request):
@@ -51,14 +76,14 @@ def listar_eventos(request):
     # Filtros
     status = request.GET.get("status")
     categoria = request.GET.get("categoria")
-    busca = request.GET.get("q")
+    busca = request.GET.get("busca")
 
     if status:
         eventos = eventos.filter(status=status)
     if categoria:
         eventos = eventos.filter(categoria_id=categoria)
     if busca:
-        eventos = eventos.filter(Q(nome__icontains=busca) | Q(descricao__icontains=busca) | Q(local__icontains=busca))
+        eventos = eventos.filter(busca_textual.filtro_eventos(busca))
 
     categorias = Categoria.objects.filter(ativo=True)
 
@@ -72,15 +97,18 @@ def listar_eventos(request):
 def detalhe_evento(request, evento_id):
     """Detalhes de um evento"""
     evento = get_object_or_404(Evento, id=evento_id)
-    participantes = evento.participantes.all().select_related("evento")
+    participantes = evento.participantes.with_related()
 
-    # Estatísticas do evento
+    # Estatísticas do evento (uma única consulta)
+    contagens = participantes.contagens()
     stats = {
-        "total": participantes.count(),
-        "confirmados": participantes.filter(status="confirmado").count(),
-        "pendentes": participantes.filter(status="pendente").count(),
-        "presentes": participantes.filter(status="presente").count(),
-        "por_tipo": participantes.values("tipo_participante").annotate(total=Count("id")),
+        "total": contagens["total"],
+        "confirmados": contagens["por_status"]["confirmado"],
+        "pendentes": contagens["por_status"]["pendente"],
+        "presentes": contagens["por_status"]["presente"],
+        "por_tipo": [
+            {"tipo_participante": tipo, "total": total} for tipo, total in contagens["por_tipo"].items() if total
+        ],
     }
 
     context = {
@@ -94,40 +122,24 @@ def detalhe_evento(request, evento_id):
 @login_required
 def importar_excel(request):
     """Importa dados do Excel ou CSV"""
-    if request.method == "POST" and request.FILES.get("arquivo"):
-        arquivo = request.FILES["arquivo"]
+    eventos = Evento.objects.filter(ativo=True).order_by("-data_evento")
+    hash_reenviado = request.POST.get("hash_conteudo")
 
+    if request.method == "POST" and (request.FILES.get("arquivo") or hash_reenviado):
         try:
-            # Salvar registro de importação
-            importacao = ImportacaoExcel.objects.create(
-                arquivo=arquivo, nome_arquivo=arquivo.name, usuario=request.user, status="processando"
-            )
-
-            # Ler arquivo (Excel ou CSV)
-            arquivo_nome = arquivo.name.lower()
-            if arquivo_nome.endswith(".csv"):
-                # Tentar diferentes encodings para CSV
-                try:
-                    df = pd.read_csv(arquivo, encoding="utf-8")
-                except UnicodeDecodeError:
-                    try:
-                        arquivo.seek(0)
-                        df = pd.read_csv(arquivo, encoding="latin-1")
-                    except:
-                        arquivo.seek(0)
-                        df = pd.read_csv(arquivo, encoding="cp1252")
+            # Arquivos são guardados uma única vez, pelo hash do conteúdo
+            if request.FILES.get("arquivo"):
+                arquivo = request.FILES["arquivo"]
+                nome_arquivo = arquivo.name
+                caminho, hash_conteudo = armazenar_arquivo(arquivo)
             else:
-                df = pd.read_excel(arquivo)
-
-            importacao.total_linhas = len(df)
-            importacao.save()
-
-            # Processar linhas
-            linhas_importadas = 0
-            linhas_atualizadas = 0
-            linhas_novas = 0
-            linhas_com_erro = 0
-            log = []
+                # Confirmação de reprocessamento: o arquivo já está no armazenamento
+                existente = ImportacaoExcel.objects.filter(hash_conteudo=hash_reenviado).first()
+                if existente is None:
+                    messages.error(request, "Arquivo não encontrado. Envie-o novamente.")
+                    return redirect("importar_excel")
+                nome_arquivo = request.POST.get("nome_arquivo") or existente.nome_arquivo
+                caminho, hash_conteudo = existente.arquivo.name, existente.hash_conteudo
 
             # Obter ou criar evento padrão para importação
             evento_padrao = request.POST.get("evento_id")
@@ -142,7 +154,7 @@ def importar_excel(request):
             # Se não houver evento selecionado, criar um evento padrão
             if not evento:
                 evento, _ = Evento.objects.get_or_create(
-                    nome="Importação Excel - " + arquivo.name,
+                    nome="Importação Excel - " + nome_arquivo,
                     defaults={
                         "data_evento": timezone.now(),
                         "local": "A definir",
@@ -151,97 +163,44 @@ def importar_excel(request):
                     },
                 )
 
-            for index, row in df.iterrows():
-                try:
-                    # Normalizar nomes das colunas (aceitar maiúsculas ou minúsculas)
-                    row_dict = {k.lower(): v for k, v in row.items()}
-
-                    # Extrair dados
-                    nome = row_dict.get("nome", row_dict.get("nome_completo", ""))
-                    email = row_dict.get("email", "")
-                    telefone = str(row_dict.get("telefone", ""))
-                    cpf = str(row_dict.get("cpf", ""))
-                    cidade = row_dict.get("cidade", "")
-                    estado = row_dict.get("estado", "")
-                    status = str(row_dict.get("status", "pendente")).lower()
-
-                    # Mapear status
-                    status_map = {
-                        "confirmado": "confirmado",
-                        "pendente": "pendente",
-                        "cancelado": "cancelado",
-                        "presente": "presente",
-                    }
-                    status = status_map.get(status, "pendente")
-
-                    # Criar ou buscar Cliente (baseado no email)
-                    from eventos.models import Cliente
-
-                    cliente, cliente_created = Cliente.objects.get_or_create(
-                        email=email,
-                        defaults={
-                            "nome_completo": nome,
-                            "telefone": telefone if telefone != "nan" else "",
-                            "cpf": cpf if cpf and cpf != "nan" else None,
-                            "cidade": cidade if cidade and cidade != "nan" else "",
-                            "estado": estado if estado and estado != "nan" else "",
-                        },
-                    )
-
-                    # Se cliente já existe, atualizar dados se novos valores fornecidos
-                    if not cliente_created:
-                        atualizado = False
-                        # Atualizar nome se fornecido e diferente
-                        if nome and nome != "nan" and cliente.nome_completo != nome:
-                            cliente.nome_completo = nome
-                            atualizado = True
-                        if telefone and telefone != "nan" and cliente.telefone != telefone:
-                            cliente.telefone = telefone
-                            atualizado = True
-                        if cidade and cidade != "nan" and cliente.cidade != cidade:
-                            cliente.cidade = cidade
-                            atualizado = True
-                        if estado and estado != "nan" and cliente.estado != estado:
-                            cliente.estado = estado
-                            atualizado = True
-                        if atualizado:
-                            cliente.save()
-
-                    # Criar ou atualizar participação (ingresso) no evento
-                    # update_or_create garante que não haverá duplicatas
-                    participante, created = Participante.objects.update_or_create(
-                        evento=evento,
-                        cliente=cliente,
-                        defaults={
-                            "tipo_participante": "comum",
-                            "status": status,  # Status é sempre atualizado com o do arquivo
-                        },
-                    )
-
-                    linhas_importadas += 1
-                    if created:
-                        linhas_novas += 1
-                        if cliente_created:
-                            log.append(
-                                f"✓ Linha {index+1}: {nome} - Novo cliente e ingresso criados (status: {status})"
-                            )
-                        else:
-                            log.append(f"✓ Linha {index+1}: {nome} - Novo ingresso criado (status: {status})")
-                    else:
-                        linhas_atualizadas += 1
-                        log.append(f"↻ Linha {index+1}: {nome} - Ingresso atualizado (status: {status})")
-
-                except Exception as e:
-                    linhas_com_erro += 1
-                    log.append(f"✗ Linha {index+1}: Erro - {str(e)}")
-
-            # Atualizar importação
-            importacao.linhas_importadas = linhas_importadas
-            importacao.linhas_com_erro = linhas_com_erro
-            importacao.status = "sucesso" if linhas_com_erro == 0 else "erro"
-            importacao.log_processamento = "\n".join(log)
-            importacao.processado_em = timezone.now()
-            importacao.save()
+            # Mesmo conteúdo já importado com sucesso para o evento: oferecer pular
+            anterior = importacao_anterior(hash_conteudo, evento)
+            if anterior and not request.POST.get("reprocessar"):
+                context = {
+                    "eventos": eventos,
+                    "duplicada": anterior,
+                    "hash_conteudo": hash_conteudo,
+                    "nome_arquivo": nome_arquivo,
+                    "evento_selecionado": evento,
+                }
+                return render(request, "eventos/importar_excel.html", context)
+
+            # Salvar registro de importação
+            em_segundo_plano = getattr(settings, "IMPORTACAO_EM_SEGUNDO_PLANO", True)
+            importacao = ImportacaoExcel.objects.create(
+                arquivo=caminho,
+                nome_arquivo=nome_arquivo,
+                hash_conteudo=hash_conteudo,
+                evento=evento,
+                usuario=request.user,
+                status="na_fila" if em_segundo_plano else "processando",
+            )
+
+            if em_segundo_plano:
+                # Processada pelo worker (python manage.py processar_importacoes)
+                messages.info(
+                    request,
+                    f"Importação de '{nome_arquivo}' adicionada à fila. "
+                    f"Acompanhe o progresso no histórico de importações.",
+                )
+                return redirect("historico_importacoes")
+
+            resultado = processar_importacao(importacao, atomico=True)
+            linhas_importadas = resultado["linhas_importadas"]
+            linhas_novas = resultado["linhas_novas"]
+            linhas_atualizadas = resultado["linhas_atualizadas"]
+            linhas_com_erro = resultado["linhas_com_erro"]
+            linhas_ignoradas = resultado["linhas_ignoradas"]
 
             # Mensagem detalhada de sucesso
             if linhas_com_erro == 0:
@@ -250,7 +209,8 @@ def importar_excel(request):
                     f"✓ Importação concluída com sucesso! "
                     f"Total: {linhas_importadas} registros | "
                     f"Novos: {linhas_novas} | "
-                    f"Atualizados: {linhas_atualizadas}",
+                    f"Atualizados: {linhas_atualizadas} | "
+                    f"Sem alteração: {linhas_ignoradas}",
                 )
             else:
                 messages.warning(
@@ -259,6 +219,7 @@ def importar_excel(request):
                     f"Sucesso: {linhas_importadas} | "
                     f"Novos: {linhas_novas} | "
                     f"Atualizados: {linhas_atualizadas} | "
+                    f"Sem alteração: {linhas_ignoradas} | "
                     f"Erros: {linhas_com_erro}",
                 )
 
@@ -268,53 +229,50 @@ def importar_excel(request):
         return redirect("dashboard")
 
     # GET - Mostrar formulário com lista de eventos
-    eventos = Evento.objects.filter(ativo=True).order_by("-data_evento")
     return render(request, "eventos/importar_excel.html", {"eventos": eventos})
 
 
 @login_required
 def limpar_dados(request, evento_id):
-    """Limpa e trata dados de um evento"""
+    """
+    Limpa e trata dados de um evento
+
+    As operações rodam no banco (eventos/limpeza.py); "simular" mostra quantos
+    registros cada operação alteraria (na ordem de execução), sem gravar nada.
+    """
     evento = get_object_or_404(Evento, id=evento_id)
+    selecionadas = [operacao for operacao in limpeza.OPERACOES if request.POST.get(operacao)]
+    previa = None
 
     if request.method == "POST":
-        operacao = request.POST.get("operacao")
-
-        # Obter participantes como DataFrame
-        participantes = evento.participantes.all().values(
-            "id", "nome_completo", "email", "telefone", "status", "tipo_participante"
-        )
-        df = pd.DataFrame(list(participantes))
-
-        if df.empty:
-            messages.warning(request, "Não há dados para limpar.")
+        if not selecionadas:
+            messages.warning(request, "Selecione ao menos uma operação.")
+        elif request.POST.get("acao") == "simular":
+            # Nomes/telefones são do cadastro do cliente: mostra quantos valem para outros eventos
+            compartilhados = limpeza.clientes_compartilhados(evento, selecionadas)
+            previa = [
+                (limpeza.OPERACOES[operacao], quantidade, compartilhados.get(operacao))
+                for operacao, quantidade in limpeza.previa(evento, selecionadas).items()
+            ]
+        else:
+            for operacao, quantidade in limpeza.executar(evento, selecionadas).items():
+                mensagem = f"{limpeza.OPERACOES[operacao]}: {quantidade}"
+                if operacao in limpeza.OPERACOES_CLIENTE:
+                    mensagem += " (no cadastro dos clientes, vale para todos os eventos em que estão inscritos)"
+                messages.success(request, mensagem)
             return redirect("detalhe_evento", evento_id=evento_id)
 
-        # Aplicar limpeza
-        cleaner = DataCleaner(df)
-
-        if operacao == "remover_duplicados":
-            cleaner.remove_duplicates(subset=["email"])
-            messages.success(request, "Duplicados removidos!")
-
-        elif operacao == "padronizar_texto":
-            cleaner.standardize_text(operation="title")
-            messages.success(request, "Texto padronizado!")
-
-        elif operacao == "validar_emails":
-            cleaner.validate_email("email")
-            messages.success(request, "E-mails validados!")
-
-        # Atualizar dados no banco
-        df_limpo = cleaner.get_cleaned_dataframe()
-        ids_validos = df_limpo["id"].tolist()
-
-        # Remover participantes inválidos
-        Participante.objects.filter(evento=evento).exclude(id__in=ids_validos).delete()
-
-        return redirect("detalhe_evento", evento_id=evento_id)
-
-    return render(request, "eventos/limpar_dados.html", {"evento": evento})
+    estatisticas_atuais = limpeza.previa(evento, ["validar_emails", "remover_duplicados"])
+    total_participantes = evento.participantes.count()
+    context = {
+        "evento": evento,
+        "selecionadas": selecionadas,
+        "previa": previa,
+        "total_participantes": total_participantes,
+        "emails_validos": total_participantes - estatisticas_atuais["validar_emails"],
+        "possiveis_duplicados": estatisticas_atuais["remover_duplicados"],
+    }
+    return render(request, "eventos/limpar_dados.html", context)
 
 
 @login_required
@@ -326,10 +284,27 @@ def gerar_relatorio(request, evento_id):
         tipo_relatorio = request.POST.get("tipo")
 
         # Obter dados
-        participantes = evento.participantes.all().values(
-            "nome_completo", "email", "telefone", "status", "tipo_participante", "valor_pago", "data_inscricao"
+        participantes = evento.participantes.values(
+            "status",
+            "tipo_participante",
+            "valor_pago",
+            "data_inscricao",
+            nome_completo=F("cliente__nome_completo"),
+            email=F("cliente__email"),
+            telefone=F("cliente__telefone"),
+        )
+        df = pd.DataFrame(
+            list(participantes),
+            columns=[
+                "nome_completo",
+                "email",
+                "telefone",
+                "status",
+                "tipo_participante",
+                "valor_pago",
+                "data_inscricao",
+            ],
         )
-        df = pd.DataFrame(list(participantes))
 
         if df.empty:
             messages.warning(request, "Não há dados para gerar relatório.")
@@ -344,7 +319,7 @@ def gerar_relatorio(request, evento_id):
         if tipo_relatorio == "excel":
             filename = f"{evento.nome.replace(' ', '_')}_relatorio.xlsx"
             file_path = output_path / filename
-            report_gen.generate_excel_report(file_path, include_stats=True)
+            report_gen.generate_excel_report(file_path, include_stats=True, stats=estatisticas_relatorio(evento))
 
         elif tipo_relatorio == "csv":
             filename = f"{evento.nome.replace(' ', '_')}_relatorio.csv"
@@ -376,58 +351,71 @@ def gerar_relatorio(request, evento_id):
 
 def estatisticas(request):
     """Página de estatísticas gerais"""
+    # Agregados servidos do cache até a próxima escrita nos dados
+    context = cache_agregados.obter("estatisticas", _agregados_estatisticas)
+    return render(request, "eventos/estatisticas.html", context)
+
+
+def _agregados_estatisticas():
     # Estatísticas gerais
-    total_eventos = Evento.objects.count()
     total_participantes = Participante.objects.count()
     total_categorias = Categoria.objects.count()
 
-    # Calcular taxa de ocupação
-    eventos_com_vagas = Evento.objects.exclude(capacidade_maxima=0)
-    if eventos_com_vagas.exists():
-        total_confirmados = Participante.objects.filter(evento__in=eventos_com_vagas, status="confirmado").count()
-        total_vagas = sum(e.capacidade_maxima for e in eventos_com_vagas)
-        taxa_ocupacao = (total_confirmados / total_vagas * 100) if total_vagas > 0 else 0
-    else:
-        taxa_ocupacao = 0
+    # Ocupação por status e por categoria: duas consultas agregadas sobre os
+    # contadores materializados, sem carregar eventos
+    status_dict = dict(Evento.STATUS_CHOICES)
+    ocupacao_por_status = [
+        {**item, "nome": status_dict.get(item["status"], item["status"]), "taxa": _taxa_ocupacao(item)}
+        for item in Evento.objects.ocupacao("status").order_by("-eventos")
+    ]
+    ocupacao_por_categoria = [
+        {**item, "nome": item["categoria__nome"] or "Sem Categoria", "taxa": _taxa_ocupacao(item)}
+        for item in Evento.objects.ocupacao("categoria__nome").order_by("-eventos")
+    ]
+
+    # Totais e taxa de ocupação geral (somas sobre os poucos grupos de status)
+    total_eventos = sum(item["eventos"] for item in ocupacao_por_status)
+    taxa_ocupacao = _taxa_ocupacao(
+        {
+            "vagas": sum(item["vagas"] for item in ocupacao_por_status),
+            "confirmados": sum(item["confirmados"] for item in ocupacao_por_status),
+        }
+    )
 
     # Eventos por status
-    eventos_por_status = Evento.objects.values("status").annotate(total=Count("id"))
-    eventos_status_labels = []
-    eventos_status_data = []
-    status_dict = dict(Evento.STATUS_CHOICES)
-    for item in eventos_por_status:
-        eventos_status_labels.append(status_dict.get(item["status"], item["status"]))
-        eventos_status_data.append(item["total"])
+    eventos_status_labels = [item["nome"] for item in ocupacao_por_status]
+    eventos_status_data = [item["eventos"] for item in ocupacao_por_status]
 
     # Eventos por categoria
-    eventos_por_categoria = Evento.objects.values("categoria__nome").annotate(total=Count("id")).order_by("-total")
-    categorias_labels = []
-    categorias_data = []
-    for item in eventos_por_categoria:
-        categorias_labels.append(item["categoria__nome"] or "Sem Categoria")
-        categorias_data.append(item["total"])
-
-    # Top eventos com maior participação
+    categorias_labels = [item["nome"] for item in ocupacao_por_categoria]
+    categorias_data = [item["eventos"] for item in ocupacao_por_categoria]
+
+    # Top eventos com maior participação (contador materializado de confirmados)
     top_eventos = (
-        Evento.objects.annotate(
-            participantes_confirmados=Count("participantes", filter=Q(participantes__status="confirmado"))
-        )
+        Evento.objects.select_related("categoria")
+        .annotate(participantes_confirmados=F("total_confirmados"))
         .filter(capacidade_maxima__gt=0)
-        .order_by("-participantes_confirmados")[:10]
+        .order_by("-total_confirmados")[:10]
     )
 
-    context = {
+    return {
         "total_eventos": total_eventos,
         "total_participantes": total_participantes,
         "total_categorias": total_categorias,
         "taxa_ocupacao": taxa_ocupacao,
+        "ocupacao_por_status": ocupacao_por_status,
+        "ocupacao_por_categoria": ocupacao_por_categoria,
         "eventos_status_labels": json.dumps(eventos_status_labels),
         "eventos_status_data": json.dumps(eventos_status_data),
         "categorias_labels": json.dumps(categorias_labels),
         "categorias_data": json.dumps(categorias_data),
-        "top_eventos": top_eventos,
+        "top_eventos": list(top_eventos),
     }
-    return render(request, "eventos/estatisticas.html", context)
+
+
+def _taxa_ocupacao(item):
+    """Percentual de vagas ocupadas por confirmados (0 sem vagas)"""
+    return (item["confirmados"] / item["vagas"] * 100) if item["vagas"] else 0
 
 
 def historico_vendas(request):
@@ -438,28 +426,73 @@ def historico_vendas(request):
     data_fim = request.GET.get("data_fim")
     status = request.GET.get("status")
 
-    # Query base
-    vendas = Participante.objects.select_related("evento", "evento__categoria", "cliente").order_by("-data_inscricao")
+    # Query base da listagem e do resumo diário (VendaDiaria) usado nos totais e gráficos
+    vendas = Participante.objects.with_related().order_by("-data_inscricao")
+    resumo = VendaDiaria.objects.all()
 
-    # Aplicar filtros
+    # Aplicar filtros (datas no fuso local, com data_fim inclusiva)
     if evento_id:
         vendas = vendas.filter(evento_id=evento_id)
+        resumo = resumo.filter(evento_id=evento_id)
 
-    if data_inicio:
-        vendas = vendas.filter(data_inscricao__gte=data_inicio)
+    dia_inicio = parse_date(data_inicio or "")
+    if dia_inicio:
+        vendas = vendas.filter(data_inscricao__gte=_inicio_do_dia(dia_inicio))
+        resumo = resumo.filter(dia__gte=dia_inicio)
 
-    if data_fim:
-        vendas = vendas.filter(data_inscricao__lte=data_fim)
+    dia_fim = parse_date(data_fim or "")
+    if dia_fim:
+        vendas = vendas.filter(data_inscricao__lt=_inicio_do_dia(dia_fim + timedelta(days=1)))
+        resumo = resumo.filter(dia__lte=dia_fim)
 
     if status:
         vendas = vendas.filter(status=status)
+        resumo = resumo.filter(status=status)
+
+    # Agregados do filtro aplicado, servidos do cache até a próxima escrita nos dados
+    filtros = {"evento": evento_id, "data_inicio": dia_inicio, "data_fim": dia_fim, "status": status}
+    agregados = cache_agregados.obter("historico_vendas", lambda: _agregados_vendas(resumo), filtros)
+
+    # Paginação por cursor (50 vendas por página; total já calculado nos agregados)
+    paginator = KeysetPaginator(vendas, 50, total=agregados["total_vendas"])
+    vendas_page = paginator.get_page(request.GET.get("cursor"))
+
+    # Lista de eventos para o filtro
+    eventos = Evento.objects.filter(ativo=True).order_by("-data_evento")
+
+    context = {
+        **agregados,
+        "vendas": vendas_page,
+        "eventos": eventos,
+        "evento_selecionado": evento_id,
+        "data_inicio": data_inicio,
+        "data_fim": data_fim,
+        "status_selecionado": status,
+    }
+    return render(request, "eventos/historico_vendas.html", context)
+
+
+def _inicio_do_dia(dia):
+    """Meia-noite do dia no fuso local, como datetime com fuso"""
+    return timezone.make_aware(datetime.combine(dia, datetime.min.time()))
+
+
+def _agregados_vendas(resumo):
+    """
+    Totais, vendas por status, receita por evento e séries por dia/mês
+
+    Args:
+        resumo: QuerySet de VendaDiaria já filtrado
 
-    # Estatísticas do filtro aplicado
-    total_vendas = vendas.count()
-    total_receita = vendas.aggregate(total=Sum("valor_pago"))["total"] or 0
+    Returns:
+        Dicionário com os agregados usados no template do histórico de vendas
+    """
+    totais = resumo.aggregate(total=Sum("quantidade"), receita=Sum("receita"))
+    total_vendas = totais["total"] or 0
+    total_receita = totais["receita"] or 0
 
     # Vendas por status - garantir que todos os status apareçam
-    vendas_por_status_query = vendas.values("status").annotate(total=Count("id"))
+    vendas_por_status_query = resumo.values("status").annotate(total=Sum("quantidade")).order_by()
     status_dict = {
         "pendente": 0,
         "confirmado": 0,
@@ -479,19 +512,14 @@ def historico_vendas(request):
 
     # Receita por evento (top 10)
     receita_por_evento = (
-        vendas.values("evento__nome")
-        .annotate(receita=Sum("valor_pago"), quantidade=Count("id"))
+        resumo.values("evento__nome")
+        .annotate(receita=Sum("receita"), quantidade=Sum("quantidade"))
         .order_by("-receita")[:10]
     )
 
     # Vendas por dia (últimos 30 dias ou filtro aplicado)
-    from django.db.models.functions import TruncDate
-
     vendas_por_dia = (
-        vendas.annotate(dia=TruncDate("data_inscricao"))
-        .values("dia")
-        .annotate(quantidade=Count("id"), receita=Sum("valor_pago"))
-        .order_by("dia")
+        resumo.values("dia").annotate(quantidade=Sum("quantidade"), receita=Sum("receita")).order_by("dia")
     )
 
     # Preparar dados para o gráfico de vendas por dia
@@ -499,18 +527,15 @@ def historico_vendas(request):
     dias_quantidade = []
     dias_receita = []
     for item in vendas_por_dia:
-        if item["dia"]:
-            dias_labels.append(item["dia"].strftime("%d/%m/%Y"))
-            dias_quantidade.append(item["quantidade"])
-            dias_receita.append(float(item["receita"] or 0))
+        dias_labels.append(item["dia"].strftime("%d/%m/%Y"))
+        dias_quantidade.append(item["quantidade"])
+        dias_receita.append(float(item["receita"] or 0))
 
     # Vendas por mês
-    from django.db.models.functions import TruncMonth
-
     vendas_por_mes = (
-        vendas.annotate(mes=TruncMonth("data_inscricao"))
+        resumo.annotate(mes=TruncMonth("dia"))
         .values("mes")
-        .annotate(quantidade=Count("id"), receita=Sum("valor_pago"))
+        .annotate(quantidade=Sum("quantidade"), receita=Sum("receita"))
         .order_by("mes")
     )
 
@@ -519,30 +544,15 @@ def historico_vendas(request):
     meses_quantidade = []
     meses_receita = []
     for item in vendas_por_mes:
-        if item["mes"]:
-            meses_labels.append(item["mes"].strftime("%m/%Y"))
-            meses_quantidade.append(item["quantidade"])
-            meses_receita.append(float(item["receita"] or 0))
-
-    # Paginação
-    paginator = Paginator(vendas, 50)  # 50 vendas por página
-    page_number = request.GET.get("page")
-    vendas_page = paginator.get_page(page_number)
+        meses_labels.append(item["mes"].strftime("%m/%Y"))
+        meses_quantidade.append(item["quantidade"])
+        meses_receita.append(float(item["receita"] or 0))
 
-    # Lista de eventos para o filtro
-    eventos = Evento.objects.filter(ativo=True).order_by("-data_evento")
-
-    context = {
-        "vendas": vendas_page,
+    return {
         "total_vendas": total_vendas,
         "total_receita": total_receita,
         "vendas_por_status": vendas_por_status,
-        "receita_por_evento": receita_por_evento,
-        "eventos": eventos,
-        "evento_selecionado": evento_id,
-        "data_inicio": data_inicio,
-        "data_fim": data_fim,
-        "status_selecionado": status,
+        "receita_por_evento": list(receita_por_evento),
         "dias_labels": json.dumps(dias_labels),
         "dias_quantidade": json.dumps(dias_quantidade),
         "dias_receita": json.dumps(dias_receita),
@@ -550,7 +560,14 @@ def historico_vendas(request):
         "meses_quantidade": json.dumps(meses_quantidade),
         "meses_receita": json.dumps(meses_receita),
     }
-    return render(request, "eventos/historico_vendas.html", context)
+
+
+# Ordenações aceitas na Central de Dados (parâmetro "ordem" -> campo)
+ORDENACOES_CENTRAL_DADOS = {
+    "data_inscricao": "data_inscricao",
+    "nome_completo": "cliente__nome_completo",
+    "evento__nome": "evento__nome",
+}
 
 
 @login_required
@@ -563,7 +580,7 @@ def central_dados(request):
     total_importacoes = ImportacaoExcel.objects.count()
 
     # Dados de todos os participantes com relacionamentos
-    participantes = Participante.objects.select_related("evento", "evento__categoria").all()
+    participantes = Participante.objects.with_related()
 
     # Filtros
     evento_id = request.GET.get("evento")
@@ -580,35 +597,35 @@ def central_dados(request):
     if status:
         participantes = participantes.filter(status=status)
     if busca:
-        participantes = participantes.filter(
-            Q(nome_completo__icontains=busca) | Q(email__icontains=busca) | Q(codigo_ingresso__icontains=busca)
-        )
+        participantes = participantes.filter(busca_textual.filtro_participantes(busca))
     if data_inicio:
         participantes = participantes.filter(data_inscricao__gte=data_inicio)
     if data_fim:
         participantes = participantes.filter(data_inscricao__lte=data_fim)
 
-    # Ordenação
+    # Ordenação (campo da chave de paginação)
     ordem = request.GET.get("ordem", "-data_inscricao")
-    participantes = participantes.order_by(ordem)
+    campo_ordem = ORDENACOES_CENTRAL_DADOS.get(ordem.lstrip("-"), "data_inscricao")
 
-    # Paginação
-    paginator = Paginator(participantes, 50)
-    page_number = request.GET.get("page", 1)
-    page_obj = paginator.get_page(page_number)
+    # Estatísticas da visão atual (uma única consulta)
+    contagens = participantes.contagens()
+    stats_atual = {
+        "total": contagens["total"],
+        "confirmados": contagens["por_status"]["confirmado"],
+        "pendentes": contagens["por_status"]["pendente"],
+        "cancelados": contagens["por_status"]["cancelado"],
+    }
+
+    # Paginação por cursor
+    paginator = KeysetPaginator(
+        participantes, 50, campo=campo_ordem, descendente=ordem.startswith("-"), total=stats_atual["total"]
+    )
+    page_obj = paginator.get_page(request.GET.get("cursor"))
 
     # Listas para filtros
     eventos = Evento.objects.all().order_by("nome")
     categorias = Categoria.objects.all().order_by("nome")
 
-    # Estatísticas da visão atual
-    stats_atual = {
-        "total": participantes.count(),
-        "confirmados": participantes.filter(status="confirmado").count(),
-        "pendentes": participantes.filter(status="pendente").count(),
-        "cancelados": participantes.filter(status="cancelado").count(),
-    }
-
     context = {
         "page_obj": page_obj,
         "eventos": eventos,
@@ -628,98 +645,22 @@ def exportar_dados_completo(request):
     formato = request.GET.get("formato", "excel")
 
     # Buscar todos os participantes com relações
-    participantes = (
-        Participante.objects.select_related("evento", "evento__categoria")
-        .all()
-        .values(
-            "codigo_ingresso",
-            "nome_completo",
-            "email",
-            "telefone",
-            "cpf",
-            "data_inscricao",
-            "status",
-            "evento__nome",
-            "evento__data_evento",
-            "evento__local",
-            "evento__categoria__nome",
-            "evento__status",
-            "observacoes",
-        )
-    )
-
-    df = pd.DataFrame(list(participantes))
+    participantes = Participante.objects.all()
 
-    if df.empty:
+    if not participantes.exists():
         messages.warning(request, "Não há dados para exportar.")
         return redirect("central_dados")
 
-    # Converter datetimes para timezone-naive (remover timezone para Excel)
-    for col in df.columns:
-        if pd.api.types.is_datetime64_any_dtype(df[col]):
-            df[col] = df[col].dt.tz_localize(None)
-
-    # Renomear colunas
-    df.columns = [
-        "Código Ingresso",
-        "Nome",
-        "Email",
-        "Telefone",
-        "CPF",
-        "Data Inscrição",
-        "Status Participante",
-        "Evento",
-        "Data Evento",
-        "Local",
-        "Categoria",
-        "Status Evento",
-        "Observações",
-    ]
-
-    # Preparar arquivo
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-    if formato == "excel":
-        filename = f"dados_completos_{timestamp}.xlsx"
-        filepath = Path(__file__).parent.parent.parent / "media" / "exportacoes" / filename
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-
-        with pd.ExcelWriter(filepath, engine="openpyxl") as writer:
-            df.to_excel(writer, sheet_name="Dados Completos", index=False)
-
-            # Sheet de estatísticas
-            stats_df = pd.DataFrame(
-                {
-                    "Métrica": ["Total de Participantes", "Total de Eventos", "Confirmados", "Pendentes", "Cancelados"],
-                    "Valor": [
-                        len(df),
-                        df["Evento"].nunique(),
-                        len(df[df["Status Participante"] == "confirmado"]),
-                        len(df[df["Status Participante"] == "pendente"]),
-                        len(df[df["Status Participante"] == "cancelado"]),
-                    ],
-                }
-            )
-            stats_df.to_excel(writer, sheet_name="Estatísticas", index=False)
-
-        return FileResponse(open(filepath, "rb"), as_attachment=True, filename=filename)
-
-    elif formato == "csv":
-        filename = f"dados_completos_{timestamp}.csv"
-        filepath = Path(__file__).parent.parent.parent / "media" / "exportacoes" / filename
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-
-        df.to_csv(filepath, index=False, encoding="utf-8-sig")
-
-        return FileResponse(open(filepath, "rb"), as_attachment=True, filename=filename)
-
-    elif formato == "json":
-        filename = f"dados_completos_{timestamp}.json"
-        response = HttpResponse(
-            df.to_json(orient="records", force_ascii=False, indent=2), content_type="application/json"
-        )
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
+    # CSV/JSON/NDJSON em streaming ou Excel (write-only), reaproveitando o cache
+    return exportar(
+        request,
+        participantes,
+        COLUNAS_DADOS_COMPLETOS,
+        formato,
+        "dados_completos",
+        "Dados Completos",
+        estatisticas=True,
+    )
 
 
 @login_required
@@ -748,6 +689,78 @@ def historico_importacoes(request):
     return render(request, "eventos/historico_importacoes.html", context)
 
 
+@login_required
+def progresso_importacao(request, importacao_id):
+    """Progresso de uma importação em JSON (consultado periodicamente pelo histórico)"""
+    importacao = get_object_or_404(
+        ImportacaoExcel.objects.only(
+            "status",
+            "total_linhas",
+            "linhas_processadas",
+            "linhas_importadas",
+            "linhas_com_erro",
+            "linhas_por_segundo",
+            "processado_em",
+        ),
+        id=importacao_id,
+    )
+    eta = importacao.eta_segundos
+    return JsonResponse(
+        {
+            "id": importacao.id,
+            "status": importacao.status,
+            "status_display": importacao.get_status_display(),
+            "total_linhas": importacao.total_linhas,
+            "linhas_processadas": importacao.linhas_processadas,
+            "linhas_importadas": importacao.linhas_importadas,
+            "linhas_com_erro": importacao.linhas_com_erro,
+            "linhas_por_segundo": round(importacao.linhas_por_segundo, 1),
+            "percentual": round(importacao.percentual_concluido, 1),
+            "eta_segundos": round(eta) if eta is not None else None,
+            "concluida": importacao.status in ("sucesso", "erro"),
+        }
+    )
+
+
+@login_required
+def log_importacao(request, importacao_id):
+    """Log de uma importação: linhas paginadas, filtráveis por resultado, com totais por resultado"""
+    importacao = get_object_or_404(ImportacaoExcel.objects.select_related("evento"), id=importacao_id)
+
+    # Totais por resultado (uma agregação sobre o índice importacao/resultado)
+    contagens = dict(importacao.registros.order_by().values_list("resultado").annotate(total=Count("id")))
+    resultados = [
+        (valor, rotulo, contagens.get(valor, 0)) for valor, rotulo in RegistroImportacao.RESULTADO_CHOICES
+    ]
+
+    registros = importacao.registros.select_related("cliente", "mensagem")
+    total_filtrado = sum(contagens.values())
+    try:
+        resultado = int(request.GET.get("resultado", ""))
+    except ValueError:
+        resultado = None
+    if resultado in contagens:
+        registros = registros.filter(resultado=resultado)
+        total_filtrado = contagens[resultado]
+    elif resultado is not None:
+        registros = registros.none()
+        total_filtrado = 0
+
+    # Paginação por cursor na ordem das linhas da planilha
+    paginator = KeysetPaginator(registros, 100, campo="linha", descendente=False, total=total_filtrado)
+    page_obj = paginator.get_page(request.GET.get("cursor"))
+
+    context = {
+        "importacao": importacao,
+        "resultados": resultados,
+        "resultado_selecionado": resultado,
+        "total_registros": sum(contagens.values()),
+        "total_filtrado": total_filtrado,
+        "page_obj": page_obj,
+    }
+    return render(request, "eventos/log_importacao.html", context)
+
+
 @login_required
 def comparar_importacoes(request):
     """Compara dados entre diferentes importações"""
@@ -762,31 +775,69 @@ def comparar_importacoes(request):
         imp1 = get_object_or_404(ImportacaoExcel, id=importacao1_id)
         imp2 = get_object_or_404(ImportacaoExcel, id=importacao2_id)
 
+        # Diferenças linha a linha (manifestos mesclados) + página da categoria escolhida
+        try:
+            pagina = max(1, int(request.GET.get("pagina", 1)))
+        except ValueError:
+            pagina = 1
+        diferencas = comparar(imp1, imp2, request.GET.get("categoria", "alteradas"), pagina)
+
+        # Dados atuais dos clientes da página (uma consulta)
+        emails = diferencas["pagina"]["itens"]
+        clientes = {c.email.lower(): c for c in Cliente.objects.filter(email__in=emails)}
+        diferencas["pagina"]["linhas"] = [(email, clientes.get(email.lower())) for email in emails]
+
         # Análise comparativa
         comparacao = {
             "importacao1": imp1,
             "importacao2": imp2,
             "diferenca_registros": imp2.linhas_importadas - imp1.linhas_importadas,
             "diferenca_tempo": (imp2.criado_em - imp1.criado_em).days,
+            "diferencas": diferencas,
         }
 
     context = {
         "importacoes": importacoes,
         "comparacao": comparacao,
+        "categorias_diferenca": [
+            ("adicionadas", "Adicionados"),
+            ("removidas", "Removidos"),
+            ("alteradas", "Alterados"),
+        ],
     }
     return render(request, "eventos/comparar_importacoes.html", context)
 
 
+def _total_filtrado(participantes, contagens, evento_id, status, busca):
+    """
+    Total de participantes da listagem sem COUNT(*) quando um contador já o tem
+
+    Sem busca textual, os totais por status (agregados em cache) e os contadores
+    materializados do evento (total_inscritos/total_confirmados) são exatos;
+    nos demais filtros conta no banco.
+    """
+    if busca:
+        return participantes.count()
+    if not evento_id:
+        return contagens["por_status"].get(status, 0) if status else contagens["total"]
+    if status in ("", None, "confirmado"):
+        campo = "total_confirmados" if status else "total_inscritos"
+        total = Evento.objects.filter(pk=evento_id).values_list(campo, flat=True).first()
+        return total or 0
+    return participantes.count()
+
+
 def listar_participantes(request):
     """Lista todos os participantes do sistema com filtros"""
     # Buscar todos os participantes
-    participantes = Participante.objects.select_related("evento", "evento__categoria").all()
+    participantes = Participante.objects.with_related()
 
-    # Estatísticas gerais (sem filtros)
-    total_participantes = Participante.objects.count()
-    total_confirmados = Participante.objects.filter(status="confirmado").count()
-    total_pendentes = Participante.objects.filter(status="pendente").count()
-    total_cancelados = Participante.objects.filter(status="cancelado").count()
+    # Estatísticas gerais (sem filtros, uma única consulta, em cache até a próxima escrita)
+    contagens = cache_agregados.obter("participantes", Participante.objects.contagens)
+    total_participantes = contagens["total"]
+    total_confirmados = contagens["por_status"]["confirmado"]
+    total_pendentes = contagens["por_status"]["pendente"]
+    total_cancelados = contagens["por_status"]["cancelado"]
 
     # Aplicar filtros
     evento_id = request.GET.get("evento")
@@ -798,20 +849,14 @@ def listar_participantes(request):
     if status:
         participantes = participantes.filter(status=status)
     if busca:
-        participantes = participantes.filter(
-            Q(nome__icontains=busca) | Q(email__icontains=busca) | Q(codigo_ingresso__icontains=busca)
-        )
-
-    # Ordenação
-    participantes = participantes.order_by("-data_inscricao")
+        participantes = participantes.filter(busca_textual.filtro_participantes(busca))
 
     # Contar participantes filtrados
-    participantes_filtrados = participantes.count()
+    participantes_filtrados = _total_filtrado(participantes, contagens, evento_id, status, busca)
 
-    # Paginação (30 por página)
-    paginator = Paginator(participantes, 30)
-    page_number = request.GET.get("page", 1)
-    page_obj = paginator.get_page(page_number)
+    # Paginação por cursor (30 por página, mais recentes primeiro)
+    paginator = KeysetPaginator(participantes, 30, total=participantes_filtrados)
+    page_obj = paginator.get_page(request.GET.get("cursor"))
 
     # Lista de eventos para o filtro
     eventos = Evento.objects.all().order_by("nome")
@@ -834,7 +879,7 @@ def exportar_participantes(request):
     formato = request.GET.get("formato", "excel")
 
     # Aplicar mesmos filtros da listagem
-    participantes = Participante.objects.select_related("evento", "evento__categoria").all()
+    participantes = Participante.objects.all()
 
     evento_id = request.GET.get("evento")
     status = request.GET.get("status")
@@ -844,59 +889,109 @@ def exportar_participantes(request):
     if status:
         participantes = participantes.filter(status=status)
 
-    # Buscar dados
-    participantes_data = participantes.values(
-        "codigo_ingresso",
-        "nome",
-        "email",
-        "telefone",
-        "cpf",
-        "data_inscricao",
-        "status",
-        "evento__nome",
-        "evento__data_evento",
-        "evento__local",
-        "evento__categoria__nome",
-    )
-
-    df = pd.DataFrame(list(participantes_data))
-
-    if df.empty:
+    if not participantes.exists():
         messages.warning(request, "Não há participantes para exportar com os filtros selecionados.")
         return redirect("listar_participantes")
 
-    # Renomear colunas
-    df.columns = [
-        "Código Ingresso",
-        "Nome",
-        "Email",
-        "Telefone",
-        "CPF",
-        "Data Inscrição",
-        "Status",
-        "Evento",
-        "Data Evento",
-        "Local",
-        "Categoria",
-    ]
+    # CSV/JSON/NDJSON em streaming ou Excel (write-only), reaproveitando o cache
+    return exportar(request, participantes, COLUNAS_PARTICIPANTES, formato, "participantes", "Participantes")
 
-    # Preparar arquivo
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    if formato == "excel":
-        filename = f"participantes_{timestamp}.xlsx"
-        filepath = Path(__file__).parent.parent.parent / "media" / "exportacoes" / filename
-        filepath.parent.mkdir(parents=True, exist_ok=True)
+# Status HTTP de cada resultado do check-in de um único ingresso
+STATUS_HTTP_CHECKIN = {
+    checkin_ingressos.REGISTRADO: 200,
+    checkin_ingressos.JA_PRESENTE: 409,
+    checkin_ingressos.STATUS_NAO_PERMITIDO: 409,
+    checkin_ingressos.OUTRO_EVENTO: 409,
+    checkin_ingressos.NAO_ENCONTRADO: 404,
+}
 
-        df.to_excel(filepath, index=False, sheet_name="Participantes")
 
-        return FileResponse(open(filepath, "rb"), as_attachment=True, filename=filename)
+def _dados_checkin(request):
+    """
+    Lê o corpo de uma requisição de check-in (JSON ou formulário)
+
+    Returns:
+        Tupla (dados, evento_id, erro); erro é uma mensagem quando o corpo é inválido
+    """
+    if request.content_type == "application/json":
+        try:
+            dados = json.loads(request.body or b"{}")
+        except (ValueError, UnicodeDecodeError):
+            return None, None, "JSON inválido"
+        if not isinstance(dados, dict):
+            return None, None, "JSON inválido"
+    else:
+        dados = {"codigo": request.POST.get("codigo"), "codigos": request.POST.getlist("codigos")}
+        dados["evento"] = request.POST.get("evento")
+    evento_id = dados.get("evento") or None
+    if evento_id is not None:
+        try:
+            evento_id = int(evento_id)
+        except (TypeError, ValueError):
+            return None, None, "Evento inválido"
+    return dados, evento_id, None
+
+
+def _resultado_checkin(codigo, resultado, participante):
+    item = {"codigo": codigo, "resultado": resultado}
+    if participante is not None:
+        item["participante"] = checkin_ingressos.dados_participante(participante)
+    return item
 
-    elif formato == "csv":
-        filename = f"participantes_{timestamp}.csv"
-        filepath = Path(__file__).parent.parent.parent / "media" / "exportacoes" / filename
-        filepath.parent.mkdir(parents=True, exist_ok=True)
 
-        df.to_csv(filepath, index=False, encoding="utf-8-sig")
+@login_required
+@require_POST
+def checkin(request):
+    """
+    Check-in de um ingresso pelo código (POST com "codigo" e, opcionalmente, "evento")
+
+    Responde 200 quando o check-in é registrado, 409 quando o ingresso já está
+    presente, tem status que não permite check-in ou é de outro evento, e 404
+    quando o código não existe.
+    """
+    if not request.user.has_perm("eventos.change_participante"):
+        return JsonResponse({"erro": "Sem permissão para registrar check-in"}, status=403)
+    dados, evento_id, erro = _dados_checkin(request)
+    codigo = str(dados.get("codigo") or "").strip() if erro is None else ""
+    if erro is None and not codigo:
+        erro = "Informe o código do ingresso"
+    if erro:
+        return JsonResponse({"erro": erro}, status=400)
+
+    [(codigo, resultado, participante)] = checkin_ingressos.registrar([codigo], evento_id)
+    return JsonResponse(_resultado_checkin(codigo, resultado, participante), status=STATUS_HTTP_CHECKIN[resultado])
+
 
-        return FileResponse(open(filepath, "rb"), as_attachment=True, filename=filename)
+@login_required
+@require_POST
+def checkin_lote(request):
+    """
+    Check-in de vários ingressos em uma requisição (leitores que acumulam leituras offline)
+
+    Recebe "codigos" (lista) e, opcionalmente, "evento". Responde 200 com o
+    resultado de cada código único, na ordem recebida, e a contagem por
+    resultado.
+    """
+    if not request.user.has_perm("eventos.change_participante"):
+        return JsonResponse({"erro": "Sem permissão para registrar check-in"}, status=403)
+    dados, evento_id, erro = _dados_checkin(request)
+    codigos = dados.get("codigos") if erro is None else None
+    maximo = getattr(settings, "CHECKIN_LOTE_MAXIMO", 1000)
+    if erro is None and (not isinstance(codigos, list) or not codigos):
+        erro = "Informe a lista de códigos"
+    elif erro is None and len(codigos) > maximo:
+        erro = f"Envie no máximo {maximo} códigos por lote"
+    if erro:
+        return JsonResponse({"erro": erro}, status=400)
+
+    resultados = checkin_ingressos.registrar(codigos, evento_id)
+    contagem = {}
+    for _, resultado, _ in resultados:
+        contagem[resultado] = contagem.get(resultado, 0) + 1
+    return JsonResponse(
+        {
+            "resultados": [_resultado_checkin(*item) for item in resultados],
+            "contagem": contagem,
+        }
+    )